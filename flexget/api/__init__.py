@@ -3,6 +3,7 @@ from .core import (  # noqa
     authentication,
     cached,
     database,
+    events,
     format_checker,
     plugins,
     schema,
@@ -1,10 +1,11 @@
 import json
 import os
 import re
-from collections import deque
+import threading
+from collections import OrderedDict, deque
 from contextlib import suppress
 from functools import partial, wraps
-from typing import Callable, List, Dict, Union, Mapping, Tuple, TYPE_CHECKING
+from typing import Callable, Iterable, List, Dict, Union, Mapping, Tuple, TYPE_CHECKING
 
 from jsonschema.exceptions import ValidationError as SchemaValidationError
 from flask import Flask, Response, jsonify, make_response, request, Request
@@ -20,6 +21,8 @@ from werkzeug.http import generate_etag
 
 from flexget import manager
 from flexget.config_schema import format_checker, process_config
+from flexget.event import event
+from flexget.utils import change_tracking, metrics
 from flexget.utils.database import with_session
 from flexget.webserver import User
 
@@ -204,7 +207,7 @@ api_app.config['DEBUG'] = True
 api_app.config['ERROR_404_HELP'] = False
 api_app.url_map.strict_slashes = False
 
-CORS(api_app, expose_headers='Link, Total-Count, Count, ETag')
+CORS(api_app, expose_headers='Link, Total-Count, Count, Next-Cursor, ETag')
 Compress(api_app)
 
 api = API(
@@ -373,13 +376,68 @@ def api_key(session: Session = None) -> str:
     return session.query(User).first().token  # type: ignore
 
 
-def etag(method: Callable = None, cache_age: int = 0):
+# Number of responses kept by `etag` for endpoints with `depends_on`
+RESPONSE_CACHE_SIZE = 256
+
+
+class ResponseCache:
+    """
+    Responses of GET endpoints, kept together with the change counters of the database tables they
+    were built from, so they can be served again until one of the tables changes.
+    """
+
+    def __init__(self, size: int = RESPONSE_CACHE_SIZE) -> None:
+        self.size = size
+        self._responses: OrderedDict = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key, version):
+        with self._lock:
+            cached = self._responses.get(key)
+            hit = cached is not None and cached[0] == version
+            metrics.record_cache_lookup('api_response', hit)
+            if not hit:
+                return None
+            self._responses.move_to_end(key)
+            return cached[1]
+
+    def set(self, key, version, response: Response) -> None:
+        with self._lock:
+            self._responses[key] = (version, response)
+            self._responses.move_to_end(key)
+            while len(self._responses) > self.size:
+                self._responses.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._responses.clear()
+
+
+response_cache = ResponseCache()
+
+
+@event('manager.config_updated')
+def clear_response_cache(manager):
+    # Some responses also depend on the config, eg. whether a series is configured
+    response_cache.clear()
+
+
+def etag(
+    method: Callable = None,
+    cache_age: int = 0,
+    depends_on: Iterable = None,
+    uncached_args: Iterable[str] = (),
+):
     """
     A decorator that add an ETag header to the response and checks for the "If-Match" and "If-Not-Match" headers to
      return an appropriate response.
 
     :param method: A GET or HEAD flask method to wrap
     :param cache_age: max-age cache age for the content
+    :param depends_on: Database tables (names or mapped classes) the response is built from. If given, responses
+      are cached per url and reused, without running `method`, until one of the tables changes.
+    :param uncached_args: Query arguments which make the response depend on more than `depends_on`, requests
+      with them are not cached
     :return: The method's response with the ETag and Cache-Control headers, raises a 412 error or returns a 304 response
     """
 
@@ -387,25 +445,40 @@ def etag(method: Callable = None, cache_age: int = 0):
     # We return a decorator with the optional arguments filled in.
     # Next time round we'll be decorating method.
     if method is None:
-        return partial(etag, cache_age=cache_age)
+        return partial(
+            etag, cache_age=cache_age, depends_on=depends_on, uncached_args=uncached_args
+        )
+
+    tables = [change_tracking.table_name(table) for table in depends_on or []]
 
     @wraps(method)
     def wrapped(*args, **kwargs):
         # Identify if this is a GET or HEAD in order to proceed
         assert request.method in ['HEAD', 'GET'], '@etag is only supported for GET requests'
-        rv = method(*args, **kwargs)
-        rv = make_response(rv)
-
-        # Some headers can change without data change for specific page
-        content_headers = (
-            rv.headers.get('link', '')
-            + rv.headers.get('count', '')
-            + rv.headers.get('total-count', '')
-        )
-        data = (rv.get_data().decode() + content_headers).encode()
-        etag = generate_etag(data)
-        rv.headers['Cache-Control'] = 'max-age=%s' % cache_age
-        rv.headers['ETag'] = etag
+        cache_key = version = rv = None
+        if tables and not any(arg in request.args for arg in uncached_args):
+            cache_key = (method.__qualname__, request.method, request.full_path)
+            # Taken before running the method, so changes made meanwhile invalidate the response
+            version = change_tracking.versions(tables)
+            rv = response_cache.get(cache_key, version)
+        if rv is None:
+            rv = make_response(method(*args, **kwargs))
+
+            # Some headers can change without data change for specific page
+            content_headers = (
+                rv.headers.get('link', '')
+                + rv.headers.get('count', '')
+                + rv.headers.get('total-count', '')
+            )
+            data = (rv.get_data().decode() + content_headers).encode()
+            rv.headers['Cache-Control'] = 'max-age=%s' % cache_age
+            rv.headers['ETag'] = generate_etag(data)
+            if cache_key and rv.status_code == 200:
+                response_cache.set(cache_key, version, rv)
+                rv = copy_response(rv)
+        else:
+            rv = copy_response(rv)
+        etag = rv.headers['ETag']
         if_match = request.headers.get('If-Match')
         if_none_match = request.headers.get('If-None-Match')
 
@@ -423,6 +496,11 @@ def etag(method: Callable = None, cache_age: int = 0):
     return wrapped
 
 
+def copy_response(rv: Response) -> Response:
+    """Copies a cached response, so that it is not changed by the handling of this request."""
+    return Response(rv.get_data(), status=rv.status_code, headers=list(rv.headers))
+
+
 def pagination_headers(
     total_pages: int,
     total_items: int,
@@ -0,0 +1,74 @@
+import json
+
+from flask import Response
+from flask_restx import inputs
+from sqlalchemy.orm import Session
+
+from flexget.api import APIResource, api
+from flexget.utils.event_bus import DEFAULT_BUFFER_SIZE, EVENT_TYPES, bus
+
+events_api = api.namespace('events', description='Subscribe to task and log events')
+
+# Seconds between keepalive comments on an idle stream, which also detect closed connections
+KEEPALIVE_INTERVAL = 15
+
+events_parser = api.parser()
+events_parser.add_argument(
+    'type', choices=EVENT_TYPES, action='append', help='Event types to receive, all by default'
+)
+events_parser.add_argument('task', help='Only receive the events of this task')
+events_parser.add_argument(
+    'level',
+    choices=('TRACE', 'DEBUG', 'VERBOSE', 'INFO', 'WARNING', 'ERROR', 'CRITICAL'),
+    default='INFO',
+    case_sensitive=False,
+    help='Minimum level of the log events',
+)
+events_parser.add_argument(
+    'buffer',
+    type=inputs.int_range(1, 10000),
+    default=DEFAULT_BUFFER_SIZE,
+    help='Events kept while the client is not reading, the oldest are dropped beyond it',
+)
+
+
+def format_event(item: dict) -> str:
+    lines = ['event: %s' % item['type']]
+    if 'id' in item:
+        lines.append('id: %s' % item['id'])
+    lines.append('data: %s' % json.dumps(item['data'], default=str))
+    return '\n'.join(lines) + '\n\n'
+
+
+@events_api.route('/')
+class EventsAPI(APIResource):
+    @api.doc(parser=events_parser)
+    @api.response(200, description='Streams the events as server-sent events')
+    def get(self, session: Session = None) -> Response:
+        """ Stream task progress, entry state and log events """
+        args = events_parser.parse_args()
+        subscription = bus.subscribe(
+            types=args['type'],
+            task=args['task'],
+            level=args['level'],
+            buffer_size=args['buffer'],
+        )
+
+        def stream():
+            try:
+                # Lets the client know that it is subscribed
+                yield ': subscribed\n\n'
+                while True:
+                    items = subscription.get(timeout=KEEPALIVE_INTERVAL)
+                    if not items:
+                        yield ': keepalive\n\n'
+                    for item in items:
+                        yield format_event(item)
+            finally:
+                bus.unsubscribe(subscription)
+
+        return Response(
+            stream(),
+            mimetype='text/event-stream',
+            headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'},
+        )
@@ -35,13 +35,13 @@ class Archive:
             tags.append(db.get_tag(tag_name, task.session))
 
         count = 0
-        processed = []
+        processed = set()
         for entry in task.entries + task.rejected + task.failed:
             # I think entry can be in multiple of those lists .. not sure though!
             if entry in processed:
                 continue
             else:
-                processed.append(entry)
+                processed.add(entry)
 
             ae = (
                 task.session.query(db.ArchiveEntry)
@@ -14,6 +14,7 @@ class MagnetBtih:
 
     schema = {'type': 'boolean'}
 
+    @plugin.no_session
     def on_task_metainfo(self, task, config):
         if config is False:
             return
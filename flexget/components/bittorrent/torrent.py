@@ -18,6 +18,7 @@ class TorrentFilename:
     TORRENT_PRIO = 255
 
     @plugin.priority(TORRENT_PRIO)
+    @plugin.no_session
     def on_task_modify(self, task, config):
         # Only scan through accepted entries, as the file must have been downloaded in order to parse anything
         for entry in task.accepted:
@@ -74,6 +75,7 @@ class TorrentFilename:
                 logger.exception(e)
 
     @plugin.priority(TORRENT_PRIO)
+    @plugin.no_session
     def on_task_output(self, task, config):
         for entry in task.entries:
             if 'torrent' in entry:
@@ -12,6 +12,7 @@ class TorrentSize:
     """
 
     @plugin.priority(200)
+    @plugin.no_session
     def on_task_modify(self, task, config):
         for entry in task.entries:
             if 'torrent' in entry:
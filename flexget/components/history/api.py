@@ -11,6 +11,9 @@ from . import db
 
 logger = logger.bind(name='history')
 
+# Responses of the GET endpoints are cached until these tables change
+HISTORY_TABLES = [db.History]
+
 history_api = api.namespace('history', description='Entry History')
 
 
@@ -45,7 +48,7 @@ history_parser.add_argument('task', help='Filter by task name')
 @history_api.route('/')
 @api.doc(parser=history_parser)
 class HistoryAPI(APIResource):
-    @etag
+    @etag(depends_on=HISTORY_TABLES)
     @api.response(NotFoundError)
     @api.response(200, model=history_list_schema)
     def get(self, session=None):
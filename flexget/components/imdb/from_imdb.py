@@ -322,6 +322,7 @@ class FromIMDB:
             return
 
         entries = []
+        seen = set()
         config = self.prepare_config(config)
         items = self.get_items(config)
         if not items:
@@ -336,7 +337,8 @@ class FromIMDB:
             )
 
             if entry.isvalid():
-                if entry not in entries:
+                if entry not in seen:
+                    seen.add(entry)
                     entries.append(entry)
                     if entry and task.options.test:
                         logger.info("Test mode. Entry includes:")
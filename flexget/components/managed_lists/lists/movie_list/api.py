@@ -21,6 +21,9 @@ from .movie_list import MovieListBase
 
 logger = logger.bind(name='movie_list')
 
+# Responses of the GET endpoints are cached until these tables change
+MOVIE_LIST_TABLES = [db.MovieListList, db.MovieListMovie, db.MovieListID]
+
 movie_list_api = api.namespace('movie_list', description='Movie List operations')
 
 
@@ -124,7 +127,7 @@ movie_list_parser.add_argument('name', help='Filter results by list name')
 
 @movie_list_api.route('/')
 class MovieListAPI(APIResource):
-    @etag
+    @etag(depends_on=MOVIE_LIST_TABLES)
     @api.response(200, model=return_lists_schema)
     @api.doc(parser=movie_list_parser)
     def get(self, session=None):
@@ -160,7 +163,7 @@ class MovieListAPI(APIResource):
 @movie_list_api.route('/<int:list_id>/')
 @api.doc(params={'list_id': 'ID of the list'})
 class MovieListListAPI(APIResource):
-    @etag
+    @etag(depends_on=MOVIE_LIST_TABLES)
     @api.response(NotFoundError)
     @api.response(200, model=list_object_schema)
     def get(self, list_id, session=None):
@@ -193,7 +196,7 @@ movies_parser = api.pagination_parser(sort_choices=sort_choices, default='title'
 
 @movie_list_api.route('/<int:list_id>/movies/')
 class MovieListMoviesAPI(APIResource):
-    @etag
+    @etag(depends_on=MOVIE_LIST_TABLES)
     @api.response(NotFoundError)
     @api.response(200, model=return_movies_schema)
     @api.doc(params={'list_id': 'ID of the list'}, parser=movies_parser)
@@ -288,7 +291,7 @@ class MovieListMoviesAPI(APIResource):
 @api.doc(params={'list_id': 'ID of the list', 'movie_id': 'ID of the movie'})
 @api.response(NotFoundError)
 class MovieListMovieAPI(APIResource):
-    @etag
+    @etag(depends_on=MOVIE_LIST_TABLES)
     @api.response(200, model=movie_list_object_schema)
     def get(self, list_id, movie_id, session=None):
         """ Get a movie by list ID and movie ID """
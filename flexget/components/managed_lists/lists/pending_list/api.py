@@ -20,6 +20,9 @@ from . import db
 
 logger = logger.bind(name='pending_list')
 
+# Responses of the GET endpoints are cached until these tables change
+PENDING_LIST_TABLES = [db.PendingListList, db.PendingListEntry]
+
 pending_list_api = api.namespace('pending_list', description='Pending List operations')
 
 
@@ -121,7 +124,7 @@ list_parser.add_argument('name', help='Filter results by list name')
 
 @pending_list_api.route('/')
 class PendingListListsAPI(APIResource):
-    @etag
+    @etag(depends_on=PENDING_LIST_TABLES)
     @api.doc(parser=list_parser)
     @api.response(200, 'Successfully retrieved pending lists', pending_list_return_lists_schema)
     def get(self, session=None):
@@ -162,7 +165,7 @@ class PendingListListsAPI(APIResource):
 @pending_list_api.route('/<int:list_id>/')
 @api.doc(params={'list_id': 'ID of the list'})
 class PendingListListAPI(APIResource):
-    @etag
+    @etag(depends_on=PENDING_LIST_TABLES)
     @api.response(NotFoundError)
     @api.response(200, model=pending_list_object_schema)
     def get(self, list_id, session=None):
@@ -201,7 +204,7 @@ entries_parser.add_argument('filter', help='Filter by title name')
 @api.doc(params={'list_id': 'ID of the list'}, parser=entries_parser)
 @api.response(NotFoundError)
 class PendingListEntriesAPI(APIResource):
-    @etag
+    @etag(depends_on=PENDING_LIST_TABLES)
     @api.response(200, model=pending_lists_entries_return_schema)
     def get(self, list_id, session=None):
         """ Get entries by list ID """
@@ -342,7 +345,7 @@ class PendingListEntriesBatchAPI(APIResource):
 @api.doc(params={'list_id': 'ID of the list', 'entry_id': 'ID of the entry'})
 @api.response(NotFoundError)
 class PendingListEntryAPI(APIResource):
-    @etag
+    @etag(depends_on=PENDING_LIST_TABLES)
     @api.response(200, model=pending_list_entry_base_schema)
     def get(self, list_id, entry_id, session=None):
         """ Get an entry by list ID and entry ID """
@@ -18,8 +18,16 @@ To implement a plugin that can deliver messages, it should implement a `notify`
 `(title, message, config)` as arguments. The plugin should also have a `schema` attribute which is a JSON schema that
 describes the config format for the plugin.
 
-"""
+Background Delivery
+-------------------
+With `background=True`, `send_notification` only renders the notification and hands it to a pool of worker threads.
+At most a few notifications are sent to the same notifier at a time, failed ones are retried with increasing delays
+and those still waiting to be sent when FlexGet shuts down are stored and sent on the next start.
 
+"""
+import threading
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 
 from jinja2 import Template
 from loguru import logger
@@ -27,10 +35,20 @@ from loguru import logger
 from flexget import plugin
 from flexget.event import event
 from flexget.plugin import PluginWarning
+from flexget.utils import json
+from flexget.utils.simple_persistence import SimplePersistence
 from flexget.utils.template import RenderError
 
 logger = logger.bind(name='notify')
 
+# Threads sending notifications in the background
+WORKERS = 8
+# How many notifications can be sent to the same notifier at a time
+NOTIFIER_CONCURRENCY = 2
+# Failed notifications are retried this many times, the delay (in seconds) doubles on each retry
+MAX_RETRIES = 5
+RETRY_DELAY = 30
+
 NOTIFY_VIA_SCHEMA = {
     'type': 'array',
     'items': {
@@ -83,8 +101,135 @@ def render_config(config, template_renderer, notifier_name, _path=''):
         return config
 
 
+class NotificationDispatcher:
+    """
+    Sends rendered notifications from background threads, retrying failed ones.
+
+    Notifications waiting to be sent (or retried) are kept as plain dicts, so they can be persisted on shutdown.
+    """
+
+    def __init__(
+        self,
+        workers=WORKERS,
+        notifier_concurrency=NOTIFIER_CONCURRENCY,
+        max_retries=MAX_RETRIES,
+        retry_delay=RETRY_DELAY,
+    ):
+        self.workers = workers
+        self.max_retries = max_retries
+        self.retry_delay = retry_delay
+        self._limits = defaultdict(lambda: threading.BoundedSemaphore(notifier_concurrency))
+        self._executor = None
+        self._pending = {}
+        self._timers = []
+        self._stopping = False
+        self._lock = threading.Lock()
+
+    def submit(self, notifier_name, title, message, config):
+        """
+        Queue a notification to be sent to `notifier_name`.
+
+        :returns: A future resolving to whether the first attempt of sending the notification succeeded.
+        """
+        job = {
+            'notifier': notifier_name,
+            'title': title,
+            'message': message,
+            'config': config,
+            'attempt': 0,
+        }
+        return self._submit(job)
+
+    def _submit(self, job):
+        with self._lock:
+            self._pending[id(job)] = job
+            if self._executor is None:
+                self._stopping = False
+                self._executor = ThreadPoolExecutor(self.workers, thread_name_prefix='notify')
+            return self._executor.submit(self._send, job)
+
+    def _send(self, job):
+        if self._stopping:
+            # Left pending, to be persisted
+            return False
+        notifier_name = job['notifier']
+        with self._limits[notifier_name]:
+            try:
+                plugin.get(notifier_name, 'notification_framework').notify(
+                    job['title'], job['message'], job['config']
+                )
+            except PluginWarning as e:
+                error = e.value
+            except Exception as e:
+                logger.opt(exception=True).debug('Unexpected error from `{}`', notifier_name)
+                error = str(e)
+            else:
+                logger.verbose('Successfully sent a notification to `{}`', notifier_name)
+                self._done(job)
+                return True
+
+        job['attempt'] += 1
+        if job['attempt'] > self.max_retries:
+            logger.error(
+                'Giving up sending notification to `{}` after {} attempts: {}',
+                notifier_name,
+                job['attempt'],
+                error,
+            )
+            self._done(job)
+            return False
+        delay = self.retry_delay * 2 ** (job['attempt'] - 1)
+        logger.warning(
+            'Error while sending notification to `{}`, retrying in {} seconds: {}',
+            notifier_name,
+            delay,
+            error,
+        )
+        timer = threading.Timer(delay, self._retry, (job,))
+        timer.daemon = True
+        with self._lock:
+            self._timers = [t for t in self._timers if t.is_alive()] + [timer]
+        timer.start()
+        return False
+
+    def _retry(self, job):
+        if not self._stopping:
+            self._submit(job)
+
+    def _done(self, job):
+        with self._lock:
+            self._pending.pop(id(job), None)
+
+    def shutdown(self):
+        """
+        Stops sending notifications, waiting only for those being sent right now.
+
+        :returns: The notifications which were not sent yet.
+        """
+        with self._lock:
+            self._stopping = True
+            executor, self._executor = self._executor, None
+            timers, self._timers = self._timers, []
+        for timer in timers:
+            timer.cancel()
+        if executor:
+            executor.shutdown(wait=True)
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        return list(pending.values())
+
+    def pending(self):
+        with self._lock:
+            return list(self._pending.values())
+
+
+dispatcher = NotificationDispatcher()
+
+
 class NotificationFramework:
-    def send_notification(self, title, message, notifiers, template_renderer=None):
+    def send_notification(
+        self, title, message, notifiers, template_renderer=None, background=False
+    ):
         """
         Send a notification out to the given `notifiers` with a given `title` and `message`.
         If `template_renderer` is specified, `title`, `message`, as well as any string options in a notifier's config
@@ -95,6 +240,22 @@ class NotificationFramework:
         :param list notifiers: A list of configured notifier output plugins. The `NOTIFY_VIA_SCHEMA` JSON schema
             describes the data structure for this parameter.
         :param template_renderer: A function that should be used to render any jinja strings in the configuration.
+        :param bool background: Send the notification from background threads, retrying on failure.
+        :returns: When sending in background, a list of futures for the first attempt at each notifier.
+        """
+        futures = []
+        for notification in self.render_notification(title, message, notifiers, template_renderer):
+            future = self.deliver(*notification, background=background)
+            if future:
+                futures.append(future)
+        return futures
+
+    def render_notification(self, title, message, notifiers, template_renderer=None):
+        """
+        Render a notification the way :meth:`send_notification` does, without sending it.
+
+        :returns: A list of `(notifier_name, title, message, config)` tuples, one for each notifier, which can be
+            sent with :meth:`deliver`.
         """
         if template_renderer:
             try:
@@ -105,10 +266,9 @@ class NotificationFramework:
                 message = template_renderer(message)
             except RenderError as e:
                 logger.error('Error rendering notification body: {}', e)
+        notifications = []
         for notifier in notifiers:
             for notifier_name, notifier_config in notifier.items():
-                notifier_plugin = plugin.get(notifier_name, self)
-
                 rendered_config = notifier_config
 
                 # If a template renderer is specified, try to render all the notifier config values
@@ -116,18 +276,56 @@ class NotificationFramework:
                     rendered_config = render_config(
                         notifier_config, template_renderer, notifier_name
                     )
+                notifications.append((notifier_name, title, message, rendered_config))
+        return notifications
 
-                logger.debug('Sending a notification to `{}`', notifier_name)
-                try:
-                    notifier_plugin.notify(
-                        title, message, rendered_config
-                    )  # TODO: Update notifiers for new api
-                except PluginWarning as e:
-                    logger.warning(
-                        'Error while sending notification to `{}`: {}', notifier_name, e.value
-                    )
-                else:
-                    logger.verbose('Successfully sent a notification to `{}`', notifier_name)
+    def deliver(self, notifier_name, title, message, config, background=False):
+        """
+        Send an already rendered notification to `notifier_name`.
+
+        :returns: When sending in background, a future for the first attempt.
+        """
+        notifier_plugin = plugin.get(notifier_name, self)
+
+        if background:
+            logger.debug('Queueing a notification to `{}`', notifier_name)
+            return dispatcher.submit(notifier_name, title, message, config)
+
+        logger.debug('Sending a notification to `{}`', notifier_name)
+        try:
+            notifier_plugin.notify(title, message, config)  # TODO: Update notifiers for new api
+        except PluginWarning as e:
+            logger.warning('Error while sending notification to `{}`: {}', notifier_name, e.value)
+        else:
+            logger.verbose('Successfully sent a notification to `{}`', notifier_name)
+
+
+@event('manager.startup', priority=100)
+def resume_notifications(manager):
+    """Queues the notifications which were not sent before the last shutdown."""
+    persistence = SimplePersistence('notification_framework')
+    pending = persistence.get('pending')
+    if pending:
+        logger.verbose('Resuming {} unsent notifications', len(pending))
+        del persistence['pending']
+        for job in pending:
+            dispatcher._submit(job)
+
+
+# Must run before the taskless simple persistence is flushed
+@event('manager.shutdown', priority=200)
+def persist_notifications(manager):
+    pending = []
+    for job in dispatcher.shutdown():
+        try:
+            json.dumps(job)
+        except TypeError:
+            logger.warning('Unable to store unsent notification to `{}`', job['notifier'])
+            continue
+        pending.append(job)
+    if pending:
+        logger.info('Storing {} unsent notifications to be sent on the next start', len(pending))
+        SimplePersistence('notification_framework')['pending'] = pending
 
 
 @event('plugin.register')
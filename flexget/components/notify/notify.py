@@ -1,11 +1,16 @@
 import itertools
+import threading
+from concurrent.futures import wait
 
 from loguru import logger
+from requests import RequestException
 
 from flexget import plugin
 from flexget.config_schema import one_or_more
 from flexget.event import event
-from flexget.utils.template import get_template
+from flexget.utils.requests import TokenBucketLimiter
+from flexget.utils.template import RenderError, get_template, render
+from flexget.utils.tools import get_config_hash, parse_timedelta
 
 logger = logger.bind(name='notify_entry')
 
@@ -27,6 +32,161 @@ VIA_SCHEMA = {
 }
 
 
+COALESCE_SCHEMA = {
+    'type': 'object',
+    'properties': {
+        'window': {'type': 'string', 'format': 'interval', 'default': '0 seconds'},
+        'title': {
+            'type': 'string',
+            'default': '[FlexGet] {{ notifications|length }} new notifications',
+        },
+        'message': {
+            'type': 'string',
+            'default': '{% for notification in notifications %}'
+            '{{ notification.message }}\n'
+            '{% endfor %}',
+        },
+        'rate_limit': {
+            'type': 'object',
+            'properties': {
+                'tokens': {'type': 'integer', 'minimum': 1, 'default': 1},
+                'interval': {'type': 'string', 'format': 'interval'},
+            },
+            'required': ['interval'],
+            'additionalProperties': False,
+        },
+    },
+    'additionalProperties': False,
+}
+
+
+class Coalescer:
+    """
+    Collects the entry notifications for each notifier (and notifier config) over a window, across tasks, and
+    sends them as one notification. While the rate limit of a notifier is used up, its notifications keep being
+    collected until a token is available again.
+    """
+
+    def __init__(self):
+        self.batches = {}
+        self.lock = threading.Lock()
+
+    def add(self, notification, coalesce, task_name, background=False, task_id=None):
+        """
+        :param tuple notification: Rendered `(notifier_name, title, message, config)`
+        :param dict coalesce: The `coalesce` config
+        :param task_id: Id of the task run, to :meth:`discard` its notifications
+        :return: Key of the batch the notification was added to
+        """
+        notifier_name, title, message, config = notification
+        key = (notifier_name, get_config_hash(config), get_config_hash(coalesce))
+        with self.lock:
+            batch = self.batches.get(key)
+            if batch is None:
+                batch = self.batches[key] = {
+                    'notifier': notifier_name,
+                    'config': config,
+                    'coalesce': coalesce,
+                    'background': background,
+                    'notifications': [],
+                    'timer': None,
+                }
+            batch['notifications'].append(
+                {'title': title, 'message': message, 'task': task_name, 'task_id': task_id}
+            )
+            window = parse_timedelta(coalesce['window']).total_seconds()
+            if window and batch['timer'] is None:
+                batch['timer'] = self._schedule(window, key)
+        return key
+
+    def _schedule(self, delay, key):
+        timer = threading.Timer(delay, self.flush, (key,))
+        timer.daemon = True
+        timer.start()
+        return timer
+
+    def discard(self, task_id):
+        """Drops the notifications not sent yet of the task run `task_id`, eg. when it aborted."""
+        with self.lock:
+            for key, batch in list(self.batches.items()):
+                batch['notifications'] = [
+                    n for n in batch['notifications'] if n['task_id'] != task_id
+                ]
+                if not batch['notifications']:
+                    if batch['timer'] is not None:
+                        batch['timer'].cancel()
+                    del self.batches[key]
+
+    def flush(self, key, force=False):
+        """
+        Send the notifications collected for `key`, unless the rate limit of the notifier is used up.
+
+        :param bool force: Ignore the rate limit and send in the current thread, eg. on shutdown
+        :returns: When sending in background, a future for the first attempt.
+        """
+        with self.lock:
+            batch = self.batches.get(key)
+            if not batch:
+                return
+            if batch['timer'] is not None:
+                batch['timer'].cancel()
+                batch['timer'] = None
+            rate_limit = batch['coalesce'].get('rate_limit')
+            if rate_limit and not force:
+                # Each config of a notifier (eg. each bot or account) has its own limit
+                limiter = TokenBucketLimiter(
+                    'notify/%s/%s' % (batch['notifier'], key[1]),
+                    rate_limit['tokens'],
+                    rate_limit['interval'],
+                    wait=False,
+                )
+                try:
+                    limiter()
+                except RequestException:
+                    delay = limiter.rate.total_seconds() * (1 - limiter.tokens)
+                    logger.verbose(
+                        'Rate limit for `{}` reached, holding {} notifications for {:.0f} seconds',
+                        batch['notifier'],
+                        len(batch['notifications']),
+                        delay,
+                    )
+                    batch['timer'] = self._schedule(delay, key)
+                    return
+            del self.batches[key]
+        return self.send(batch, background=batch['background'] and not force)
+
+    def flush_all(self):
+        for key in list(self.batches):
+            self.flush(key, force=True)
+
+    def send(self, batch, background=False):
+        """:returns: When sending in background, a future for the first attempt."""
+        notifications = batch['notifications']
+        if len(notifications) == 1:
+            title, message = notifications[0]['title'], notifications[0]['message']
+        else:
+            context = {'notifications': notifications, 'notifier': batch['notifier']}
+            try:
+                title = render(batch['coalesce']['title'], context)
+                message = render(batch['coalesce']['message'], context)
+            except RenderError as e:
+                logger.error('Error rendering coalesced notification: {}', e)
+                return
+        logger.debug(
+            'Sending {} coalesced notifications to `{}`', len(notifications), batch['notifier']
+        )
+        framework = plugin.get('notification_framework', 'notify')
+        try:
+            return framework.deliver(
+                batch['notifier'], title, message, batch['config'], background=background
+            )
+        except Exception as e:
+            logger.exception(e)
+
+
+coalescer = Coalescer()
+
+
 class Notify:
     schema = {
         'type': 'object',
@@ -50,6 +210,7 @@ class Notify:
                     'template': {'type': 'string'},
                     'what': one_or_more({'type': 'string', 'enum': ENTRY_CONTAINERS}),
                     'via': VIA_SCHEMA,
+                    'coalesce': COALESCE_SCHEMA,
                 },
                 'required': ['via'],
                 'additionalProperties': False,
@@ -83,13 +244,23 @@ class Notify:
                 },
                 'required': ['via'],
             },
+            'background': {'type': 'boolean', 'default': False},
+            'wait': {'type': 'boolean', 'default': False},
         },
         'additionalProperties': False,
         'minProperties': 1,
         'error_minProperties': 'You must specify at least one of `entries` or `task` in your notify config.',
     }
 
+    def __init__(self):
+        # Notifications sent in background by each running task
+        self.futures = {}
+        # Coalesced notifications to be sent at exit of each running task
+        self.coalesced = {}
+
     def prepare_config(self, config):
+        config.setdefault('background', False)
+        config.setdefault('wait', False)
         if 'entries' in config:
             config['entries'].setdefault('what', ['accepted'])
             if not isinstance(config['entries']['what'], list):
@@ -99,13 +270,18 @@ class Notify:
     def send_notification(self, *args, **kwargs):
         send_notification = plugin.get('notification_framework', 'notify').send_notification
         try:
-            send_notification(*args, **kwargs)
+            return send_notification(*args, **kwargs)
         except plugin.PluginError as e:
             logger.error(e)
         except plugin.PluginWarning as e:
             logger.warning(e)
         except Exception as e:
             logger.exception(e)
+        return []
+
+    def send(self, task, config, *args, **kwargs):
+        futures = self.send_notification(*args, background=config['background'], **kwargs)
+        self.futures.setdefault(task.name, []).extend(futures)
 
     @plugin.priority(0)
     def on_task_output(self, task, config):
@@ -128,7 +304,12 @@ class Notify:
                 else:
                     message = config['entries']['message']
                 for entry in entries:
-                    self.send_notification(
+                    if config['entries'].get('coalesce'):
+                        self.coalesce(task, config, message, template_renderer=entry.render)
+                        continue
+                    self.send(
+                        task,
+                        config,
                         config['entries']['title'],
                         message,
                         config['entries']['via'],
@@ -147,25 +328,63 @@ class Notify:
                     raise plugin.PluginError(
                         'Cannot locate template on disk: %s' % config['task']['template']
                     )
-            self.send_notification(
+            self.send(
+                task,
+                config,
                 config['task']['title'],
                 template,
                 config['task']['via'],
                 template_renderer=task.render,
             )
 
+    def coalesce(self, task, config, message, template_renderer):
+        coalesce = config['entries']['coalesce']
+        framework = plugin.get('notification_framework', 'notify')
+        for notification in framework.render_notification(
+            config['entries']['title'], message, config['entries']['via'], template_renderer
+        ):
+            key = coalescer.add(
+                notification, coalesce, task.name, config['background'], task_id=task.id
+            )
+            if not parse_timedelta(coalesce['window']):
+                self.coalesced.setdefault(task.name, set()).add(key)
+
     def on_task_abort(self, task, config):
+        self.futures.pop(task.name, None)
+        self.coalesced.pop(task.name, None)
+        coalescer.discard(task.id)
         if 'abort' in config:
             if task.silent_abort:
                 return
             logger.debug('sending abort notification')
-            self.send_notification(
+            config = self.prepare_config(config)
+            self.send(
+                task,
+                config,
                 config['abort']['title'],
                 config['abort']['message'],
                 config['abort']['via'],
                 template_renderer=task.render,
             )
 
+    @plugin.priority(plugin.PRIORITY_LAST)
+    def on_task_exit(self, task, config):
+        futures = self.futures.pop(task.name, [])
+        # Without a window, coalesced notifications are sent once per task
+        for key in self.coalesced.pop(task.name, ()):
+            future = coalescer.flush(key)
+            if future:
+                futures.append(future)
+        if futures and config.get('wait'):
+            logger.verbose('Waiting for {} notifications to be sent', len(futures))
+            wait(futures)
+
+
+# Must run before unsent background notifications are stored
+@event('manager.shutdown', priority=250)
+def flush_coalesced(manager):
+    coalescer.flush_all()
+
 
 @event('plugin.register')
 def register_plugin():
@@ -16,6 +16,9 @@ from flexget.api.app import (
 
 from . import db
 
+# Responses of the GET endpoints are cached until these tables change
+PENDING_TABLES = [db.PendingEntry]
+
 pending_api = api.namespace('pending', description='View and manage pending entries')
 
 
@@ -63,7 +66,7 @@ description = 'Either \'approve\' or \'reject\''
 
 @pending_api.route('/')
 class PendingEntriesAPI(APIResource):
-    @etag
+    @etag(depends_on=PENDING_TABLES)
     @api.response(NotFoundError)
     @api.response(200, model=pending_entry_list_schema)
     @api.doc(parser=pending_parser)
@@ -176,7 +179,7 @@ class PendingEntriesAPI(APIResource):
 @api.doc(params={'entry_id': 'ID of the entry'})
 @api.response(NotFoundError)
 class PendingEntryAPI(APIResource):
-    @etag
+    @etag(depends_on=PENDING_TABLES)
     @api.response(200, model=pending_entry_schema)
     def get(self, entry_id, session=None):
         """Get a pending entry by ID"""
@@ -16,6 +16,9 @@ from flexget.api.app import (
 
 from . import db
 
+# Responses of the GET endpoints are cached until these tables change
+SEEN_TABLES = [db.SeenEntry, db.SeenField]
+
 seen_api = api.namespace('seen', description='Managed Flexget seen entries and fields')
 
 
@@ -64,7 +67,7 @@ seen_search_parser = api.pagination_parser(seen_base_parser, sort_choices)
 
 @seen_api.route('/')
 class SeenSearchAPI(APIResource):
-    @etag
+    @etag(depends_on=SEEN_TABLES)
     @api.response(NotFoundError)
     @api.response(200, 'Successfully retrieved seen objects', seen_search_schema)
     @api.doc(parser=seen_search_parser, description='Get seen entries')
@@ -159,7 +162,7 @@ class SeenSearchAPI(APIResource):
 @api.doc(params={'seen_entry_id': 'ID of seen entry'})
 @api.response(NotFoundError)
 class SeenSearchIDAPI(APIResource):
-    @etag
+    @etag(depends_on=SEEN_TABLES)
     @api.response(200, model=seen_object_schema)
     def get(self, seen_entry_id, session):
         """ Get seen entry by ID """
@@ -1,4 +1,8 @@
+import base64
+import binascii
 import copy
+import json
+from datetime import datetime
 from math import ceil
 
 from flask import jsonify, request
@@ -35,6 +39,17 @@ try:
 except ImportError:
     raise plugin.DependencyError(issued_by=__name__, missing='tvmaze_lookup')
 
+# Responses of the GET endpoints are cached until these tables change
+SERIES_TABLES = [
+    db.Series,
+    db.Season,
+    db.Episode,
+    db.EpisodeRelease,
+    db.SeasonRelease,
+    db.AlternateNames,
+    db.SeriesTask,
+]
+
 series_api = api.namespace('series', description='FlexGet Series operations')
 
 
@@ -55,6 +70,60 @@ def series_details(show, begin=False, latest=False):
     return series_dict
 
 
+def series_details_list(shows, begin=False, latest=False, session=None):
+    """Same as :func:`series_details` for many shows, loading their details in bulk."""
+    details = db.get_series_details([show.id for show in shows], begin, latest, session=session)
+    series_list = []
+    for show in shows:
+        show_details = details[show.id]
+        series_dict = {
+            'id': show.id,
+            'name': show.name,
+            'alternate_names': show_details['alternate_names'],
+            'in_tasks': show_details['in_tasks'],
+        }
+        if begin:
+            begin_episode = show_details['begin']
+            series_dict['begin_episode'] = begin_episode.to_dict() if begin_episode else None
+        if latest:
+            latest_entity = show_details['latest']
+            series_dict['latest_entity'] = latest_entity.to_dict() if latest_entity else None
+            if latest_entity:
+                series_dict['latest_entity'][
+                    'latest_release'
+                ] = latest_entity.latest_release.to_dict()
+        series_list.append(series_dict)
+    return series_list
+
+
+CURSOR_DATE_FORMAT = '%Y-%m-%d %H:%M:%S.%f'
+
+
+def encode_cursor(after, sort_by, sort_order):
+    value, series_id = after
+    if value == datetime.min:
+        # Series without releases, strftime does not zero pad the year 1
+        value = None
+    elif isinstance(value, datetime):
+        value = value.strftime(CURSOR_DATE_FORMAT)
+    data = json.dumps([sort_by, sort_order, value, series_id])
+    return base64.urlsafe_b64encode(data.encode('utf-8')).decode('ascii')
+
+
+def decode_cursor(cursor, sort_by, sort_order):
+    try:
+        cursor_sort_by, cursor_order, value, series_id = json.loads(
+            base64.urlsafe_b64decode(cursor.encode('ascii'))
+        )
+        if sort_by != 'show_name':
+            value = datetime.min if value is None else datetime.strptime(value, CURSOR_DATE_FORMAT)
+    except (binascii.Error, UnicodeError, TypeError, ValueError):
+        raise BadRequest('invalid cursor `%s`' % cursor)
+    if (cursor_sort_by, cursor_order) != (sort_by, sort_order):
+        raise BadRequest('cursor was not created with the same sort_by and order')
+    return value, series_id
+
+
 class ObjectsContainer:
     episode_release_object = {
         'type': 'object',
@@ -213,6 +282,11 @@ series_list_parser.add_argument(
     help="Get lookup result for every show by sending another request to lookup API",
 )
 series_list_parser.add_argument('query', help="Search by name based on the query")
+series_list_parser.add_argument(
+    'cursor',
+    help="Continue after the last show of the previous page, from its `Next-Cursor` header. "
+    "Replaces `page`, and stays fast for deep pages",
+)
 
 ep_identifier_doc = (
     "'episode_identifier' should be one of SxxExx, integer or date formatted such as 2012-12-12"
@@ -221,7 +295,7 @@ ep_identifier_doc = (
 
 @series_api.route('/')
 class SeriesAPI(APIResource):
-    @etag
+    @etag(depends_on=SERIES_TABLES, uncached_args=['lookup'])
     @api.response(200, 'Series list retrieved successfully', series_list_schema)
     @api.response(NotFoundError)
     @api.doc(parser=series_list_parser, description="Get a  list of Flexget's shows in DB")
@@ -251,7 +325,9 @@ class SeriesAPI(APIResource):
         begin = args.get('begin')
         latest = args.get('latest')
 
-        start = per_page * (page - 1)
+        cursor = args.get('cursor')
+        after = decode_cursor(cursor, sort_by, sort_order) if cursor else None
+        start = per_page * (page - 1) if not after else 0
         stop = start + per_page
 
         kwargs = {
@@ -263,6 +339,7 @@ class SeriesAPI(APIResource):
             'descending': descending,
             'session': session,
             'name': name,
+            'after': after,
         }
 
         total_items = db.get_series_summary(count=True, **kwargs)
@@ -270,15 +347,13 @@ class SeriesAPI(APIResource):
         if not total_items:
             return jsonify([])
 
-        series_list = []
-        for s in db.get_series_summary(**kwargs):
-            series_object = series_details(s, begin, latest)
-            series_list.append(series_object)
+        shows = db.get_series_summary(**kwargs).all()
+        series_list = series_details_list(shows, begin, latest, session=session)
 
         # Total number of pages
         total_pages = int(ceil(total_items / float(per_page)))
 
-        if total_pages < page and total_pages != 0:
+        if not after and total_pages < page and total_pages != 0:
             raise NotFoundError('page %s does not exist' % page)
 
         # Actual results in page
@@ -296,14 +371,18 @@ class SeriesAPI(APIResource):
                     result = api_client.get_endpoint(url)
                     series_list[pos]['lookup'].update({endpoint: result})
 
-        # Get pagination headers
-        pagination = pagination_headers(total_pages, total_items, actual_size, request)
-
         # Created response
         rsp = jsonify(series_list)
 
-        # Add link header to response
-        rsp.headers.extend(pagination)
+        if after:
+            # Page links don't apply when continuing from a cursor
+            rsp.headers['Total-Count'] = total_items
+            rsp.headers['Count'] = actual_size
+        else:
+            rsp.headers.extend(pagination_headers(total_pages, total_items, actual_size, request))
+        if len(shows) == per_page:
+            next_after = db.series_cursor(shows[-1], sort_by, session=session)
+            rsp.headers['Next-Cursor'] = encode_cursor(next_after, sort_by, sort_order)
         return rsp
 
     @api.response(201, model=show_details_schema)
@@ -343,7 +422,7 @@ class SeriesAPI(APIResource):
     description='Searches for a show in the DB via its name. Returns a list of matching shows.'
 )
 class SeriesGetShowsAPI(APIResource):
-    @etag
+    @etag(depends_on=SERIES_TABLES)
     @api.response(200, 'Show list retrieved successfully', series_list_schema)
     @api.doc(params={'name': 'Name of the show(s) to search'}, parser=base_series_parser)
     def get(self, name, session):
@@ -376,7 +455,7 @@ delete_parser.add_argument(
 @api.doc(params={'show_id': 'ID of the show'})
 @api.response(NotFoundError)
 class SeriesShowAPI(APIResource):
-    @etag
+    @etag(depends_on=SERIES_TABLES)
     @api.response(200, 'Show information retrieved successfully', show_details_schema)
     @api.doc(description='Get a specific show using its ID', parser=base_series_parser)
     def get(self, show_id, session):
@@ -446,7 +525,7 @@ entity_parser = api.pagination_parser(add_sort=True)
     description='The \'Series-ID\' header will be appended to the result headers',
 )
 class SeriesSeasonsAPI(APIResource):
-    @etag
+    @etag(depends_on=SERIES_TABLES)
     @api.response(200, 'Seasons retrieved successfully for show', season_list_schema)
     @api.doc(description='Get all show seasons via its ID', parser=entity_parser)
     def get(self, show_id, session):
@@ -525,7 +604,7 @@ class SeriesSeasonsAPI(APIResource):
 @series_api.route('/<int:show_id>/seasons/<int:season_id>/')
 @api.doc(params={'show_id': 'ID of the show', 'season_id': 'Season ID'})
 class SeriesSeasonsAPI(APIResource):
-    @etag
+    @etag(depends_on=SERIES_TABLES)
     @api.response(200, 'Season retrieved successfully for show', season_schema)
     @api.doc(description='Get a specific season via its ID and show ID')
     def get(self, show_id, season_id, session):
@@ -581,7 +660,7 @@ class SeriesSeasonsAPI(APIResource):
     description='The \'Series-ID\' header will be appended to the result headers',
 )
 class SeriesEpisodesAPI(APIResource):
-    @etag
+    @etag(depends_on=SERIES_TABLES)
     @api.response(200, 'Episodes retrieved successfully for show', episode_list_schema)
     @api.doc(description='Get all show episodes via its ID', parser=entity_parser)
     def get(self, show_id, session):
@@ -660,7 +739,7 @@ class SeriesEpisodesAPI(APIResource):
 @series_api.route('/<int:show_id>/episodes/<int:ep_id>/')
 @api.doc(params={'show_id': 'ID of the show', 'ep_id': 'Episode ID'})
 class SeriesEpisodeAPI(APIResource):
-    @etag
+    @etag(depends_on=SERIES_TABLES)
     @api.response(200, 'Episode retrieved successfully for show', episode_schema)
     @api.doc(description='Get a specific episode via its ID and show ID')
     def get(self, show_id, ep_id, session):
@@ -735,7 +814,7 @@ release_delete_parser.add_argument(
     'The \'Season-ID\' header will be appended to the result headers.',
 )
 class SeriesSeasonsReleasesAPI(APIResource):
-    @etag
+    @etag(depends_on=SERIES_TABLES)
     @api.response(200, 'Releases retrieved successfully for season', season_release_list_schema)
     @api.doc(
         description='Get all matching releases for a specific season of a specific show.',
@@ -893,7 +972,7 @@ class SeriesSeasonsReleasesAPI(APIResource):
     'The \'Season-ID\' header will be appended to the result headers.',
 )
 class SeriesSeasonReleaseAPI(APIResource):
-    @etag
+    @etag(depends_on=SERIES_TABLES)
     @api.response(200, 'Release retrieved successfully for season', season_release_schema)
     @api.doc(
         description='Get a specific downloaded release for a specific season of a specific show'
@@ -995,7 +1074,7 @@ class SeriesSeasonReleaseAPI(APIResource):
     'The \'Episode-ID\' header will be appended to the result headers.',
 )
 class SeriesEpisodeReleasesAPI(APIResource):
-    @etag
+    @etag(depends_on=SERIES_TABLES)
     @api.response(200, 'Releases retrieved successfully for episode', episode_release_list_schema)
     @api.doc(
         description='Get all matching releases for a specific episode of a specific show.',
@@ -1151,7 +1230,7 @@ class SeriesEpisodeReleasesAPI(APIResource):
     'The \'Episode-ID\' header will be appended to the result headers.',
 )
 class SeriesEpisodeReleaseAPI(APIResource):
-    @etag
+    @etag(depends_on=SERIES_TABLES)
     @api.response(200, 'Release retrieved successfully for episode', episode_release_schema)
     @api.doc(
         description='Get a specific downloaded release for a specific episode of a specific show'
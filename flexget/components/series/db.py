@@ -15,13 +15,12 @@ from sqlalchemy import (
     and_,
     delete,
     desc,
-    func,
-    select,
-    update,
 )
+from sqlalchemy import event as sqlalchemy_event
+from sqlalchemy import func, literal, or_, select, update
 from sqlalchemy.exc import OperationalError
 from sqlalchemy.ext.hybrid import Comparator, hybrid_property
-from sqlalchemy.orm import backref, relation
+from sqlalchemy.orm import backref, relation, selectinload
 
 from flexget import db_schema, plugin
 from flexget.components.series.utils import normalize_series_name
@@ -38,7 +37,7 @@ from flexget.utils.sqlalchemy_utils import (
 )
 from flexget.utils.tools import parse_episode_identifier
 
-SCHEMA_VER = 14
+SCHEMA_VER = 15
 logger = logger.bind(name='series.db')
 Base = db_schema.versioned_base('series', SCHEMA_VER)
 
@@ -559,8 +558,113 @@ class SeriesTask(Base):
         self.name = name
 
 
+class SeriesSummary(Base):
+    """
+    Aggregates of the releases of a series, so that series can be listed, filtered and sorted without
+    grouping all their episodes and releases. Kept up to date by the session events below whenever a
+    flush changes a series, its episodes, seasons or releases.
+    """
+
+    __tablename__ = 'series_summaries'
+
+    series_id = Column(Integer, ForeignKey('series.id'), primary_key=True)
+    # first_seen of the newest release
+    last_seen = Column(DateTime, index=True)
+    # Highest season and episode numbers of the downloaded episodes
+    downloaded_season = Column(Integer)
+    downloaded_number = Column(Integer)
+    latest_episode_id = Column(Integer)
+    latest_season_id = Column(Integer)
+
+    def __str__(self):
+        return '<SeriesSummary(series_id=%s,last_seen=%s)>' % (self.series_id, self.last_seen)
+
+
 Index('episode_series_identifier', Episode.series_id, Episode.identifier)
 
+SUMMARIES_KEY = 'series_summaries'
+
+
+def update_summaries(session, series_ids):
+    """Recomputes the :class:`SeriesSummary` rows of `series_ids`, removing those of deleted series."""
+    series_ids = set(series_ids) - {None}
+    if not series_ids:
+        return
+    summaries = SeriesSummary.__table__
+    # Stay below the sqlite limit of bound parameters
+    series_ids = sorted(series_ids)
+    for i in range(0, len(series_ids), 500):
+        chunk = series_ids[i : i + 500]
+        session.execute(delete(summaries, summaries.c.series_id.in_(chunk)))
+        last_seen = dict(
+            session.query(Episode.series_id, func.max(EpisodeRelease.first_seen))
+            .join(Episode.releases)
+            .filter(Episode.series_id.in_(chunk))
+            .group_by(Episode.series_id)
+        )
+        downloaded = {
+            row[0]: row[1:]
+            for row in session.query(
+                Episode.series_id, func.max(Episode.season), func.max(Episode.number)
+            )
+            .join(Episode.releases)
+            .filter(Episode.series_id.in_(chunk))
+            .filter(EpisodeRelease.downloaded == True)
+            .group_by(Episode.series_id)
+        }
+        rows = []
+        for series in session.query(Series).filter(Series.id.in_(chunk)):
+            latest_episode = get_latest_episode_release(series)
+            latest_season = get_latest_season_pack_release(series)
+            rows.append(
+                {
+                    'series_id': series.id,
+                    'last_seen': last_seen.get(series.id),
+                    'downloaded_season': downloaded.get(series.id, (None, None))[0],
+                    'downloaded_number': downloaded.get(series.id, (None, None))[1],
+                    'latest_episode_id': latest_episode.id if latest_episode else None,
+                    'latest_season_id': latest_season.id if latest_season else None,
+                }
+            )
+        if rows:
+            session.execute(summaries.insert(), rows)
+
+
+def rebuild_summaries(session):
+    """Recomputes the :class:`SeriesSummary` rows of all series."""
+    session.execute(delete(SeriesSummary.__table__))
+    update_summaries(session, [row[0] for row in session.query(Series.id)])
+
+
+@sqlalchemy_event.listens_for(Session, 'after_flush')
+def record_changed_series(session, flush_context):
+    series_ids = session.info.setdefault(SUMMARIES_KEY, set())
+    episode_ids, season_ids = set(), set()
+    for instance in session.new | session.dirty | session.deleted:
+        if isinstance(instance, Series):
+            series_ids.add(instance.id)
+        elif isinstance(instance, (Episode, Season)):
+            series_ids.add(instance.series_id)
+        elif isinstance(instance, EpisodeRelease):
+            episode_ids.add(instance.episode_id)
+        elif isinstance(instance, SeasonRelease):
+            season_ids.add(instance.season_id)
+    episode_ids.discard(None)
+    season_ids.discard(None)
+    if episode_ids:
+        series_ids.update(
+            row[0] for row in session.query(Episode.series_id).filter(Episode.id.in_(episode_ids))
+        )
+    if season_ids:
+        series_ids.update(
+            row[0] for row in session.query(Season.series_id).filter(Season.id.in_(season_ids))
+        )
+
+
+@sqlalchemy_event.listens_for(Session, 'after_flush_postexec')
+def update_changed_summaries(session, flush_context):
+    update_summaries(session, session.info.pop(SUMMARIES_KEY, ()))
+
 
 @db_schema.upgrade('series')
 def upgrade(ver, session):
@@ -719,13 +823,18 @@ def upgrade(ver, session):
         # New season_releases table, added by "create_all"
         logger.info('Adding season_releases table')
         ver = 14
+    if ver == 14:
+        # New series_summaries table, added by "create_all"
+        logger.info('Filling series_summaries table')
+        rebuild_summaries(session)
+        ver = 15
     return ver
 
 
 @event('manager.db_cleanup')
 def db_cleanup(manager, session):
     # Clean up old undownloaded releases
-    result = (
+    result = releases_removed = (
         session.query(EpisodeRelease)
         .filter(EpisodeRelease.downloaded == False)
         .filter(EpisodeRelease.first_seen < datetime.now() - timedelta(days=120))
@@ -751,6 +860,9 @@ def db_cleanup(manager, session):
     )
     if result:
         logger.verbose('Removed {} series without episodes.', result)
+    if releases_removed or result:
+        # Bulk deletes are not seen by the session events keeping the summaries up to date
+        rebuild_summaries(session)
 
 
 def set_alt_names(alt_names, db_series, session):
@@ -904,6 +1016,14 @@ def _add_alt_name(alt, db_series, series_name, session):
         logger.debug('-> added {}', db_series_alt)
 
 
+def series_sort_key(sort_by='show_name'):
+    """Returns the column the series summary is sorted by for `sort_by`."""
+    if sort_by == 'show_name':
+        return Series._name_normalized
+    # Series without releases come first, as they did when sorting by max(first_seen)
+    return func.coalesce(SeriesSummary.last_seen, literal(datetime.min, DateTime))
+
+
 @with_session
 def get_series_summary(
     configured=None,
@@ -915,6 +1035,7 @@ def get_series_summary(
     descending=None,
     session=None,
     name=None,
+    after=None,
 ):
     """
     Return a query with results for all series.
@@ -924,6 +1045,9 @@ def get_series_summary(
     :param premieres: Return only shows with 1 season and less than 3 episodes
     :param count: Decides whether to return count of all shows or data itself
     :param session: Passed session
+    :param after: Tuple of the sort key and id of the last show of the previous page, to continue
+        after it (keyset pagination). Unlike `start` this does not get slower for deep pages.
+        See :func:`series_cursor`.
     :return:
     """
     if not configured:
@@ -932,32 +1056,116 @@ def get_series_summary(
         raise LookupError(
             '"configured" parameter must be either "configured", "unconfigured", or "all"'
         )
-    query = session.query(Series)
-    query = (
-        query.outerjoin(Series.episodes)
-        .outerjoin(Episode.releases)
-        .outerjoin(Series.in_tasks)
-        .group_by(Series.id)
-    )
+    query = session.query(Series).outerjoin(SeriesSummary, SeriesSummary.series_id == Series.id)
     if configured == 'configured':
-        query = query.having(func.count(SeriesTask.id) >= 1)
+        query = query.filter(Series.in_tasks.any())
     elif configured == 'unconfigured':
-        query = query.having(func.count(SeriesTask.id) < 1)
+        query = query.filter(~Series.in_tasks.any())
     if name:
         query = query.filter(Series._name_normalized.contains(name))
     if premieres:
-        query = (
-            query.having(func.max(Episode.season) <= 1).having(func.max(Episode.number) <= 2)
-        ).filter(EpisodeRelease.downloaded == True)
+        query = query.filter(SeriesSummary.downloaded_season <= 1).filter(
+            SeriesSummary.downloaded_number <= 2
+        )
     if count:
-        return query.group_by(Series).count()
-    if sort_by == 'show_name':
-        order_by = Series.name
+        return query.count()
+    sort_key = series_sort_key(sort_by)
+    if after:
+        value, series_id = after
+        if descending:
+            query = query.filter(
+                or_(sort_key < value, and_(sort_key == value, Series.id < series_id))
+            )
+        else:
+            query = query.filter(
+                or_(sort_key > value, and_(sort_key == value, Series.id > series_id))
+            )
+    if descending:
+        query = query.order_by(desc(sort_key), desc(Series.id))
     else:
-        order_by = func.max(EpisodeRelease.first_seen)
-    query = query.order_by(desc(order_by)) if descending else query.order_by(order_by)
+        query = query.order_by(sort_key, Series.id)
+    return query.slice(start, stop)
 
-    return query.slice(start, stop).from_self()
+
+def series_cursor(series, sort_by='show_name', session=None):
+    """Returns the `after` tuple of :func:`get_series_summary` continuing after `series`."""
+    if sort_by == 'show_name':
+        return series.name_normalized, series.id
+    value = (
+        session.query(series_sort_key(sort_by))
+        .select_from(Series)
+        .outerjoin(SeriesSummary, SeriesSummary.series_id == Series.id)
+        .filter(Series.id == series.id)
+        .scalar()
+    )
+    return value, series.id
+
+
+def get_series_details(series_ids, begin=False, latest=False, session=None):
+    """
+    Loads the details shown for many series at once, with a fixed number of queries instead of
+    several per series.
+
+    :param series_ids: Ids of the series
+    :param begin: Load the begin episodes
+    :param latest: Load the latest downloaded entities, from the :class:`SeriesSummary`
+    :return: Dict of series id to a dict with `alternate_names` and `in_tasks` lists of names, and
+        the `begin` and `latest` entities (or None) if asked for
+    """
+    series_ids = list(series_ids)
+    details = {series_id: {'alternate_names': [], 'in_tasks': []} for series_id in series_ids}
+    if not series_ids:
+        return details
+    for series_id, alt_name in (
+        session.query(AlternateNames.series_id, AlternateNames.alt_name)
+        .filter(AlternateNames.series_id.in_(series_ids))
+        .order_by(AlternateNames.id)
+    ):
+        details[series_id]['alternate_names'].append(alt_name)
+    for series_id, task_name in (
+        session.query(SeriesTask.series_id, SeriesTask.name)
+        .filter(SeriesTask.series_id.in_(series_ids))
+        .order_by(SeriesTask.id)
+    ):
+        details[series_id]['in_tasks'].append(task_name)
+
+    if begin:
+        for detail in details.values():
+            detail['begin'] = None
+        rows = (
+            session.query(Series.id, Episode)
+            .join(Episode, Series.begin_episode_id == Episode.id)
+            .filter(Series.id.in_(series_ids))
+            .options(selectinload(Episode.releases))
+        )
+        for series_id, episode in rows:
+            details[series_id]['begin'] = episode
+
+    if latest:
+        summaries = (
+            session.query(SeriesSummary).filter(SeriesSummary.series_id.in_(series_ids)).all()
+        )
+        episodes = _load_by_id(
+            session, Episode, [summary.latest_episode_id for summary in summaries]
+        )
+        seasons = _load_by_id(session, Season, [summary.latest_season_id for summary in summaries])
+        for detail in details.values():
+            detail['latest'] = None
+        for summary in summaries:
+            episode = episodes.get(summary.latest_episode_id)
+            season = seasons.get(summary.latest_season_id)
+            if episode is not None or season is not None:
+                # Same as get_latest_release
+                details[summary.series_id]['latest'] = max(season, episode)
+    return details
+
+
+def _load_by_id(session, model, ids):
+    ids = [i for i in ids if i is not None]
+    if not ids:
+        return {}
+    query = session.query(model).filter(model.id.in_(ids)).options(selectinload(model.releases))
+    return {instance.id: instance for instance in query}
 
 
 def auto_identified_by(series):
@@ -0,0 +1,62 @@
+"""
+Batched episode searches for indexers which support season level queries (torznab, newznab).
+
+Searching for the wanted episodes of a show one at a time costs one indexer query per episode.
+Instead the search plugins can fetch all the results for the season (or the indexer's latest
+releases feed) once, keep them here for a while, and pick the results for each wanted episode
+locally by parsing their titles.
+"""
+from loguru import logger
+
+from flexget import plugin
+from flexget.entry import Entry
+from flexget.utils.tools import TimedDict
+
+logger = logger.bind(name='episode_batch')
+
+# How long the results of a batched query are used for further episodes
+BATCH_TTL = '10 minutes'
+
+BATCH_SCHEMA = {'type': 'string', 'enum': ['season', 'feed']}
+
+_results = TimedDict(BATCH_TTL)
+
+
+def is_episode(entry):
+    """Returns True if `entry` is a single episode which can be searched for in a batch."""
+    return bool(
+        entry.get('series_name')
+        and entry.get('series_season') is not None
+        and entry.get('series_episode') is not None
+    )
+
+
+def matches_episode(result, entry):
+    """Returns True if the title of search `result` is the episode wanted by `entry`."""
+    parser = plugin.get('parsing', 'episode_batch')
+    parsed = parser.parse_series(result['title'], name=entry['series_name'])
+    return (
+        parsed.valid
+        and parsed.id_type == 'ep'
+        and parsed.season == entry['series_season']
+        and parsed.episode == entry['series_episode']
+    )
+
+
+def batch_search(key, fetch, entry):
+    """
+    Returns the results for the episode wanted by `entry` from a batched query.
+
+    :param tuple key: Identifies the batched query, eg. the indexer url with its parameters
+    :param fetch: Callable running the batched query, returning all its result entries
+    :param entry: Entry for the wanted episode
+    :return: List of new entries for the matching results
+    """
+    results = _results.get(key)
+    if results is None:
+        results = fetch()
+        logger.debug('Batched query {} returned {} results', key[0], len(results))
+        _results[key] = results
+    else:
+        logger.verbose('Using {} results of batched query for `{}`', len(results), entry['title'])
+    return [Entry(result) for result in results if matches_episode(result, entry)]
@@ -57,6 +57,8 @@ class UrlRewriteAllyoulike:
         - allyoulike.com/\d*/(?!renew-or-purchase|for-vip-members-only)[^/]*/$
     """
 
+    url_rewrite_hosts = ['allyoulike.com']
+
     # urlrewriter API
     def url_rewritable(self, task, entry):
         url = entry['url']
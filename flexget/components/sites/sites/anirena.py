@@ -9,6 +9,8 @@ logger = logger.bind(name='anirena')
 class UrlRewriteAniRena:
     """AniRena urlrewriter."""
 
+    url_rewrite_hosts = ['www.anirena.com']
+
     def url_rewritable(self, task, entry):
         return entry['url'].startswith('http://www.anirena.com/viewtracker.php?action=details&id=')
 
@@ -9,6 +9,8 @@ logger = logger.bind(name="archetorrent")
 class UrlRewriteArchetorrent:
     """Archetorrent urlrewriter."""
 
+    url_rewrite_hosts = ['www.archetorrent.com']
+
     # urlrewriter API
     def url_rewritable(self, task, entry):
         url = entry['url']
@@ -11,6 +11,8 @@ logger = logger.bind(name='bakabt')
 class UrlRewriteBakaBT:
     """BakaBT urlrewriter."""
 
+    url_rewrite_hosts = ['bakabt.me']
+
     # urlrewriter API
     def url_rewritable(self, task, entry):
         url = entry['url']
@@ -13,6 +13,8 @@ logger = logger.bind(name='deadfrog')
 class UrlRewriteDeadFrog:
     """DeadFrog urlrewriter."""
 
+    url_rewrite_hosts = ['deadfrog.us']
+
     # urlrewriter API
     def url_rewritable(self, task, entry):
         url = entry['url']
@@ -19,6 +19,8 @@ DOMAINS = [
 class UrlRewriteETTV:
     """ETTV urlrewriter."""
 
+    url_rewrite_hosts = DOMAINS
+
     # urlrewriter API
     def url_rewritable(self, task, entry):
         return urlparse(entry['url']).netloc in DOMAINS
@@ -17,6 +17,8 @@ EZTV_MIRRORS = [('http', 'eztv.ch'), ('https', 'eztv-proxy.net'), ('http', 'eztv
 class UrlRewriteEztv:
     """Eztv url rewriter."""
 
+    url_rewrite_hosts = ['eztv.ch']
+
     def url_rewritable(self, task, entry):
         return urlparse(entry['url']).netloc == 'eztv.ch'
 
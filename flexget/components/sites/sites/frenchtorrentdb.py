@@ -13,6 +13,8 @@ logger = logger.bind(name='FTDB')
 class UrlRewriteFTDB:
     """FTDB RSS url_rewrite"""
 
+    url_rewrite_hosts = ['www.frenchtorrentdb.com']
+
     def url_rewritable(self, task, entry):
         # url = entry['url']
         if re.match(r'^http://www\.frenchtorrentdb\.com/[^/]+(?!/)[^/]+&rss=1', entry['url']):
@@ -19,6 +19,8 @@ requests.add_domain_limiter(TimedLimiter('imdb.com', '2 seconds'))
 class UrlRewriteGoogleCse:
     """Google custom query urlrewriter."""
 
+    url_rewrite_hosts = ['www.google.com']
+
     # urlrewriter API
     def url_rewritable(self, task, entry):
         if entry['url'].startswith('http://www.google.com/cse?'):
@@ -13,6 +13,8 @@ logger = logger.bind(name='hliang')
 class UrlRewriteHliang:
     """Hliang urlrewriter."""
 
+    url_rewrite_hosts = ['bt.hliang.com']
+
     # urlrewriter API
     def url_rewritable(self, task, entry):
         url = entry['url']
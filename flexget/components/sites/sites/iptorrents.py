@@ -93,6 +93,8 @@ class UrlRewriteIPTorrents:
         'additionalProperties': False,
     }
 
+    url_rewrite_hosts = ['iptorrents.com']
+
     # urlrewriter API
     def url_rewritable(self, task, entry):
         url = entry['url']
@@ -13,6 +13,8 @@ logger = logger.bind(name='koreus')
 class UrlRewriteKoreus:
     """Koreus urlrewriter."""
 
+    url_rewrite_hosts = ['www.koreus.com']
+
     # urlrewriter API
     def url_rewritable(self, task, entry):
         url = entry['url']
@@ -17,6 +17,8 @@ logger = logger.bind(name='newtorrents')
 class NewTorrents:
     """NewTorrents urlrewriter and search plugin."""
 
+    url_rewrite_hosts = ['www.newtorrents.info']
+
     def __init__(self):
         self.resolved = []
 
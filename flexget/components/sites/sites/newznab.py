@@ -2,6 +2,7 @@ import feedparser
 from loguru import logger
 
 from flexget import plugin
+from flexget.components.sites.episode_batch import BATCH_SCHEMA, batch_search, is_episode
 from flexget.entry import Entry
 from flexget.event import event
 from flexget.utils.requests import RequestException
@@ -25,6 +26,9 @@ class Newznab:
           category: movie
 
     Category is any of: movie, tvsearch, music, book, all
+
+    With `batch` set, tvsearch episodes are searched for with queries for their whole season
+    (`season`) or the latest releases of the indexer (`feed`), shared by all the wanted episodes.
     """
 
     schema = {
@@ -37,6 +41,7 @@ class Newznab:
             'url': {'type': 'string', 'format': 'url'},
             'website': {'type': 'string', 'format': 'url'},
             'apikey': {'type': 'string'},
+            'batch': BATCH_SCHEMA,
         },
         'required': ['category'],
         'additionalProperties': False,
@@ -113,6 +118,8 @@ class Newznab:
             or 'series_episode' not in arg_entry
         ):
             return []
+        if config.get('batch') and is_episode(arg_entry):
+            return self.do_batch_search_tvsearch(arg_entry, task, config)
         if arg_entry.get('tvrage_id'):
             config['params']['rid'] = arg_entry.get('tvrage_id')
         else:
@@ -121,6 +128,19 @@ class Newznab:
         config['params']['ep'] = arg_entry['series_episode']
         return self.fill_entries_for_url(config['url'], config['params'], task)
 
+    def do_batch_search_tvsearch(self, arg_entry, task, config):
+        params = config['params']
+        if config['batch'] == 'season':
+            if arg_entry.get('tvrage_id'):
+                params['rid'] = arg_entry.get('tvrage_id')
+            else:
+                params['q'] = arg_entry['series_name']
+            params['season'] = arg_entry['series_season']
+        key = ('newznab', config['url'], tuple(sorted(params.items())))
+        return batch_search(
+            key, lambda: self.fill_entries_for_url(config['url'], params, task), arg_entry
+        )
+
     def do_search_movie(self, arg_entry, task, config=None):
         logger.info('Searching for {} (imdb_id:{})', arg_entry['title'], arg_entry.get('imdb_id'))
         # normally this should be used with emit_movie_queue who has imdbid (i guess)
@@ -49,6 +49,8 @@ FILTERS = ['all', 'filter remakes', 'trusted only']
 class UrlRewriteNyaa:
     """Nyaa urlrewriter and search plugin."""
 
+    url_rewrite_hosts = ['www.nyaa.si']
+
     schema = {
         'oneOf': [
             {'type': 'string', 'enum': list(CATEGORIES)},
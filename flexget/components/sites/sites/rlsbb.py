@@ -70,6 +70,8 @@ class UrlRewriteRlsbb:
     # Since the urlrewriter relies on a config, we need to create a default one
     config = {'filehosters_re': [], 'link_text_re': DEFAULT_DOWNLOAD_TEXT, 'parse_comments': False}
 
+    url_rewrite_hosts = ['rlsbb.ru', 'rlsbb.com']
+
     # grab config
     def on_task_start(self, task, config):
         self.config = config
@@ -47,6 +47,8 @@ class UrlRewriteRmz:
     # Since the urlrewriter relies on a config, we need to create a default one
     config = {'filehosters_re': []}
 
+    url_rewrite_hosts = ['rmz.cr', 'rapidmoviez.com', 'rapidmoviez.eu']
+
     # grab config
     def on_task_start(self, task, config):
         self.config = config
@@ -58,6 +58,8 @@ class UrlRewriteSerienjunkies:
     # Since the urlrewriter relies on a config, we need to create a default one
     config = {'hoster': DEFAULT_HOSTER, 'language': DEFAULT_LANGUAGE}
 
+    url_rewrite_hosts = ['serienjunkies.org']
+
     def on_task_start(self, task, config):
         self.config = config
 
@@ -40,6 +40,8 @@ class Site1337x:
     base_url = 'http://1337x.to/'
     errors = False
 
+    url_rewrite_hosts = ['1337x.to']
+
     # urlrewriter API
     def url_rewritable(self, task, entry):
         url = entry['url']
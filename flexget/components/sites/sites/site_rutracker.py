@@ -17,6 +17,8 @@ class SiteRutracker:
 
     base_url = 'https://api.t-ru.org'
 
+    url_rewrite_hosts = ['rutracker.org']
+
     # urlrewriter API
     def url_rewritable(self, task, entry):
         url = entry['url']
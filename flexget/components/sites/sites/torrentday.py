@@ -80,6 +80,8 @@ class UrlRewriteTorrentday:
         'additionalProperties': False,
     }
 
+    url_rewrite_hosts = ['www.torrentday.com']
+
     # urlrewriter API
     def url_rewritable(self, task, entry):
         url = entry['url']
@@ -67,6 +67,8 @@ class UrlRewriteTorrentleech:
         'additionalProperties': False,
     }
 
+    url_rewrite_hosts = ['www.torrentleech.org']
+
     # urlrewriter API
     def url_rewritable(self, task, entry):
         url = entry['url']
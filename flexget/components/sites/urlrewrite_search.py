@@ -4,6 +4,7 @@ from loguru import logger
 
 from flexget import plugin
 from flexget.event import event
+from flexget.utils.search_cache import SEARCH_CACHE_SCHEMA, SearchCache
 
 logger = logger.bind(name='urlrewrite_search')
 
@@ -21,11 +22,20 @@ class PluginSearch:
         - newtorrents
         - piratebay
 
+    Search results can be cached, see the `cache` option of `discover`::
+
+      urlrewrite_search:
+        from:
+          - newtorrents
+          - piratebay
+        cache:
+          ttl: 1 hour
+
     .. note:: Some url rewriters will use search plugins automatically if entry url
               points into a search page.
     """
 
-    schema = {
+    searches_schema = {
         'type': 'array',
         'items': {
             'allOf': [
@@ -35,6 +45,18 @@ class PluginSearch:
         },
     }
 
+    schema = {
+        'oneOf': [
+            searches_schema,
+            {
+                'type': 'object',
+                'properties': {'from': searches_schema, 'cache': SEARCH_CACHE_SCHEMA},
+                'required': ['from'],
+                'additionalProperties': False,
+            },
+        ]
+    }
+
     # Run before main urlrewriting
     @plugin.priority(130)
     def on_task_urlrewrite(self, task, config):
@@ -42,6 +64,10 @@ class PluginSearch:
         if task.manager.unit_test:
             return
 
+        if isinstance(config, list):
+            config = {'from': config}
+        cache = SearchCache(config['cache']) if config.get('cache') else None
+
         plugins = {}
         for p in plugin.get_plugins(interface='search'):
             plugins[p.name] = p.instance
@@ -49,23 +75,23 @@ class PluginSearch:
         # search accepted
         for entry in task.accepted:
             # loop through configured searches
-            for name in config:
+            for name in config['from']:
                 search_config = None
                 if isinstance(name, dict):
                     # the name is the first/only key in the dict.
                     name, search_config = list(name.items())[0]
                 logger.verbose('Searching `{}` from {}', entry['title'], name)
                 try:
-                    try:
-                        results = plugins[name].search(
-                            task=task, entry=entry, config=search_config
-                        )
-                    except TypeError:
-                        # Old search api did not take task argument
-                        logger.warning(
-                            'Search plugin {} does not support latest search api.', name
+                    if cache:
+                        results = cache.search(
+                            name,
+                            task,
+                            entry,
+                            lambda: self.search(task, entry, name, plugins[name], search_config),
+                            config=search_config,
                         )
-                        results = plugins[name].search(entry, search_config)
+                    else:
+                        results = self.search(task, entry, name, plugins[name], search_config)
                     matcher = SequenceMatcher(a=entry['title'])
                     for result in results:
                         matcher.set_seq2(result['title'])
@@ -88,6 +114,15 @@ class PluginSearch:
                 entry['immortal'] = False
                 entry.reject('search failed')
 
+    @staticmethod
+    def search(task, entry, name, search, search_config):
+        try:
+            return search.search(task=task, entry=entry, config=search_config)
+        except TypeError:
+            # Old search api did not take task argument
+            logger.warning('Search plugin {} does not support latest search api.', name)
+            return search.search(entry, search_config)
+
 
 @event('plugin.register')
 def register_plugin():
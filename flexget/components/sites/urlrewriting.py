@@ -1,3 +1,5 @@
+from urllib.parse import urlparse
+
 from loguru import logger
 
 from flexget import plugin
@@ -14,6 +16,43 @@ class UrlRewritingError(Exception):
         return repr(self.value)
 
 
+class RewriterIndex:
+    """
+    Index of the registered urlrewriters by the url hosts they handle.
+
+    Rewriters can declare the hosts they handle with an `url_rewrite_hosts` attribute, a list of host names which
+    also match their subdomains. Only those rewriters (and the ones not declaring any hosts) are asked whether they
+    can rewrite an url.
+    """
+
+    def __init__(self, rewriters):
+        self.rewriters = list(rewriters)
+        self._by_host = {}
+        self._generic = set()
+        for rewriter in self.rewriters:
+            hosts = getattr(rewriter.instance, 'url_rewrite_hosts', None)
+            if hosts is None:
+                self._generic.add(rewriter.name)
+                continue
+            for host in hosts:
+                self._by_host.setdefault(host.lower(), set()).add(rewriter.name)
+        self._cache = {}
+
+    def candidates(self, url):
+        """Returns names of the rewriters which may be able to rewrite `url`."""
+        try:
+            host = (urlparse(url).hostname or '') if url else ''
+        except ValueError:
+            host = ''
+        if host not in self._cache:
+            names = set(self._generic)
+            parts = host.split('.')
+            for i in range(len(parts)):
+                names.update(self._by_host.get('.'.join(parts[i:]), ()))
+            self._cache[host] = names
+        return self._cache[host]
+
+
 class PluginUrlRewriting:
     """
     Provides URL rewriting framework
@@ -21,6 +60,16 @@ class PluginUrlRewriting:
 
     def __init__(self):
         self.disabled_rewriters = []
+        self._index = None
+        self._indexed_plugins = None
+
+    @property
+    def index(self):
+        # Rebuilt when plugins are (re)loaded
+        if self._index is None or self._indexed_plugins != len(plugin.plugins):
+            self._index = RewriterIndex(plugin.get_plugins(interface='urlrewriter'))
+            self._indexed_plugins = len(plugin.plugins)
+        return self._index
 
     def on_task_urlrewrite(self, task, config):
         logger.debug('Checking {} entries', len(task.accepted))
@@ -35,7 +84,11 @@ class PluginUrlRewriting:
     # API method
     def url_rewritable(self, task, entry):
         """Return True if entry is urlrewritable by registered rewriter."""
-        for urlrewriter in plugin.get_plugins(interface='urlrewriter'):
+        index = self.index
+        candidates = index.candidates(entry.get('url'))
+        for urlrewriter in index.rewriters:
+            if urlrewriter.name not in candidates:
+                continue
             if urlrewriter.name in self.disabled_rewriters:
                 logger.trace("Skipping rewriter {} since it's disabled", urlrewriter.name)
                 continue
@@ -56,8 +109,11 @@ class PluginUrlRewriting:
                     'URL rewriting was left in infinite loop while rewriting url for %s, '
                     'some rewriter is returning always True' % entry
                 )
-            for urlrewriter in plugin.get_plugins(interface='urlrewriter'):
+            index = self.index
+            for urlrewriter in index.rewriters:
                 name = urlrewriter.name
+                if name not in index.candidates(entry['url']):
+                    continue
                 if name in self.disabled_rewriters:
                     logger.trace("Skipping rewriter {} since it's disabled", name)
                     continue
@@ -1,4 +1,6 @@
 import functools
+import itertools
+import sys
 import types
 import warnings
 from enum import Enum
@@ -7,6 +9,7 @@ from typing import Callable, Iterable, Mapping, Optional, Sequence, Union, Dict
 from loguru import logger
 
 from flexget import plugin
+from flexget.event import fire_event
 from flexget.utils.lazy_dict import LazyDict, LazyLookup
 from flexget.utils.serialization import Serializer, deserialize, serialize
 from flexget.utils.template import FlexGetTemplate, render_from_entry
@@ -57,6 +60,12 @@ class EntryUnicodeError(Exception):
         return 'Entry strings must be unicode: %s (%r)' % (self.key, self.value)
 
 
+# Fields which identify an entry, see Entry.identity
+IDENTITY_FIELDS = ('original_title', 'original_url')
+
+HOOK_ACTIONS = ('accept', 'reject', 'fail', 'complete')
+
+
 class Entry(LazyDict, Serializer):
     """
     Represents one item in task. Must have `url` and *title* fields.
@@ -71,13 +80,21 @@ class Entry(LazyDict, Serializer):
     and trigger :meth:`~flexget.task.Task.abort`.
     """
 
+    # Inputs can create 100k+ entries, so entries have no instance dict, and the containers most
+    # entries never use (traces, hooks, lazy lookups) are only created when needed
+    __slots__ = (
+        '_traces',
+        '_state',
+        '_hooks',
+        'task',
+        '_lazy_lookups',
+        '_containers',
+        '_identity',
+    )
+
     def __init__(self, *args, **kwargs):
         super().__init__()
-        self.traces = []
-        self._state = EntryState.UNDECIDED
-        self._hooks = {'accept': [], 'reject': [], 'fail': [], 'complete': []}
-        self.task = None
-        self.lazy_lookups = []
+        self._init_attributes()
 
         if len(args) == 2:
             kwargs['title'] = args[0]
@@ -87,6 +104,44 @@ class Entry(LazyDict, Serializer):
         # Make sure constructor does not escape our __setitem__ enforcement
         self.update(*args, **kwargs)
 
+    def _init_attributes(self) -> None:
+        self._traces = None
+        self._state = EntryState.UNDECIDED
+        self._hooks = None
+        self.task = None
+        self._lazy_lookups = None
+        # Weak references to the EntryContainers holding this entry, see _set_state
+        self._containers = ()
+        # Cached identity key, see identity
+        self._identity = None
+
+    def __setstate__(self, state) -> None:
+        # Entries pickled before Entry had __slots__ have their attributes in a dict
+        dict_state, slot_state = state if isinstance(state, tuple) else (state, None)
+        self._init_attributes()
+        for key, value in itertools.chain((dict_state or {}).items(), (slot_state or {}).items()):
+            setattr(self, key, value)
+
+    @property
+    def traces(self) -> list:
+        if self._traces is None:
+            self._traces = []
+        return self._traces
+
+    @traces.setter
+    def traces(self, value: list) -> None:
+        self._traces = value
+
+    @property
+    def lazy_lookups(self) -> list:
+        if self._lazy_lookups is None:
+            self._lazy_lookups = []
+        return self._lazy_lookups
+
+    @lazy_lookups.setter
+    def lazy_lookups(self, value: list) -> None:
+        self._lazy_lookups = value
+
     def trace(
         self,
         message: Optional[str],
@@ -114,7 +169,9 @@ class Entry(LazyDict, Serializer):
         :param action: Name of action to run hooks for
         :param kwargs: Keyword arguments that should be passed to the registered functions
         """
-        for func in self._hooks[action]:
+        if not self._hooks:
+            return
+        for func in self._hooks.get(action, ()):
             func(self, **kwargs)
 
     def add_hook(self, action: str, func: Callable, **kwargs) -> None:
@@ -126,10 +183,11 @@ class Entry(LazyDict, Serializer):
         :param kwargs: Keyword arguments that should be passed to ``func``
         :raises: ValueError when given an invalid ``action``
         """
-        try:
-            self._hooks[action].append(functools.partial(func, **kwargs))
-        except KeyError:
+        if action not in HOOK_ACTIONS:
             raise ValueError('`%s` is not a valid entry action' % action)
+        if self._hooks is None:
+            self._hooks = {}
+        self._hooks.setdefault(action, []).append(functools.partial(func, **kwargs))
 
     def on_accept(self, func: Callable, **kwargs) -> None:
         """
@@ -171,8 +229,9 @@ class Entry(LazyDict, Serializer):
         if self.rejected:
             logger.debug('tried to accept rejected {!r}', self)
         elif not self.accepted:
-            self._state = EntryState.ACCEPTED
+            self._set_state(EntryState.ACCEPTED)
             self.trace(reason, operation='accept')
+            fire_event('entry.state_changed', self, reason=reason)
             # Run entry on_accept hooks
             self.run_hooks('accept', reason=reason, **kwargs)
 
@@ -184,20 +243,30 @@ class Entry(LazyDict, Serializer):
             self.trace(f'Tried to reject immortal {reason_str}')
             return
         if not self.rejected:
-            self._state = EntryState.REJECTED
+            self._set_state(EntryState.REJECTED)
             self.trace(reason, operation='reject')
+            fire_event('entry.state_changed', self, reason=reason)
             # Run entry on_reject hooks
             self.run_hooks('reject', reason=reason, **kwargs)
 
     def fail(self, reason: Optional[str] = None, **kwargs):
         logger.debug("Marking entry '{}' as failed", self['title'])
         if not self.failed:
-            self._state = EntryState.FAILED
+            self._set_state(EntryState.FAILED)
             self.trace(reason, operation='fail')
+            fire_event('entry.state_changed', self, reason=reason)
             logger.error('Failed {} ({})', self['title'], reason)
             # Run entry on_fail hooks
             self.run_hooks('fail', reason=reason, **kwargs)
 
+    def _set_state(self, state: EntryState) -> None:
+        old_state, self._state = self._state, state
+        # Let the task's EntryContainer(s) update their state indexes
+        for ref in self._containers:
+            container = ref()
+            if container is not None:
+                container._state_changed(self, old_state)
+
     def complete(self, **kwargs):
         # Run entry on_complete hooks
         self.run_hooks('complete', **kwargs)
@@ -233,6 +302,10 @@ class Entry(LazyDict, Serializer):
         ):  # pylint: disable=unidiomatic-typecheck
             value = str(value)
 
+        # Field names are shared by all the entries, don't keep a copy of them in each
+        if type(key) is str:  # pylint: disable=unidiomatic-typecheck
+            key = sys.intern(key)
+
         # url and original_url handling
         if key == 'url':
             if not isinstance(value, (str, LazyLookup)):
@@ -245,6 +318,9 @@ class Entry(LazyDict, Serializer):
                 raise plugin.PluginError('Tried to set title to %r' % value)
             self.setdefault('original_title', value)
 
+        if key in IDENTITY_FIELDS:
+            self._identity = None
+
         try:
             logger.trace('ENTRY SET: {} = {!r}', key, value)
         except Exception as e:
@@ -386,13 +462,31 @@ class Entry(LazyDict, Serializer):
         )
         super().register_lazy_func(func, keys, [], {})
 
+    def __delitem__(self, key):
+        if key in IDENTITY_FIELDS:
+            self._identity = None
+        super().__delitem__(key)
+
+    @property
+    def identity(self) -> tuple:
+        """The original title and url, which entries are compared and hashed by."""
+        identity = self._identity
+        if identity is None:
+            identity = (self.get('original_title'), self.get('original_url'))
+            # Only cache the key once it no longer depends on lazy fields
+            if not (self.is_lazy('original_title') or self.is_lazy('original_url')):
+                self._identity = identity
+        return identity
+
     def __eq__(self, other):
+        if isinstance(other, Entry):
+            return self.identity == other.identity
         return self.get('original_title') == other.get('original_title') and self.get(
             'original_url'
         ) == other.get('original_url')
 
     def __hash__(self):
-        return hash(self.get('original_title', '') + self.get('original_url', ''))
+        return hash(self.identity)
 
     def __repr__(self):
         return '<Entry(title=%s,state=%s)>' % (self['title'], self._state)
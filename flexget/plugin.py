@@ -5,7 +5,7 @@ from functools import total_ordering
 from http.client import BadStatusLine
 from importlib import import_module
 from pathlib import Path
-from typing import Callable, Dict, Iterable, List, Optional, Union
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
 from urllib.error import HTTPError, URLError
 
 import loguru
@@ -166,6 +166,15 @@ def priority(value: int) -> Callable[[Callable], Callable]:
     return decorator
 
 
+def no_session(target: Callable) -> Callable:
+    """
+    Decorator for phase methods which do not use `task.session`, the task does not open a database
+    session for them.
+    """
+    target.no_session = True
+    return target
+
+
 # task phases, in order of their execution; note that this can be extended by
 # registering new phases at runtime
 task_phases = [
@@ -197,6 +206,8 @@ plugins_loaded = False
 _loaded_plugins = {}
 _plugin_options = []
 _new_phase_queue: Dict[str, List[Optional[str]]] = {}
+# Plugins of each phase in the order they run, by phase and names of the configured plugins
+_phase_plans: Dict[Tuple[str, FrozenSet[str]], List['PluginInfo']] = {}
 
 
 def register_task_phase(name: str, before: str = None, after: str = None):
@@ -229,6 +240,7 @@ def register_task_phase(name: str, before: str = None, after: str = None):
     for phase_name, args in list(_new_phase_queue.items()):
         if add_phase(phase_name, *args):
             del _new_phase_queue[phase_name]
+    invalidate_phase_plans()
 
 
 @total_ordering
@@ -303,6 +315,7 @@ class PluginInfo(dict):
             )
         else:
             plugins[self.name] = self
+            invalidate_phase_plans()
 
     def initialize(self) -> None:
         if self.instance is not None:
@@ -346,6 +359,7 @@ class PluginInfo(dict):
                 # provides backwards compatibility
                 event.plugin = self
                 self.phase_handlers[phase] = event
+                invalidate_phase_plans()
 
     def __getattr__(self, attr: str):
         if attr in self:
@@ -601,6 +615,31 @@ def get_plugins(
     return filter(matches, iter(plugins.values()))
 
 
+def get_phase_plugins(phase: str, configured: Iterable[str]) -> List[PluginInfo]:
+    """
+    Returns the plugins which run on `phase` of a task configuring the `configured` plugins, which
+    are these plugins and the builtins, in the order they run.
+
+    The lists are cached until :func:`invalidate_phase_plans` is called, they must not be modified.
+    """
+    configured = frozenset(configured)
+    key = (phase, configured)
+    plan = _phase_plans.get(key)
+    if plan is None:
+        plan = sorted(
+            (p for p in get_plugins(phase=phase) if p.name in configured or p.builtin),
+            key=lambda p: p.phase_handlers[phase],
+            reverse=True,
+        )
+        _phase_plans[key] = plan
+    return plan
+
+
+def invalidate_phase_plans() -> None:
+    """Must be called after changing plugins, their phase handlers or the priorities of these."""
+    _phase_plans.clear()
+
+
 def plugin_schemas(**kwargs) -> 'config_schema.JsonSchema':
     """Create a dict schema that matches plugins specified by `kwargs`"""
     return {
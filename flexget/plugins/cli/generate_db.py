@@ -0,0 +1,445 @@
+"""
+Fills the database with a synthetic history (series, seen entries, archive, task history and
+status) of a configurable size, to reproduce and benchmark the scaling issues of databases which
+have been in use for years.
+
+The rows are inserted in bulk into the tables of the real models, after the existing ones.
+"""
+import itertools
+import random
+import time
+from datetime import datetime, timedelta
+
+from loguru import logger
+from sqlalchemy import func
+
+from flexget import options
+from flexget.components.archive import db as archive_db
+from flexget.components.history import db as history_db
+from flexget.components.seen import db as seen_db
+from flexget.components.series import db as series_db
+from flexget.components.status import db as status_db
+from flexget.event import event
+from flexget.manager import Session
+from flexget.terminal import console
+from flexget.utils import change_tracking
+
+logger = logger.bind(name='generate_db')
+
+# Rows inserted by each statement, keeps the memory use flat for millions of rows
+CHUNK_SIZE = 10000
+
+QUALITIES = [
+    'HDTV.XviD',
+    '720p.HDTV.x264',
+    '1080p.WEB-DL.DD5.1.H.264',
+    '2160p.WEB.h265',
+    'DVDRip.XviD',
+    '720p.BluRay.x264',
+]
+
+ARCHIVE_TAGS = ['tv', 'movies', 'music']
+
+
+def show_names(count, start=1):
+    return ['Show Number %s' % index for index in range(start, start + count)]
+
+
+def task_names(count):
+    return ['task %s' % index for index in range(count)]
+
+
+def release_titles(count, shows=200, seed=0):
+    """Returns release titles of episodes of `shows` shows, like a busy feed."""
+    rng = random.Random(seed)
+    names = [name.replace(' ', '.') for name in show_names(shows)]
+    return (
+        '%s.S%02dE%02d.%s-GROUP%s'
+        % (
+            rng.choice(names),
+            rng.randint(1, 10),
+            rng.randint(1, 24),
+            rng.choice(QUALITIES),
+            rng.randint(1, 20),
+        )
+        for _ in range(count)
+    )
+
+
+def insert(session, table, rows):
+    """Inserts `rows` in chunks of :data:`CHUNK_SIZE`, and returns their number."""
+    rows = iter(rows)
+    count = 0
+    while True:
+        chunk = list(itertools.islice(rows, CHUNK_SIZE))
+        if not chunk:
+            return count
+        session.execute(table.insert(), chunk)
+        count += len(chunk)
+
+
+def next_id(session, model):
+    return (session.query(func.max(model.id)).scalar() or 0) + 1
+
+
+def named_ids(session, model, names):
+    """
+    Returns the ids of the rows of `model` with `names`, inserting those which do not exist yet.
+    Names are unique in these tables, and looked up with `.one()`.
+    """
+    ids = {}
+    # Chunked below the limit of sqlite on the number of query parameters
+    for start in range(0, len(names), 500):
+        chunk = names[start : start + 500]
+        ids.update(session.query(model.name, model.id).filter(model.name.in_(chunk)))
+    missing = [name for name in names if name not in ids]
+    first = next_id(session, model)
+    column = model.name.property.columns[0].name
+    insert(
+        session,
+        model.__table__,
+        ({'id': first + index, column: name} for index, name in enumerate(missing)),
+    )
+    ids.update((name, first + index) for index, name in enumerate(missing))
+    return [ids[name] for name in names]
+
+
+def populate_series(session, count, episodes=20, releases=2, tasks=10):
+    """
+    Inserts `count` series, each with `episodes` episodes with `releases` releases of which the
+    first one is downloaded. The series are spread over `tasks` tasks.
+
+    :return: Number of inserted releases
+    """
+    now = datetime.now()
+    first_series = next_id(session, series_db.Series)
+    first_episode = next_id(session, series_db.Episode)
+    names = show_names(count, start=first_series)
+    tasks = task_names(tasks)
+    insert(
+        session,
+        series_db.Series.__table__,
+        (
+            {
+                'id': first_series + index,
+                'name': name,
+                'name_lower': name.lower(),
+                'identified_by': 'ep',
+            }
+            for index, name in enumerate(names)
+        ),
+    )
+    insert(
+        session,
+        series_db.SeriesTask.__table__,
+        (
+            {'series_id': first_series + index, 'name': tasks[index % len(tasks)]}
+            for index in range(count)
+        ),
+    )
+    insert(
+        session,
+        series_db.Episode.__table__,
+        (
+            {
+                'id': first_episode + index * episodes + number - 1,
+                'identifier': 'S01E%02d' % number,
+                'season': 1,
+                'number': number,
+                'identified_by': 'ep',
+                'series_id': first_series + index,
+            }
+            for index in range(count)
+            for number in range(1, episodes + 1)
+        ),
+    )
+    inserted = insert(
+        session,
+        series_db.EpisodeRelease.__table__,
+        (
+            {
+                'episode_id': first_episode + index * episodes + number - 1,
+                'quality': QUALITIES[release % len(QUALITIES)],
+                'downloaded': release == 0,
+                'proper_count': 0,
+                'title': '%s.S01E%02d.%s-GROUP'
+                % (name.replace(' ', '.'), number, QUALITIES[release % len(QUALITIES)]),
+                'first_seen': now
+                - timedelta(hours=(index * episodes + number) * releases + release),
+            }
+            for index, name in enumerate(names)
+            for number in range(1, episodes + 1)
+            for release in range(releases)
+        ),
+    )
+    # Summaries are updated by session events, which bulk inserts bypass
+    series_db.update_summaries(session, range(first_series, first_series + count))
+    return inserted
+
+
+def populate_seen(session, count, tasks=10, seed=1):
+    """Inserts `count` seen entries, each with a title and url field."""
+    now = datetime.now()
+    first = next_id(session, seen_db.SeenEntry)
+    tasks = task_names(tasks)
+    insert(
+        session,
+        seen_db.SeenEntry.__table__,
+        (
+            {
+                'id': first + index,
+                'title': title,
+                'feed': tasks[index % len(tasks)],
+                'reason': 'synthetic',
+                'added': now - timedelta(minutes=index),
+                'local': False,
+            }
+            for index, title in enumerate(release_titles(count, seed=seed))
+        ),
+    )
+    insert(
+        session,
+        seen_db.SeenField.__table__,
+        (
+            {
+                'seen_entry_id': first + index,
+                'field': field,
+                'value': value,
+                'added': now - timedelta(minutes=index),
+            }
+            for index, title in enumerate(release_titles(count, seed=seed))
+            for field, value in (
+                ('title', title),
+                ('url', 'http://example.com/%s' % (first + index)),
+            )
+        ),
+    )
+    return count
+
+
+def populate_archive(session, count, tasks=10, seed=2):
+    """Inserts `count` archived entries, each with one of :data:`ARCHIVE_TAGS` and a task source."""
+    now = datetime.now()
+    first = next_id(session, archive_db.ArchiveEntry)
+    tasks = task_names(tasks)
+    tag_ids = named_ids(session, archive_db.ArchiveTag, ARCHIVE_TAGS)
+    source_ids = named_ids(session, archive_db.ArchiveSource, tasks)
+    insert(
+        session,
+        archive_db.ArchiveEntry.__table__,
+        (
+            {
+                'id': first + index,
+                'title': title,
+                'url': 'http://example.com/archive/%s' % (first + index),
+                'description': 'Synthetic archived entry %s' % (first + index),
+                'feed': tasks[index % len(tasks)],
+                'added': now - timedelta(minutes=index),
+            }
+            for index, title in enumerate(release_titles(count, seed=seed))
+        ),
+    )
+    insert(
+        session,
+        archive_db.archive_tags_table,
+        (
+            {'entry_id': first + index, 'tag_id': tag_ids[index % len(tag_ids)]}
+            for index in range(count)
+        ),
+    )
+    insert(
+        session,
+        archive_db.archive_sources_table,
+        (
+            {'entry_id': first + index, 'source_id': source_ids[index % len(source_ids)]}
+            for index in range(count)
+        ),
+    )
+    return count
+
+
+def populate_history(session, count, tasks=10, seed=3):
+    """Inserts `count` download history items."""
+    now = datetime.now()
+    tasks = task_names(tasks)
+    return insert(
+        session,
+        history_db.History.__table__,
+        (
+            {
+                'feed': tasks[index % len(tasks)],
+                'filename': '/downloads/%s.torrent' % title,
+                'url': 'http://example.com/history/%s' % index,
+                'title': title,
+                'time': now - timedelta(minutes=index),
+                'details': 'Accepted by synthetic',
+            }
+            for index, title in enumerate(release_titles(count, seed=seed))
+        ),
+    )
+
+
+def populate_status(session, tasks, executions, seed=4):
+    """Inserts `executions` executions an hour apart for each of `tasks` status tasks."""
+    rng = random.Random(seed)
+    now = datetime.now()
+    task_ids = named_ids(session, status_db.StatusTask, task_names(tasks))
+
+    def execution(task_id, index):
+        start = now - timedelta(hours=index)
+        produced = rng.randint(0, 100)
+        accepted = rng.randint(0, produced)
+        succeeded = rng.random() > 0.02
+        return {
+            'task_id': task_id,
+            'start': start,
+            'end': start + timedelta(seconds=rng.randint(1, 120)),
+            'succeeded': succeeded,
+            'produced': produced,
+            'accepted': accepted,
+            'rejected': produced - accepted,
+            'failed': 0,
+            'abort_reason': None if succeeded else 'synthetic failure',
+        }
+
+    return insert(
+        session,
+        status_db.TaskExecution.__table__,
+        (execution(task_id, index) for task_id in task_ids for index in range(executions)),
+    )
+
+
+def generated_tables():
+    return [
+        series_db.Series.__table__,
+        series_db.SeriesTask.__table__,
+        series_db.Episode.__table__,
+        series_db.EpisodeRelease.__table__,
+        series_db.SeriesSummary.__table__,
+        seen_db.SeenEntry.__table__,
+        seen_db.SeenField.__table__,
+        archive_db.ArchiveEntry.__table__,
+        archive_db.ArchiveTag.__table__,
+        archive_db.ArchiveSource.__table__,
+        archive_db.archive_tags_table,
+        archive_db.archive_sources_table,
+        history_db.History.__table__,
+        status_db.StatusTask.__table__,
+        status_db.TaskExecution.__table__,
+    ]
+
+
+def generate(
+    session,
+    series=0,
+    episodes=20,
+    releases=2,
+    seen=0,
+    archive=0,
+    history=0,
+    status_tasks=0,
+    executions=0,
+    tasks=10,
+):
+    """Inserts the synthetic rows, and returns the number of rows made of each kind."""
+    steps = [
+        (
+            'series releases',
+            series,
+            lambda: populate_series(session, series, episodes, releases, tasks),
+        ),
+        ('seen entries', seen, lambda: populate_seen(session, seen, tasks)),
+        ('archive entries', archive, lambda: populate_archive(session, archive, tasks)),
+        ('history items', history, lambda: populate_history(session, history, tasks)),
+        (
+            'task executions',
+            status_tasks and executions,
+            lambda: populate_status(session, status_tasks, executions),
+        ),
+    ]
+    counts = {}
+    for name, wanted, populate in steps:
+        if not wanted:
+            continue
+        start = time.perf_counter()
+        counts[name] = populate()
+        logger.verbose(
+            'Inserted {} {} in {:.1f} s', counts[name], name, time.perf_counter() - start
+        )
+    return counts
+
+
+def do_cli(manager, options):
+    with manager.acquire_lock():
+        with Session() as session:
+            counts = generate(
+                session,
+                series=options.series,
+                episodes=options.episodes,
+                releases=options.releases,
+                seen=options.seen,
+                archive=options.archive,
+                history=options.history,
+                status_tasks=options.status_tasks,
+                executions=options.executions,
+                tasks=options.tasks,
+            )
+        # Caches of the API are invalidated by flushes, which bulk inserts do not make
+        change_tracking.bump(table.name for table in generated_tables())
+    for name, count in counts.items():
+        console('Generated %s %s' % (count, name))
+    if not counts:
+        console('Nothing to generate, see `flexget generate-db --help`')
+
+
+@event('options.register')
+def register_parser_arguments():
+    parser = options.register_command(
+        'generate-db',
+        do_cli,
+        help='Fill the database with a synthetic history, to reproduce scaling issues',
+        epilog='Rows are added to the database of the config, use a copy of it or a new config.',
+    )
+    parser.add_argument('--series', type=int, default=0, metavar='COUNT', help='Series to add')
+    parser.add_argument(
+        '--episodes',
+        type=int,
+        default=20,
+        metavar='COUNT',
+        help='Episodes of each series (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--releases',
+        type=int,
+        default=2,
+        metavar='COUNT',
+        help='Releases of each episode (default: %(default)s)',
+    )
+    parser.add_argument('--seen', type=int, default=0, metavar='COUNT', help='Seen entries to add')
+    parser.add_argument(
+        '--archive', type=int, default=0, metavar='COUNT', help='Archived entries to add'
+    )
+    parser.add_argument(
+        '--history', type=int, default=0, metavar='COUNT', help='Download history items to add'
+    )
+    parser.add_argument(
+        '--status-tasks',
+        type=int,
+        default=0,
+        metavar='COUNT',
+        help='Tasks to add execution statuses for',
+    )
+    parser.add_argument(
+        '--executions',
+        type=int,
+        default=1000,
+        metavar='COUNT',
+        help='Executions of each status task (default: %(default)s)',
+    )
+    parser.add_argument(
+        '--tasks',
+        type=int,
+        default=10,
+        metavar='COUNT',
+        help='Task names the rows are spread over (default: %(default)s)',
+    )
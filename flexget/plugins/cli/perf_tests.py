@@ -7,7 +7,10 @@ from flexget.terminal import console
 
 logger = logger.bind(name='perftests')
 
-TESTS = ['imdb_query']
+TESTS = ['imdb_query', 'entries']
+
+# Number of entries created by the `entries` test, like a big list input
+ENTRY_COUNT = 100000
 
 
 def cli_perf_test(manager, options):
@@ -18,6 +21,8 @@ def cli_perf_test(manager, options):
     try:
         if options.test_name == 'imdb_query':
             imdb_query(session)
+        elif options.test_name == 'entries':
+            entries()
     finally:
         session.close()
 
@@ -75,6 +80,42 @@ def imdb_query(session):
     logger.debug('Took %.2f seconds to query %i movies' % (took, len(imdb_urls)))
 
 
+def entries(count=ENTRY_COUNT):
+    """Measures the creation throughput of, and the memory used by entries like an input makes."""
+    import time
+    import tracemalloc
+
+    from flexget.entry import Entry
+
+    def create():
+        return [
+            Entry(
+                title='Some.Show.S01E%02d.720p.HDTV.x264-GROUP' % (index % 100),
+                url='http://example.com/download/%s.torrent' % index,
+                description='Item number %s' % index,
+                content_size=index,
+            )
+            for index in range(count)
+        ]
+
+    logger.info('Creating {} entries ...', count)
+    start_time = time.perf_counter()
+    create()
+    took = time.perf_counter() - start_time
+
+    # Tracing allocations slows down the creation a lot, so memory is measured separately
+    tracemalloc.start()
+    start_memory = tracemalloc.get_traced_memory()[0]
+    created = create()
+    used = (tracemalloc.get_traced_memory()[0] - start_memory) / len(created)
+    tracemalloc.stop()
+    console(
+        'Created %i entries in %.2f seconds (%i entries/s), using %i bytes per entry'
+        % (count, took, count / took, used)
+    )
+    return took, used
+
+
 @event('options.register')
 def register_parser_arguments():
     perf_parser = options.register_command('perf-test', cli_perf_test)
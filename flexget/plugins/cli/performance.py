@@ -1,14 +1,33 @@
+import cProfile
+import json
+import os
+import re
+import sys
+import threading
 import time
+import tracemalloc
 from argparse import SUPPRESS
+from datetime import datetime
 
+import requests
 from loguru import logger
-from sqlalchemy.engine import Connection
+from sqlalchemy import event as sqlalchemy_event
+from sqlalchemy.engine import Connection, Engine
 
 from flexget import options
 from flexget.event import add_event_handler, event, remove_event_handler
 
 logger = logger.bind(name='performance')
 
+# Profiles and reports of --profile-plugins are written into this directory of the config dir
+PROFILE_DIR = 'profiles'
+
+# Seconds between the stack samples of the sample profiling mode
+SAMPLE_INTERVAL = 0.005
+
+# CPU time of the thread running the task, not available before python 3.7
+thread_time = getattr(time, 'thread_time', time.process_time)
+
 performance = {}
 
 _start = {}
@@ -85,8 +104,338 @@ def cleanup(manager, options):
     remove_event_handler('task.execute.after_plugin', after_plugin)
 
 
+class StackSampler(threading.Thread):
+    """
+    Sampling profiler, records the stack of one thread at regular intervals while enabled.
+
+    The samples of each plugin get a root frame named after it, and are written in the speedscope
+    format (https://www.speedscope.app/).
+    """
+
+    def __init__(self, thread_id: int, interval: float = SAMPLE_INTERVAL) -> None:
+        super().__init__(name='profile_sampler', daemon=True)
+        self.thread_id = thread_id
+        self.interval = interval
+        self.frames: dict = {}
+        self.samples: list = []
+        self.weights: list = []
+        self.label = None
+        self.finished = threading.Event()
+
+    def enable(self, label: str) -> None:
+        self.label = label
+
+    def disable(self) -> None:
+        self.label = None
+
+    def _frame_index(self, key: tuple) -> int:
+        index = self.frames.get(key)
+        if index is None:
+            index = self.frames[key] = len(self.frames)
+        return index
+
+    def run(self) -> None:
+        last = time.perf_counter()
+        while not self.finished.wait(self.interval):
+            now = time.perf_counter()
+            label = self.label
+            frame = sys._current_frames().get(self.thread_id)
+            if label is not None and frame is not None:
+                stack = []
+                while frame is not None:
+                    code = frame.f_code
+                    stack.append(
+                        self._frame_index((code.co_name, code.co_filename, code.co_firstlineno))
+                    )
+                    frame = frame.f_back
+                stack.append(self._frame_index((label, None, None)))
+                self.samples.append(stack[::-1])
+                self.weights.append(now - last)
+            last = now
+
+    def stop(self) -> None:
+        self.finished.set()
+        self.join()
+
+    def dump_stats(self, path: str, name: str) -> None:
+        frames = [
+            {'name': frame_name, 'file': file, 'line': line} if file else {'name': frame_name}
+            for frame_name, file, line in self.frames
+        ]
+        profile = {
+            'type': 'sampled',
+            'name': name,
+            'unit': 'seconds',
+            'startValue': 0,
+            'endValue': sum(self.weights),
+            'samples': self.samples,
+            'weights': self.weights,
+        }
+        with open(path, 'w') as f:
+            json.dump(
+                {
+                    '$schema': 'https://www.speedscope.app/file-format-schema.json',
+                    'shared': {'frames': frames},
+                    'profiles': [profile],
+                    'name': name,
+                    'exporter': 'flexget',
+                },
+                f,
+            )
+
+
+class Counters:
+    """Number and duration of the SQL queries and HTTP requests, while instrumented."""
+
+    def __init__(self) -> None:
+        self.queries = 0
+        self.sql_time = 0.0
+        self.requests = 0
+        self.http_time = 0.0
+        self._users = 0
+        self._lock = threading.Lock()
+        self._orig_request = None
+
+    def snapshot(self) -> dict:
+        return {
+            'wall': time.perf_counter(),
+            'cpu': thread_time(),
+            'queries': self.queries,
+            'sql_time': self.sql_time,
+            'requests': self.requests,
+            'http_time': self.http_time,
+        }
+
+    def before_query(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault('query_start', []).append(time.perf_counter())
+
+    def after_query(self, conn, cursor, statement, parameters, context, executemany):
+        starts = conn.info.get('query_start')
+        # Queries started before the instrumentation was installed are not counted
+        if starts:
+            self.sql_time += time.perf_counter() - starts.pop()
+            self.queries += 1
+
+    @property
+    def installed(self) -> bool:
+        return self._users > 0
+
+    def install(self) -> None:
+        with self._lock:
+            self._users += 1
+            if self._users > 1:
+                return
+            sqlalchemy_event.listen(Engine, 'before_cursor_execute', self.before_query)
+            sqlalchemy_event.listen(Engine, 'after_cursor_execute', self.after_query)
+            self._orig_request = orig_request = requests.Session.request
+            counters = self
+
+            def timed_request(session, *args, **kwargs):
+                start = time.perf_counter()
+                try:
+                    return orig_request(session, *args, **kwargs)
+                finally:
+                    counters.http_time += time.perf_counter() - start
+                    counters.requests += 1
+
+            requests.Session.request = timed_request
+
+    def uninstall(self) -> None:
+        with self._lock:
+            self._users -= 1
+            if self._users:
+                return
+            sqlalchemy_event.remove(Engine, 'before_cursor_execute', self.before_query)
+            sqlalchemy_event.remove(Engine, 'after_cursor_execute', self.after_query)
+            requests.Session.request = self._orig_request
+
+
+counters = Counters()
+
+
+class TaskProfile:
+    """
+    Profile and resource usage of the plugins of one task run, see --profile-plugins.
+
+    :param task: Task being run
+    :param only: Names of the plugins and phases to profile, all when empty
+    :param mode: `cprofile` or `sample`
+    """
+
+    def __init__(self, task, only, mode: str) -> None:
+        self.task_name = task.name
+        self.only = set(only)
+        self.mode = mode
+        self.started = datetime.now()
+        self.plugins: dict = {}
+        self._current = None
+        if mode == 'sample':
+            self.profiler = StackSampler(threading.get_ident())
+            self.profiler.start()
+        else:
+            self.profiler = cProfile.Profile()
+
+    def wants(self, phase: str, plugin: str) -> bool:
+        return not self.only or phase in self.only or plugin in self.only
+
+    def before_plugin(self, phase: str, plugin: str) -> None:
+        if not self.wants(phase, plugin):
+            return
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        elif tracemalloc.is_tracing():
+            # Restarting is the only way to reset the peak before python 3.9
+            tracemalloc.stop()
+            tracemalloc.start()
+        self._current = (phase, plugin, counters.snapshot(), tracemalloc.get_traced_memory()[0])
+        if self.mode == 'sample':
+            self.profiler.enable('%s.%s' % (phase, plugin))
+        else:
+            self.profiler.enable()
+
+    def after_plugin(self) -> None:
+        if self._current is None:
+            return
+        self.profiler.disable()
+        phase, plugin, start, memory = self._current
+        self._current = None
+        end = counters.snapshot()
+        data = self.plugins.setdefault(
+            (phase, plugin),
+            {'phase': phase, 'plugin': plugin, 'runs': 0, 'peak_memory': 0},
+        )
+        data['runs'] += 1
+        for key, value in end.items():
+            data[key] = data.get(key, 0) + value - start[key]
+        data['peak_memory'] = max(data['peak_memory'], tracemalloc.get_traced_memory()[1] - memory)
+
+    def finish(self, config_base: str) -> None:
+        if self.mode == 'sample':
+            self.profiler.stop()
+        self.after_plugin()
+        directory = os.path.join(config_base, PROFILE_DIR)
+        os.makedirs(directory, exist_ok=True)
+        base_name = '%s-%s' % (
+            re.sub(r'[^\w.-]+', '_', self.task_name),
+            self.started.strftime('%Y%m%d-%H%M%S'),
+        )
+        base_path = os.path.join(directory, base_name)
+        if self.mode == 'sample':
+            profile_path = base_path + '.speedscope.json'
+            self.profiler.dump_stats(profile_path, self.task_name)
+        else:
+            profile_path = base_path + '.pstats'
+            self.profiler.dump_stats(profile_path)
+        results = sorted(self.plugins.values(), key=lambda data: data['wall'], reverse=True)
+        with open(base_path + '.json', 'w') as f:
+            json.dump(
+                {
+                    'task': self.task_name,
+                    'started': self.started.isoformat(),
+                    'mode': self.mode,
+                    'profile': os.path.basename(profile_path),
+                    'plugins': results,
+                },
+                f,
+                indent=2,
+            )
+
+        logger.info('Profile of task {} written to {}', self.task_name, profile_path)
+        for data in results:
+            if data['wall'] < 0.1 and data['queries'] <= 10:
+                continue
+            logger.info(
+                '{:<30} took {:0.2f} sec, {:0.2f} sec CPU, {} queries in {:0.2f} sec, '
+                '{} requests in {:0.2f} sec, peak memory {:0.1f} MB',
+                '%s.%s' % (data['phase'], data['plugin']),
+                data['wall'],
+                data['cpu'],
+                data['queries'],
+                data['sql_time'],
+                data['requests'],
+                data['http_time'],
+                data['peak_memory'] / 1024 / 1024,
+            )
+
+
+_profiles: dict = {}
+_stop_tracemalloc = False
+
+
+def profiled(task) -> bool:
+    return getattr(task.options, 'profile_plugins', None) is not None
+
+
+@event('task.execute.before_plugin')
+def profile_before_plugin(task, keyword):
+    if not profiled(task):
+        return
+    profile = _profiles.get(task.id)
+    if profile is None:
+        profile = _profiles[task.id] = TaskProfile(
+            task, task.options.profile_plugins, task.options.profile_mode
+        )
+    profile.before_plugin(task.current_phase, keyword)
+
+
+@event('task.execute.after_plugin')
+def profile_after_plugin(task, keyword):
+    profile = _profiles.get(task.id)
+    if profile is not None:
+        profile.after_plugin()
+
+
+@event('task.execute.completed')
+def write_profile(task):
+    profile = _profiles.pop(task.id, None)
+    if profile is not None:
+        profile.finish(task.manager.config_base)
+
+
+@event('manager.execute.started')
+def start_profiling(manager, options):
+    global _stop_tracemalloc
+    if getattr(options, 'profile_plugins', None) is None:
+        return
+    logger.info('Profiling plugins, results will be written into {}', PROFILE_DIR)
+    counters.install()
+    if not tracemalloc.is_tracing():
+        tracemalloc.start()
+        _stop_tracemalloc = True
+
+
+@event('manager.execute.completed')
+def stop_profiling(manager, options):
+    global _stop_tracemalloc
+    if getattr(options, 'profile_plugins', None) is None:
+        return
+    counters.uninstall()
+    if counters.installed:
+        return
+    # Tasks which did not complete (eg. crashed) still get their report
+    for task_id in list(_profiles):
+        _profiles.pop(task_id).finish(manager.config_base)
+    if _stop_tracemalloc:
+        tracemalloc.stop()
+        _stop_tracemalloc = False
+
+
 @event('options.register')
 def register_parser_arguments():
-    options.get_parser('execute').add_argument(
+    execute_parser = options.get_parser('execute')
+    execute_parser.add_argument(
         '--debug-perf', action='store_true', dest='debug_perf', default=False, help=SUPPRESS
     )
+    execute_parser.add_argument(
+        '--profile-plugins',
+        nargs='*',
+        metavar='PLUGIN/PHASE',
+        help='profile the given plugins and phases (all by default), and write the profiles and a '
+        'report of their CPU, wall, SQL and HTTP time and peak memory into the config dir',
+    )
+    execute_parser.add_argument(
+        '--profile-mode',
+        choices=['cprofile', 'sample'],
+        default='cprofile',
+        help='cprofile writes pstats files, sample writes speedscope files of stack samples',
+    )
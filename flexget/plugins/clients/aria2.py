@@ -6,6 +6,7 @@ from loguru import logger
 
 from flexget import plugin
 from flexget.event import event
+from flexget.plugins.clients.connection_pool import connection_pool
 from flexget.utils.template import RenderError
 
 logger = logger.bind(name='aria2')
@@ -36,42 +37,51 @@ class OutputAria2:
                 'type': 'object',
                 'additionalProperties': {'oneOf': [{'type': 'string'}, {'type': 'integer'}]},
             },
+            'batch': {'type': 'boolean', 'default': False},
         },
         'required': ['path'],
         'additionalProperties': False,
     }
 
     def aria2_connection(self, server, port, username=None, password=None):
+        return self.aria2_server(server, port, username, password).aria2
+
+    def aria2_server(self, server, port, username=None, password=None):
         if username and password:
             userpass = '%s:%s@' % (username, password)
         else:
             userpass = ''
         url = 'http://%s%s:%s/rpc' % (userpass, server, port)
         logger.debug('aria2 url: {}', url)
-        logger.info('Connecting to daemon at {}', url)
-        try:
-            return xmlrpc.client.ServerProxy(url).aria2
-        except xmlrpc.client.ProtocolError as err:
-            raise plugin.PluginError(
-                'Could not connect to aria2 at %s. Protocol error %s: %s'
-                % (url, err.errcode, err.errmsg),
-                logger,
-            )
-        except xmlrpc.client.Fault as err:
-            raise plugin.PluginError(
-                'XML-RPC fault: Unable to connect to aria2 daemon at %s: %s'
-                % (url, err.faultString),
-                logger,
-            )
-        except socket_error as e:
-            raise plugin.PluginError(
-                'Socket connection issue with aria2 daemon at %s: %s' % (url, e), logger
-            )
-        except:
-            logger.opt(exception=True).debug('Unexpected error during aria2 connection')
-            raise plugin.PluginError(
-                'Unidentified error during connection to aria2 daemon', logger
-            )
+
+        def connect():
+            logger.info('Connecting to daemon at {}', url)
+            try:
+                return xmlrpc.client.ServerProxy(url)
+            except xmlrpc.client.ProtocolError as err:
+                raise plugin.PluginError(
+                    'Could not connect to aria2 at %s. Protocol error %s: %s'
+                    % (url, err.errcode, err.errmsg),
+                    logger,
+                )
+            except xmlrpc.client.Fault as err:
+                raise plugin.PluginError(
+                    'XML-RPC fault: Unable to connect to aria2 daemon at %s: %s'
+                    % (url, err.faultString),
+                    logger,
+                )
+            except socket_error as e:
+                raise plugin.PluginError(
+                    'Socket connection issue with aria2 daemon at %s: %s' % (url, e), logger
+                )
+            except:
+                logger.opt(exception=True).debug('Unexpected error during aria2 connection')
+                raise plugin.PluginError(
+                    'Unidentified error during connection to aria2 daemon', logger
+                )
+
+        # The proxy keeps its http connection to the daemon alive between tasks
+        return connection_pool.get(('aria2', url), connect, close=lambda proxy: proxy('close')())
 
     def prepare_config(self, config):
         config.setdefault('server', 'localhost')
@@ -80,6 +90,7 @@ class OutputAria2:
         config.setdefault('password', '')
         config.setdefault('secret', '')
         config.setdefault('options', {})
+        config.setdefault('batch', False)
         return config
 
     def on_task_output(self, task, config):
@@ -87,6 +98,9 @@ class OutputAria2:
         if task.options.learn:
             return
         config = self.prepare_config(config)
+        if config['batch'] and not task.options.test:
+            self.add_entries(task.accepted, config)
+            return
         aria2 = self.aria2_connection(
             config['server'], config['port'], config['username'], config['password']
         )
@@ -105,11 +119,50 @@ class OutputAria2:
                 logger.opt(exception=True).debug('Exception type {}', type(e))
                 raise
 
+    def add_entries(self, entries, config):
+        """
+        Add entries to Aria2 with a single `system.multicall` request
+        """
+        server = self.aria2_server(
+            config['server'], config['port'], config['username'], config['password']
+        )
+        multicall = xmlrpc.client.MultiCall(server)
+        queued = []
+        for entry in entries:
+            call = self.build_call(entry, config)
+            if call:
+                method, params = call
+                getattr(multicall.aria2, method)(*params)
+                queued.append(entry)
+        if not queued:
+            return
+        try:
+            results = multicall()
+        except socket_error as se:
+            for entry in queued:
+                entry.fail('Unable to reach Aria2: %s' % se)
+            return
+        for index, entry in enumerate(queued):
+            try:
+                results[index]
+            except xmlrpc.client.Fault as err:
+                logger.critical('Fault code {} message {}', err.faultCode, err.faultString)
+                entry.fail('Aria2 communication Fault')
+
     def add_entry(self, aria2, entry, config):
         """
         Add entry to Aria2
         """
-        options = config['options']
+        call = self.build_call(entry, config)
+        if call:
+            method, params = call
+            return getattr(aria2, method)(*params)
+
+    def build_call(self, entry, config):
+        """
+        Returns the method name and params to add entry to Aria2 with, or None if it failed
+        """
+        options = dict(config['options'])
         try:
             options['dir'] = os.path.expanduser(entry.render(config['path']).rstrip('/'))
         except RenderError as e:
@@ -134,18 +187,17 @@ class OutputAria2:
             else:
                 entry.fail('Cannot find torrent file')
                 return
-            if secret:
-                return aria2.addTorrent(
-                    secret, xmlrpc.client.Binary(open(torrent_file, mode='rb').read()), [], options
-                )
-            return aria2.addTorrent(
-                xmlrpc.client.Binary(open(torrent_file, mode='rb').read()), [], options
-            )
-        # handle everything else (except metalink -- which is unsupported)
-        # so magnets, https, http, ftp .. etc
+            with open(torrent_file, mode='rb') as f:
+                params = [xmlrpc.client.Binary(f.read()), [], options]
+            method = 'addTorrent'
+        else:
+            # handle everything else (except metalink -- which is unsupported)
+            # so magnets, https, http, ftp .. etc
+            params = [[entry['url']], options]
+            method = 'addUri'
         if secret:
-            return aria2.addUri(secret, [entry['url']], options)
-        return aria2.addUri([entry['url']], options)
+            params.insert(0, secret)
+        return method, params
 
 
 @event('plugin.register')
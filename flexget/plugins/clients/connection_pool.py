@@ -0,0 +1,100 @@
+"""
+Connections to download clients shared between tasks.
+
+Connecting (and logging in) to a client for every task is slow, and for some clients (deluge,
+qBittorrent) requires a full authentication round trip. Connections are kept here for the lifetime
+of the manager, keyed by the client connection config, checked for health before being reused and
+closed when the manager shuts down.
+"""
+import threading
+import time
+
+from loguru import logger
+
+from flexget.event import event
+
+logger = logger.bind(name='connection_pool')
+
+# Connections unused for longer than this (in seconds) are closed and established again
+MAX_IDLE = 15 * 60
+
+
+class ConnectionPool:
+    def __init__(self, max_idle=MAX_IDLE):
+        self.max_idle = max_idle
+        self._connections = {}
+        self._lock = threading.RLock()
+
+    def get(self, key, connect, check=None, close=None):
+        """
+        Returns a pooled connection for `key`, creating a new one with `connect` if there is none
+        or the pooled one is no longer usable.
+
+        :param tuple key: Identifies the client connection, eg. `('deluge', host, port, username)`
+        :param connect: Callable returning a new, connected (and authenticated) client
+        :param check: Callable taking the client and returning False if it is no longer usable,
+          exceptions raised by it are treated the same way
+        :param close: Callable taking the client and closing its connection
+        """
+        with self._lock:
+            pooled = self._connections.get(key)
+            if pooled is not None:
+                client, _, last_used = pooled
+                if time.monotonic() - last_used > self.max_idle:
+                    logger.debug('Connection to {} has been idle too long, reconnecting', key[0])
+                elif self._healthy(key, client, check):
+                    self._connections[key] = (client, close, time.monotonic())
+                    return client
+                self.discard(key)
+            client = connect()
+            self._connections[key] = (client, close, time.monotonic())
+            return client
+
+    @staticmethod
+    def _healthy(key, client, check):
+        if check is None:
+            return True
+        try:
+            if check(client):
+                return True
+        except Exception as e:
+            logger.debug('Health check for connection to {} failed: {}', key[0], e)
+        logger.verbose('Connection to {} is no longer usable, reconnecting', key[0])
+        return False
+
+    def discard(self, key):
+        """Closes and forgets the connection for `key`, eg. after it failed."""
+        with self._lock:
+            pooled = self._connections.pop(key, None)
+        if pooled is not None:
+            self._close(key, pooled)
+
+    def close_all(self):
+        with self._lock:
+            connections, self._connections = self._connections, {}
+        for key, pooled in connections.items():
+            self._close(key, pooled)
+
+    @staticmethod
+    def _close(key, pooled):
+        client, close, _ = pooled
+        if close is None:
+            return
+        try:
+            close(client)
+        except Exception as e:
+            logger.debug('Error closing connection to {}: {}', key[0], e)
+
+    def __contains__(self, key):
+        return key in self._connections
+
+    def __len__(self):
+        return len(self._connections)
+
+
+connection_pool = ConnectionPool()
+
+
+@event('manager.shutdown')
+def close_connections(manager):
+    connection_pool.close_all()
@@ -3,12 +3,15 @@ import os
 import re
 import sys
 import time
+from functools import partial
 
 from loguru import logger
 
 from flexget import plugin
 from flexget.entry import Entry
 from flexget.event import event
+from flexget.plugins.clients.connection_pool import connection_pool
+from flexget.plugins.clients.torrent_snapshot import get_snapshot
 from flexget.utils.pathscrub import pathscrub
 from flexget.utils.template import RenderError
 
@@ -54,11 +57,51 @@ class DelugePlugin:
             decode_utf8=True,
         )
 
+    def connect_client(self, config):
+        """
+        Returns a connected client from the connection pool. The connection (and login) is reused
+        between tasks for as long as the daemon keeps answering on it.
+        """
+        config = self.prepare_config(config)
+        key = (
+            'deluge',
+            config['host'],
+            config['port'],
+            config.get('username'),
+            config.get('password'),
+        )
+
+        def connect():
+            client = self.setup_client(config)
+            try:
+                client.connect()
+            except ConnectionError as exc:
+                raise plugin.PluginError(
+                    f'Error connecting to deluge daemon: {exc}', logger=logger
+                ) from exc
+            return client
+
+        return connection_pool.get(
+            key, connect, check=self.check_connection, close=lambda client: client.disconnect()
+        )
+
+    @staticmethod
+    def check_connection(client):
+        return client.connected and client.call('daemon.info')
+
     def prepare_config(self, config):
         config.setdefault('host', 'localhost')
         config.setdefault('port', 58846)
         return config
 
+    def get_snapshot(self, client, config):
+        """Returns a (possibly shared) snapshot of the torrent ids loaded in the deluge session."""
+        return get_snapshot(
+            ('deluge', config['host'], config['port']),
+            partial(client.call, 'core.get_session_state'),
+            hash_getter=str,
+        )
+
     @staticmethod
     def get_localhost_auth(config_path=None):
         if config_path is None:
@@ -144,19 +187,8 @@ class InputDeluge(DelugePlugin):
     def on_task_input(self, task, config):
         """Generates and returns a list of entries from the deluge daemon."""
         config = self.prepare_config(config)
-        # Reset the entries list
-        client = self.setup_client(config)
-
-        try:
-            client.connect()
-        except ConnectionError as exc:
-            raise plugin.PluginError(
-                f'Error connecting to deluge daemon: {exc}', logger=logger
-            ) from exc
-
-        entries = self.generate_entries(client, config)
-        client.disconnect()
-        return entries
+        client = self.connect_client(config)
+        return self.generate_entries(client, config)
 
     def generate_entries(self, client, config):
         entries = []
@@ -280,36 +312,63 @@ class OutputDeluge(DelugePlugin):
         # If the download plugin is not enabled, we need to call it to get our temp .torrent files
         if 'download' not in task.config:
             download = plugin.get('download', self)
+            snapshot = None
             for entry in task.accepted:
                 if entry.get('deluge_id'):
                     # The torrent is already loaded in deluge, we don't need to get anything
                     continue
-                if config['action'] != 'add' and entry.get('torrent_info_hash'):
-                    # If we aren't adding the torrent new, all we need is info hash
-                    continue
+                if entry.get('torrent_info_hash'):
+                    if config['action'] != 'add':
+                        # If we aren't adding the torrent new, all we need is info hash
+                        continue
+                    if snapshot is None:
+                        snapshot = self._download_snapshot(config)
+                    if entry['torrent_info_hash'] in snapshot:
+                        # Already loaded, output will only apply options to it
+                        continue
                 download.get_temp_file(task, entry, handle_magnets=True)
 
+    def _download_snapshot(self, config):
+        """
+        Snapshot of the loaded torrents for the download phase. Any problem talking to deluge is
+        left for the output phase to report, in which case nothing is considered loaded.
+        """
+        try:
+            return self.get_snapshot(self.connect_client(config), config)
+        except Exception as exc:
+            logger.debug('Unable to check loaded torrents in deluge: {}', exc)
+            return ()
+
+    def _verify_snapshot_hit(self, client, task, entry, torrent_id, snapshot, config):
+        """
+        Checks whether `torrent_id` is loaded in deluge. A hit in the (possibly shared) snapshot is
+        confirmed with the daemon, as the torrent could have been removed since it was taken.
+        """
+        if torrent_id not in snapshot:
+            return False
+        if client.call('core.get_torrent_status', torrent_id, ['hash']):
+            return True
+        logger.debug('{} is no longer loaded in deluge', entry['title'])
+        snapshot.remove(torrent_id)
+        # The download phase skipped the temp file, as the torrent seemed to be loaded
+        if config['action'] == 'add' and 'file' not in entry and 'download' not in task.config:
+            plugin.get('download', self).get_temp_file(task, entry, handle_magnets=True)
+        return False
+
     @plugin.priority(135)
     def on_task_output(self, task, config):
         """Add torrents to deluge at exit."""
         config = self.prepare_config(config)
-        client = self.setup_client(config)
         # don't add when learning
         if task.options.learn:
             return
         if not config['enabled'] or not (task.accepted or task.options.test):
             return
 
-        try:
-            client.connect()
-        except ConnectionError as exc:
-            raise plugin.PluginError(
-                f'Error connecting to deluge daemon: {exc}', logger=logger
-            ) from exc
+        client = self.connect_client(config)
 
         if task.options.test:
             logger.debug('Test connection to deluge daemon successful.')
-            client.disconnect()
             return
 
         # loop through entries to get a list of labels to add
@@ -345,7 +404,7 @@ class OutputDeluge(DelugePlugin):
                         client.call('label.add', label)
 
         # add the torrents
-        torrent_ids = client.call('core.get_session_state')
+        torrent_ids = self.get_snapshot(client, config)
         for entry in task.accepted:
             # Generate deluge options dict for torrent add
             add_opts = {}
@@ -396,7 +455,7 @@ class OutputDeluge(DelugePlugin):
 
             torrent_id = entry.get('deluge_id') or entry.get('torrent_info_hash')
             torrent_id = torrent_id and torrent_id.lower()
-            if torrent_id in torrent_ids:
+            if self._verify_snapshot_hit(client, task, entry, torrent_id, torrent_ids, config):
                 logger.info('{} is already loaded in deluge, setting options', entry['title'])
                 # Entry has a deluge id, verify the torrent is still in the deluge session and apply options
                 # Since this is already loaded in deluge, we may also need to change the path
@@ -467,9 +526,11 @@ class OutputDeluge(DelugePlugin):
                     logger.error('There was an error adding {} to deluge.', entry['title'])
                 else:
                     logger.info('{} successfully added to deluge.', entry['title'])
+                    torrent_ids.add(added_torrent)
                     self._set_torrent_options(client, added_torrent, entry, modify_opts)
             if config['action'] in ('remove', 'purge'):
                 client.call('core.remove_torrent', torrent_id, config['action'] == 'purge')
+                torrent_ids.remove(torrent_id)
                 logger.info('{} removed from deluge.', entry['title'])
             elif config['action'] == 'pause':
                 client.call('core.pause_torrent', [torrent_id])
@@ -478,8 +539,6 @@ class OutputDeluge(DelugePlugin):
                 client.call('core.resume_torrent', [torrent_id])
                 logger.info('{} has been resumed in deluge.', entry['title'])
 
-        client.disconnect()
-
     def on_task_learn(self, task, config):
         """ Make sure all temp files are cleaned up when entries are learned """
         # If download plugin is enabled, it will handle cleanup.
@@ -1,7 +1,10 @@
+from functools import partial
+
 from loguru import logger
 
 from flexget import plugin
 from flexget.event import event
+from flexget.plugins.clients.connection_pool import connection_pool
 
 logger = logger.bind(name='nzbget')
 
@@ -34,7 +37,12 @@ class OutputNzbget:
 
         params = dict(config)
 
-        server = ServerProxy(params["url"])
+        # The proxy keeps its http connection to nzbget alive between tasks
+        server = connection_pool.get(
+            ('nzbget', params['url']),
+            partial(ServerProxy, params['url']),
+            close=lambda proxy: proxy('close')(),
+        )
 
         for entry in task.accepted:
             if task.options.test:
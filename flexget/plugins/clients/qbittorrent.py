@@ -1,4 +1,6 @@
 import os
+from functools import partial
+from operator import itemgetter
 
 from loguru import logger
 from requests import Session
@@ -6,6 +8,8 @@ from requests.exceptions import RequestException
 
 from flexget import plugin
 from flexget.event import event
+from flexget.plugins.clients.connection_pool import connection_pool
+from flexget.plugins.clients.torrent_snapshot import TorrentSnapshot
 from flexget.utils.template import RenderError
 
 logger = logger.bind(name='qbittorrent')
@@ -27,6 +31,7 @@ class OutputQBitTorrent:
         maxupspeed: <torrent upload speed limit> (default: 0)
         maxdownspeed: <torrent download speed limit> (default: 0)
         add_paused: <ADD_PAUSED> (default: False)
+        batch: <add entries with the same options in one request> (default: False)
     """
 
     schema = {
@@ -48,6 +53,7 @@ class OutputQBitTorrent:
                     'fail_html': {'type': 'boolean'},
                     'add_paused': {'type': 'boolean'},
                     'skip_check': {'type': 'boolean'},
+                    'batch': {'type': 'boolean'},
                 },
                 'additionalProperties': False,
             },
@@ -60,6 +66,7 @@ class OutputQBitTorrent:
         self.api_url_login = None
         self.api_url_upload = None
         self.api_url_download = None
+        self.api_url_info = None
         self.url = None
         self.connected = False
 
@@ -81,6 +88,7 @@ class OutputQBitTorrent:
                 self.api_url_login = '/api/v2/auth/login'
                 self.api_url_upload = '/api/v2/torrents/add'
                 self.api_url_download = '/api/v2/torrents/add'
+                self.api_url_info = '/api/v2/torrents/info'
                 return response
 
             url = self.url + "/version/api"
@@ -89,6 +97,7 @@ class OutputQBitTorrent:
                 self.api_url_login = '/login'
                 self.api_url_upload = '/command/upload'
                 self.api_url_download = '/command/download'
+                self.api_url_info = None
                 return response
 
             msg = 'Failure. URL: {}'.format(url) if not msg_on_fail else msg_on_fail
@@ -107,6 +116,24 @@ class OutputQBitTorrent:
         self.url = '{}://{}:{}'.format(
             'https' if config['use_ssl'] else 'http', config['host'], config['port']
         )
+        # The logged in session is reused between tasks until the login expires
+        key = ('qbittorrent', self.url, config.get('username'), config.get('password'))
+        self.session, api_urls = connection_pool.get(
+            key,
+            partial(self._login, config),
+            check=partial(self._check_login, verify=config['verify_cert']),
+            close=lambda connection: connection[0].close(),
+        )
+        (
+            self.api_url_login,
+            self.api_url_upload,
+            self.api_url_download,
+            self.api_url_info,
+        ) = api_urls
+        self.connected = True
+
+    def _login(self, config):
+        self.session = Session()
         self.check_api_version('Check API version failed.', verify=config['verify_cert'])
         if config.get('username') and config.get('password'):
             data = {'username': config['username'], 'password': config['password']}
@@ -118,7 +145,44 @@ class OutputQBitTorrent:
                 verify=config['verify_cert'],
             )
         logger.debug('Successfully connected to qBittorrent')
-        self.connected = True
+        return (
+            self.session,
+            (self.api_url_login, self.api_url_upload, self.api_url_download, self.api_url_info),
+        )
+
+    def _check_login(self, connection, verify=True):
+        """Web API v2 answers 403 once the session cookie of the login has expired."""
+        session, api_urls = connection
+        url = self.url + ('/api/v2/app/version' if api_urls[3] else '/version/qbittorrent')
+        return session.request('get', url, verify=verify).status_code == 200
+
+    def get_snapshot(self, entries, verify_cert):
+        """
+        Returns a snapshot of those `entries` which are already loaded in qBittorrent.
+
+        Only the hashes of `entries` are requested, so the cost does not grow with the number of
+        torrents in the client. The legacy web API has no such lookup, the snapshot is empty then.
+        """
+        hashes = {
+            entry['torrent_info_hash'].lower()
+            for entry in entries
+            if entry.get('torrent_info_hash')
+        }
+        if not self.api_url_info or not hashes:
+            return TorrentSnapshot([], hash_getter=itemgetter('hash'))
+        try:
+            response = self.session.request(
+                'get',
+                self.url + self.api_url_info,
+                params={'hashes': '|'.join(sorted(hashes))},
+                verify=verify_cert,
+            )
+            response.raise_for_status()
+            torrents = response.json()
+        except (RequestException, ValueError) as e:
+            logger.debug('Unable to check loaded torrents in qBittorrent: {}', e)
+            torrents = []
+        return TorrentSnapshot(torrents, hash_getter=itemgetter('hash'))
 
     def add_torrent_file(self, file_path, data, verify_cert):
         if not self.connected:
@@ -149,6 +213,52 @@ class OutputQBitTorrent:
         )
         logger.debug('Added url {} to qBittorrent', url)
 
+    def add_torrents(self, entries, data, verify_cert):
+        """
+        Add several entries sharing the same options with a single request. qBittorrent only tells
+        whether the whole request failed, in which case the entries are added one by one to find
+        out which of them failed.
+        """
+        if not self.connected:
+            raise plugin.PluginError('Not connected.')
+        multipart_data = [(k, (None, v)) for k, v in data.items()]
+        urls = [entry['url'] for entry in entries if entry['url'].startswith('magnet:')]
+        if urls:
+            multipart_data.append(('urls', (None, '\n'.join(urls))))
+        files = []
+        try:
+            for entry in entries:
+                if not entry['url'].startswith('magnet:'):
+                    files.append(open(entry['file'], 'rb'))
+                    multipart_data.append(('torrents', files[-1]))
+            self._request(
+                'post',
+                self.url + self.api_url_upload,
+                msg_on_fail='Failed to add files to qBittorrent',
+                files=multipart_data,
+                verify=verify_cert,
+            )
+        except (OSError, plugin.PluginError) as e:
+            logger.warning(
+                'Failed to add {} torrents at once ({}), adding one by one', len(entries), e
+            )
+            for entry in entries:
+                try:
+                    self.add_entry(entry, dict(data), verify_cert)
+                except (OSError, plugin.PluginError) as e:
+                    entry.fail(str(e))
+            return
+        finally:
+            for f in files:
+                f.close()
+        logger.debug('Added {} torrents to qBittorrent', len(entries))
+
+    def add_entry(self, entry, data, verify_cert):
+        if not entry['url'].startswith('magnet:'):
+            self.add_torrent_file(entry['file'], data, verify_cert)
+        else:
+            self.add_torrent_url(entry['url'], data, verify_cert)
+
     @staticmethod
     def prepare_config(config):
         if isinstance(config, bool):
@@ -162,10 +272,17 @@ class OutputQBitTorrent:
         config.setdefault('maxupspeed', 0)
         config.setdefault('maxdownspeed', 0)
         config.setdefault('fail_html', True)
+        config.setdefault('batch', False)
         return config
 
     def add_entries(self, task, config):
+        snapshot = self.get_snapshot(task.accepted, config['verify_cert'])
+        # Batching needs the web API v2, which takes urls and files in the same request
+        batches = {} if config['batch'] and self.api_url_info else None
         for entry in task.accepted:
+            if entry.get('torrent_info_hash') in snapshot:
+                logger.info('{} is already loaded in qBittorrent, not adding it', entry['title'])
+                continue
             form_data = {}
             try:
                 save_path = entry.render(entry.get('path', config.get('path', '')))
@@ -224,9 +341,13 @@ class OutputQBitTorrent:
                     logger.debug('temp: {}', ', '.join(os.listdir(tmp_path)))
                     entry.fail("Downloaded temp file '%s' doesn't exist!?" % entry['file'])
                     continue
-                self.add_torrent_file(entry['file'], form_data, config['verify_cert'])
+            if batches is not None:
+                batches.setdefault(tuple(sorted(form_data.items())), []).append(entry)
             else:
-                self.add_torrent_url(entry['url'], form_data, config['verify_cert'])
+                self.add_entry(entry, form_data, config['verify_cert'])
+
+        for form_data, entries in (batches or {}).items():
+            self.add_torrents(entries, dict(form_data), config['verify_cert'])
 
     @plugin.priority(120)
     def on_task_download(self, task, config):
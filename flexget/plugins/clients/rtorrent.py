@@ -1,7 +1,9 @@
 import os
 import re
 import socket
+from functools import partial
 from io import BytesIO
+from operator import itemgetter
 from time import sleep
 from urllib.parse import urljoin, urlparse, urlsplit
 from xmlrpc import client as xmlrpc_client
@@ -13,8 +15,11 @@ from flexget import plugin
 from flexget.config_schema import one_or_more
 from flexget.entry import Entry
 from flexget.event import event
+from flexget.plugins.clients.connection_pool import connection_pool
+from flexget.plugins.clients.torrent_snapshot import get_snapshot, invalidate_snapshots
 from flexget.utils.bittorrent import Torrent, is_torrent_file
 from flexget.utils.pathscrub import pathscrub
+from flexget.utils.requests import Session
 from flexget.utils.template import RenderError
 
 logger = logger.bind(name='rtorrent')
@@ -200,6 +205,7 @@ class RTorrent:
         self.username = username
         self.password = password
         self.digest_auth = digest_auth
+        self.session = session
         self._version = None
 
         parsed_uri = urlparse(uri)
@@ -249,10 +255,8 @@ class RTorrent:
 
         return fields
 
-    def load(self, raw_torrent, fields=None, start=False, mkdir=True):
-
-        if fields is None:
-            fields = {}
+    @staticmethod
+    def _load_params(raw_torrent, fields):
         # First param is empty 'target'
         params = ['', xmlrpc_client.Binary(raw_torrent)]
 
@@ -261,6 +265,13 @@ class RTorrent:
             # Values must be escaped if within params
             # TODO: What are the escaping requirements? re.escape works differently on python 3.7+
             params.append('d.%s.set=%s' % (key, re.escape(str(val))))
+        return params
+
+    def load(self, raw_torrent, fields=None, start=False, mkdir=True):
+
+        if fields is None:
+            fields = {}
+        params = self._load_params(raw_torrent, fields)
 
         if mkdir and 'directory' in fields:
             result = self._server.execute.throw('', 'mkdir', '-p', fields['directory'])
@@ -286,6 +297,79 @@ class RTorrent:
 
         return result
 
+    def multicall(self, calls):
+        """
+        Run several methods in a single `system.multicall` request.
+
+        :param calls: List of (method name, params) tuples
+        :return: List with the result of each call, or the :class:`xmlrpc_client.Fault` it raised
+        """
+        multicall = xmlrpc_client.MultiCall(self._server)
+        for method, params in calls:
+            getattr(multicall, method)(*params)
+        response = multicall()
+        results = []
+        for index in range(len(calls)):
+            try:
+                results.append(response[index])
+            except xmlrpc_client.Fault as e:
+                results.append(e)
+        return results
+
+    def load_many(self, torrents, start=False, mkdir=True):
+        """
+        Load several torrents, sharing `system.multicall` requests between them as far as the
+        xmlrpc size limit of rTorrent allows.
+
+        :param torrents: List of (raw torrent, fields) tuples, see :meth:`load`
+        :return: List with the result of each load, or the :class:`xmlrpc_client.Error` it failed
+          with
+        """
+        results = [None] * len(torrents)
+
+        if mkdir:
+            directories = sorted(
+                {fields['directory'] for _, fields in torrents if 'directory' in fields}
+            )
+            created = self.multicall(
+                [('execute.throw', ('', 'mkdir', '-p', directory)) for directory in directories]
+            )
+            failed = {d for d, result in zip(directories, created) if result != 0}
+            for index, (_, fields) in enumerate(torrents):
+                if fields.get('directory') in failed:
+                    results[index] = xmlrpc_client.Error(
+                        'Failed creating directory %s' % fields['directory']
+                    )
+
+        method = 'load.raw_start' if start else 'load.raw'
+        # by default rtorrent won't allow calls over 512kb in size, leave 70kb for buffer
+        size_limit = 524288 - 71680
+        batch, batch_size = [], 0
+        for index, (raw_torrent, fields) in enumerate(torrents):
+            if results[index] is not None:
+                continue
+            params = self._load_params(raw_torrent, fields)
+            size = len(xmlrpc_client.dumps(tuple(params), method))
+            if size > size_limit:
+                # Too big to share a request, load raises the size limit for it
+                try:
+                    results[index] = self.load(raw_torrent, fields, start=start, mkdir=False)
+                except xmlrpc_client.Error as e:
+                    results[index] = e
+                continue
+            if batch and batch_size + size > size_limit:
+                self._load_batch(method, batch, results)
+                batch, batch_size = [], 0
+            batch.append((index, params))
+            batch_size += size
+        if batch:
+            self._load_batch(method, batch, results)
+        return results
+
+    def _load_batch(self, method, batch, results):
+        for (index, _), result in zip(batch, self.multicall([(method, p) for _, p in batch])):
+            results[index] = result
+
     def get_directory(self):
         return self._server.get_directory()
 
@@ -401,6 +485,45 @@ class RTorrentPluginBase:
 
         return options
 
+    @staticmethod
+    def connect(config):
+        """
+        Returns a client from the connection pool. Clients connecting over http(s) keep their own
+        session, so the connection to rTorrent is kept alive between tasks.
+        """
+        uri = os.path.expanduser(config['uri'])
+        key = (
+            'rtorrent',
+            uri,
+            config.get('username'),
+            config.get('password'),
+            config['digest_auth'],
+        )
+
+        def connect():
+            return RTorrent(
+                uri,
+                username=config.get('username'),
+                password=config.get('password'),
+                digest_auth=config['digest_auth'],
+                session=Session(),
+            )
+
+        return connection_pool.get(key, connect, close=lambda client: client.session.close())
+
+    @staticmethod
+    def get_snapshot(client):
+        """
+        Returns a (possibly shared) snapshot of the torrents loaded in rTorrent, indexed by hash.
+
+        Only the hash and base_path fields are requested.
+        """
+        return get_snapshot(
+            ('rtorrent', client.uri),
+            partial(client.torrents, fields=['hash', 'base_path']),
+            hash_getter=itemgetter('hash'),
+        )
+
 
 class RTorrentOutputPlugin(RTorrentPluginBase):
     schema = {
@@ -424,6 +547,7 @@ class RTorrentOutputPlugin(RTorrentPluginBase):
             'custom4': {'type': 'string'},
             'custom5': {'type': 'string'},
             'fast_resume': {'type': 'boolean', 'default': False},
+            'batch': {'type': 'boolean', 'default': False},
         },
         'required': ['uri'],
         'additionalProperties': False,
@@ -445,20 +569,32 @@ class RTorrentOutputPlugin(RTorrentPluginBase):
         # our temp .torrent files
         if config['action'] == 'add' and 'download' not in task.config:
             download = plugin.get('download', self)
-            download.get_temp_files(task, handle_magnets=True, fail_html=True)
+            snapshot = None
+            for entry in task.accepted:
+                if entry.get('torrent_info_hash'):
+                    if snapshot is None:
+                        snapshot = self._download_snapshot(task, config)
+                    if entry['torrent_info_hash'] in snapshot:
+                        # Already loaded, output will skip it
+                        continue
+                download.get_temp_file(task, entry, handle_magnets=True, fail_html=True)
+
+    def _download_snapshot(self, task, config):
+        client = self.connect(config)
+        try:
+            return self.get_snapshot(client)
+        except (OSError, xmlrpc_client.Error) as e:
+            logger.debug('Unable to check loaded torrents in rTorrent: {}', e)
+            return ()
 
     @plugin.priority(135)
     def on_task_output(self, task, config):
 
-        client = RTorrent(
-            os.path.expanduser(config['uri']),
-            username=config.get('username'),
-            password=config.get('password'),
-            digest_auth=config['digest_auth'],
-            session=task.requests,
-        )
+        client = self.connect(config)
 
         try:
+            snapshot = self.get_snapshot(client)
+            batch = []
             for entry in task.accepted:
                 if config['action'] == 'add':
                     if task.options.test:
@@ -470,16 +606,21 @@ class RTorrentOutputPlugin(RTorrentPluginBase):
                         entry.fail("failed to render properties %s" % str(e))
                         continue
 
-                    # fast_resume is not really an rtorrent option so it's not in _build_options
-                    fast_resume = entry.get('fast_resume', config['fast_resume'])
-                    self.add_entry(
-                        client,
-                        entry,
-                        options,
-                        start=config['start'],
-                        mkdir=config['mkdir'],
-                        fast_resume=fast_resume,
-                    )
+                    if config['batch']:
+                        batch.append((entry, options))
+                    else:
+                        # fast_resume is not really an rtorrent option so it's not in
+                        # _build_options
+                        fast_resume = entry.get('fast_resume', config['fast_resume'])
+                        self.add_entry(
+                            client,
+                            entry,
+                            options,
+                            start=config['start'],
+                            mkdir=config['mkdir'],
+                            fast_resume=fast_resume,
+                            snapshot=snapshot,
+                        )
 
                 info_hash = entry.get('torrent_info_hash')
 
@@ -495,7 +636,7 @@ class RTorrentOutputPlugin(RTorrentPluginBase):
                             entry['torrent_info_hash'],
                         )
                         continue
-                    self.delete_entry(client, entry)
+                    self.delete_entry(client, entry, snapshot)
 
                 if config['action'] == 'update':
                     if task.options.test:
@@ -505,12 +646,15 @@ class RTorrentOutputPlugin(RTorrentPluginBase):
                             entry['torrent_info_hash'],
                         )
                         continue
-                    self.update_entry(client, entry, config)
+                    self.update_entry(client, entry, config, snapshot)
+
+            if batch:
+                self.add_entries(client, batch, config, snapshot)
 
         except OSError as e:
             raise plugin.PluginError("Couldn't connect to rTorrent: %s" % str(e))
 
-    def delete_entry(self, client, entry):
+    def delete_entry(self, client, entry, snapshot=None):
         try:
             client.delete(entry['torrent_info_hash'])
             logger.verbose(
@@ -519,15 +663,21 @@ class RTorrentOutputPlugin(RTorrentPluginBase):
         except xmlrpc_client.Error as e:
             entry.fail('Failed to delete: %s' % str(e))
             return
+        if snapshot is not None:
+            snapshot.remove({'hash': entry['torrent_info_hash']})
+            invalidate_snapshots('rtorrent', client.uri)
 
-    def update_entry(self, client, entry, config):
+    def update_entry(self, client, entry, config, snapshot=None):
         info_hash = entry['torrent_info_hash']
 
         # First check if it already exists
-        try:
-            existing = client.torrent(info_hash, fields=['base_path'])
-        except xmlrpc_client.Error:
-            existing = False
+        if snapshot is not None:
+            existing = snapshot.find(info_hash)
+        else:
+            try:
+                existing = client.torrent(info_hash, fields=['base_path'])
+            except xmlrpc_client.Error:
+                existing = False
 
         # Build options but make config values override entry values
         try:
@@ -551,6 +701,11 @@ class RTorrentOutputPlugin(RTorrentPluginBase):
                 except xmlrpc_client.Error as e:
                     entry.fail('Failed moving torrent: %s' % str(e))
                     return
+                finally:
+                    # base_path of the torrent is no longer known
+                    if snapshot is not None:
+                        snapshot.remove(existing)
+                        invalidate_snapshots('rtorrent', client.uri)
 
         # Remove directory from update otherwise rTorrent will append the title to the directory path
         if 'directory' in options:
@@ -563,12 +718,116 @@ class RTorrentOutputPlugin(RTorrentPluginBase):
             entry.fail('Failed to update: %s' % str(e))
             return
 
-    def add_entry(self, client, entry, options, start=True, mkdir=False, fast_resume=False):
+    def add_entry(
+        self, client, entry, options, start=True, mkdir=False, fast_resume=False, snapshot=None
+    ):
+        torrent_raw = self._prepare_torrent(client, entry, options, fast_resume, snapshot)
+        if torrent_raw is None:
+            return
+
+        try:
+            resp = client.load(torrent_raw, fields=options, start=start, mkdir=mkdir)
+            if resp != 0:
+                entry.fail('Failed to add to rTorrent invalid return value %s' % resp)
+        except xmlrpc_client.Error as e:
+            logger.exception(e)
+            entry.fail('Failed to add to rTorrent %s' % str(e))
+            return
+
+        # Verify the torrent loaded
+        try:
+            loaded = self._verify_load(client, entry['torrent_info_hash'])
+            logger.info('{} added to rtorrent', entry['title'])
+            if snapshot is not None and loaded:
+                snapshot.add(loaded)
+        except xmlrpc_client.Error as e:
+            logger.warning('Failed to verify torrent {} loaded: {}', entry['title'], str(e))
+
+    def add_entries(self, client, entries, config, snapshot=None):
+        """
+        Adds several entries at once, loading the torrents with shared `system.multicall`
+        requests.
 
+        :param entries: List of (entry, options) tuples
+        """
+        batch = []
+        for entry, options in entries:
+            fast_resume = entry.get('fast_resume', config['fast_resume'])
+            torrent_raw = self._prepare_torrent(client, entry, options, fast_resume, snapshot)
+            if torrent_raw is not None:
+                batch.append((entry, torrent_raw, options))
+        if not batch:
+            return
+
+        try:
+            results = client.load_many(
+                [(torrent_raw, options) for _, torrent_raw, options in batch],
+                start=config['start'],
+                mkdir=config['mkdir'],
+            )
+        except xmlrpc_client.Error as e:
+            logger.exception(e)
+            for entry, _, _ in batch:
+                entry.fail('Failed to add to rTorrent %s' % str(e))
+            return
+
+        loaded = []
+        for (entry, _, _), result in zip(batch, results):
+            if isinstance(result, xmlrpc_client.Error):
+                entry.fail('Failed to add to rTorrent %s' % str(result))
+            elif result != 0:
+                entry.fail('Failed to add to rTorrent invalid return value %s' % result)
+            else:
+                loaded.append(entry)
+        if loaded:
+            self._verify_loads(client, loaded, snapshot)
+
+    def _verify_loads(self, client, entries, snapshot=None):
+        for _ in range(0, 5):
+            try:
+                results = client.multicall(
+                    [('d.base_path', (entry['torrent_info_hash'],)) for entry in entries]
+                )
+            except xmlrpc_client.Error as e:
+                logger.warning('Failed to verify torrents loaded: {}', str(e))
+                return
+            pending = []
+            for entry, result in zip(entries, results):
+                if isinstance(result, xmlrpc_client.Fault):
+                    pending.append(entry)
+                    continue
+                logger.info('{} added to rtorrent', entry['title'])
+                if snapshot is not None:
+                    snapshot.add({'hash': entry['torrent_info_hash'], 'base_path': result})
+            entries = pending
+            if not entries:
+                return
+            sleep(0.5)
+        for entry in entries:
+            logger.warning('Failed to verify torrent {} loaded', entry['title'])
+
+    def _prepare_torrent(self, client, entry, options, fast_resume=False, snapshot=None):
+        """
+        Checks `entry` can be added and returns the raw torrent (with resume data if needed) to
+        load, or None if it should not be loaded.
+        """
         if 'torrent_info_hash' not in entry:
             entry.fail('missing torrent_info_hash')
             return
 
+        # First check if it already exists
+        if snapshot is not None:
+            exists = entry['torrent_info_hash'] in snapshot
+        else:
+            try:
+                exists = client.torrent(entry['torrent_info_hash'])
+            except xmlrpc_client.Error:
+                # No existing found
+                exists = False
+        if exists:
+            logger.warning("Torrent {} already exists, won't add", entry['title'])
+            return
+
         if entry['url'].startswith('magnet:'):
             torrent_raw = 'd10:magnet-uri%d:%se' % (len(entry['url']), entry['url'])
             torrent_raw = torrent_raw.encode('ascii')
@@ -629,30 +888,7 @@ class RTorrentOutputPlugin(RTorrentPluginBase):
                 entry.fail('Strange, unable to decode torrent, raise a BUG: %s' % str(e))
                 return
 
-        # First check if it already exists
-        try:
-            if client.torrent(entry['torrent_info_hash']):
-                logger.warning("Torrent {} already exists, won't add", entry['title'])
-                return
-        except xmlrpc_client.Error:
-            # No existing found
-            pass
-
-        try:
-            resp = client.load(torrent_raw, fields=options, start=start, mkdir=mkdir)
-            if resp != 0:
-                entry.fail('Failed to add to rTorrent invalid return value %s' % resp)
-        except xmlrpc_client.Error as e:
-            logger.exception(e)
-            entry.fail('Failed to add to rTorrent %s' % str(e))
-            return
-
-        # Verify the torrent loaded
-        try:
-            self._verify_load(client, entry['torrent_info_hash'])
-            logger.info('{} added to rtorrent', entry['title'])
-        except xmlrpc_client.Error as e:
-            logger.warning('Failed to verify torrent {} loaded: {}', entry['title'], str(e))
+        return torrent_raw
 
     def on_task_learn(self, task, config):
         """ Make sure all temp files are cleaned up when entries are learned """
@@ -680,13 +916,7 @@ class RTorrentInputPlugin(RTorrentPluginBase):
     }
 
     def on_task_input(self, task, config):
-        client = RTorrent(
-            os.path.expanduser(config['uri']),
-            username=config.get('username'),
-            password=config.get('password'),
-            digest_auth=config['digest_auth'],
-            session=task.requests,
-        )
+        client = self.connect(config)
 
         fields = config.get('fields')
 
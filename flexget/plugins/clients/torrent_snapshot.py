@@ -0,0 +1,109 @@
+"""
+Short lived snapshots of the torrents loaded in a download client.
+
+Output plugins need to know which of the accepted entries are already loaded in the client.
+Asking the client for its full torrent list (with every field) once per entry, phase or task gets
+very expensive for clients holding tens of thousands of torrents, so the listing is fetched once
+with only the fields needed, indexed by info hash and client id, and shared between phases and
+tasks until it expires.
+"""
+from loguru import logger
+
+from flexget.utils.tools import TimedDict
+
+logger = logger.bind(name='torrent_snapshot')
+
+# How long a snapshot is reused before the client is asked again
+SNAPSHOT_TTL = '1 minute'
+
+_snapshots = TimedDict(SNAPSHOT_TTL)
+
+
+class TorrentSnapshot:
+    """
+    Point in time listing of the torrents in a client, indexed by info hash and (optionally) client
+    specific id.
+
+    Plugins keep the snapshot current by calling :meth:`add` and :meth:`remove` for the changes
+    they make themselves, which lets it be reused until it expires.
+    """
+
+    def __init__(self, torrents, hash_getter, id_getter=None):
+        """
+        :param torrents: Iterable of torrent objects as returned by the client
+        :param hash_getter: Callable returning the info hash of a torrent object
+        :param id_getter: Callable returning the client specific id of a torrent object, if the
+          client has one
+        """
+        self._hash_getter = hash_getter
+        self._id_getter = id_getter
+        self._by_hash = {}
+        self._by_id = {}
+        for torrent in torrents:
+            self.add(torrent)
+
+    def add(self, torrent):
+        info_hash = self._hash_getter(torrent)
+        if info_hash:
+            self._by_hash[info_hash.lower()] = torrent
+        if self._id_getter:
+            self._by_id[self._id_getter(torrent)] = torrent
+
+    def remove(self, torrent):
+        info_hash = self._hash_getter(torrent)
+        if info_hash:
+            self._by_hash.pop(info_hash.lower(), None)
+        if self._id_getter:
+            self._by_id.pop(self._id_getter(torrent), None)
+
+    def find(self, info_hash=None, torrent_id=None):
+        """
+        Look up a torrent by client id or info hash.
+
+        :return: The torrent object, or None if it is not loaded in the client
+        """
+        if torrent_id is not None and torrent_id in self._by_id:
+            return self._by_id[torrent_id]
+        if info_hash:
+            return self._by_hash.get(info_hash.lower())
+        return None
+
+    def find_entry(self, entry, id_field=None):
+        """Look up the torrent for `entry` by its `id_field` or `torrent_info_hash` fields."""
+        return self.find(entry.get('torrent_info_hash'), entry.get(id_field) if id_field else None)
+
+    def __contains__(self, info_hash):
+        return bool(info_hash) and info_hash.lower() in self._by_hash
+
+    def __iter__(self):
+        return iter(list(self._by_hash.values()))
+
+    def __len__(self):
+        return len(self._by_hash)
+
+
+def get_snapshot(key, fetch, hash_getter, id_getter=None, refresh=False):
+    """
+    Returns a shared :class:`TorrentSnapshot` for `key`, fetching a new one if there is none or it
+    has expired.
+
+    :param tuple key: Identifies the client connection and the fields requested,
+      eg. `('transmission', host, port)`
+    :param fetch: Callable returning the torrent objects to build a new snapshot from
+    :param hash_getter: See :class:`TorrentSnapshot`
+    :param id_getter: See :class:`TorrentSnapshot`
+    :param bool refresh: Ignore any cached snapshot for `key`
+    """
+    snapshot = None if refresh else _snapshots.get(key)
+    if snapshot is None:
+        snapshot = TorrentSnapshot(fetch(), hash_getter, id_getter)
+        logger.debug('Fetched snapshot of {} torrents for {}', len(snapshot), key[0])
+        _snapshots[key] = snapshot
+    return snapshot
+
+
+def invalidate_snapshots(*key_prefix):
+    """Drops all cached snapshots with keys starting with `key_prefix`, eg. after removals."""
+    for key in list(_snapshots):
+        if key[: len(key_prefix)] == key_prefix:
+            del _snapshots[key]
@@ -5,6 +5,7 @@ from datetime import datetime, timedelta
 from fnmatch import fnmatch
 from functools import partial
 from netrc import NetrcParseError, netrc
+from operator import attrgetter
 from time import sleep
 from urllib.parse import urlparse
 
@@ -14,6 +15,8 @@ from flexget import plugin
 from flexget.config_schema import one_or_more
 from flexget.entry import Entry
 from flexget.event import event
+from flexget.plugins.clients.connection_pool import connection_pool
+from flexget.plugins.clients.torrent_snapshot import get_snapshot, invalidate_snapshots
 from flexget.utils.pathscrub import pathscrub
 from flexget.utils.template import RenderError
 from flexget.utils.tools import parse_timedelta
@@ -30,6 +33,9 @@ logger = logger.bind(name='transmission')
 
 
 class TransmissionBase:
+    # Fields needed to match entries against the torrents loaded in transmission
+    snapshot_fields = ['id', 'hashString', 'name', 'totalSize']
+
     def __init__(self):
         self.client = None
         self.opener = None
@@ -64,29 +70,51 @@ class TransmissionBase:
         port = str(urlo.port) if urlo.port else config['port']
         path = urlo.path.rstrip('rpc') if urlo.path else '/transmission/'
 
-        logger.debug('Connecting to {}://{}:{}{}', protocol, urlo.hostname, port, path)
-
-        try:
-            cli = transmissionrpc.Client(
-                protocol=protocol,
-                host=urlo.hostname,
-                port=port,
-                path=path,
-                username=user,
-                password=password,
-            )
-        except TransmissionError as e:
-            if e.original and e.original.code == 401:
+        def connect():
+            logger.debug('Connecting to {}://{}:{}{}', protocol, urlo.hostname, port, path)
+            try:
+                return transmissionrpc.Client(
+                    protocol=protocol,
+                    host=urlo.hostname,
+                    port=port,
+                    path=path,
+                    username=user,
+                    password=password,
+                )
+            except TransmissionError as e:
+                if e.original and e.original.code == 401:
+                    raise plugin.PluginError(
+                        "Username/password for transmission is incorrect. Cannot connect."
+                    )
+                else:
+                    raise plugin.PluginError("Error connecting to transmission: %s" % e.message)
+            except requests.exceptions.ConnectTimeout as e:
+                raise plugin.PluginError("Cannot connect to transmission: Connection timed out.")
+            except requests.exceptions.ConnectionError as e:
                 raise plugin.PluginError(
-                    "Username/password for transmission is incorrect. Cannot connect."
+                    "Error connecting to transmission: %s" % e.args[0].reason
                 )
-            else:
-                raise plugin.PluginError("Error connecting to transmission: %s" % e.message)
-        except requests.exceptions.ConnectTimeout as e:
-            raise plugin.PluginError("Cannot connect to transmission: Connection timed out.")
-        except requests.exceptions.ConnectionError as e:
-            raise plugin.PluginError("Error connecting to transmission: %s" % e.args[0].reason)
-        return cli
+
+        # The session id is renewed by the client itself, so pooled clients need no health check
+        key = ('transmission', protocol, urlo.hostname, port, path, user, password)
+        return connection_pool.get(key, connect)
+
+    def get_snapshot(self, config, fields=None, name='torrents', refresh=False):
+        """
+        Returns a (possibly shared) snapshot of the torrents loaded in transmission, indexed by
+        hash and id.
+
+        :param list fields: Torrent fields to request, defaults to :attr:`snapshot_fields`
+        :param str name: Distinguishes snapshots requesting different fields from the same daemon
+        """
+        fields = fields or self.snapshot_fields
+        return get_snapshot(
+            ('transmission', config['host'], config['port'], name),
+            partial(self.client.get_torrents, arguments=fields),
+            hash_getter=attrgetter('hashString'),
+            id_getter=attrgetter('id'),
+            refresh=refresh,
+        )
 
     def torrent_info(self, torrent, config):
         done = torrent.totalSize > 0
@@ -342,13 +370,22 @@ class PluginTransmission(TransmissionBase):
         # If the download plugin is not enabled, we need to call it to get our temp .torrent files
         if 'download' not in task.config:
             download = plugin.get('download', self)
+            snapshot = None
             for entry in task.accepted:
                 if entry.get('transmission_id'):
-                    # The torrent is already loaded in deluge, we don't need to get anything
-                    continue
-                if config['action'] != 'add' and entry.get('torrent_info_hash'):
-                    # If we aren't adding the torrent new, all we need is info hash
+                    # The torrent is already loaded in transmission, we don't need to get anything
                     continue
+                if entry.get('torrent_info_hash'):
+                    if config['action'] != 'add':
+                        # If we aren't adding the torrent new, all we need is info hash
+                        continue
+                    if snapshot is None:
+                        if self.client is None:
+                            self.client = self.create_rpc_client(config)
+                        snapshot = self.get_snapshot(config)
+                    if entry['torrent_info_hash'] in snapshot:
+                        # Already loaded, output will only apply options to it
+                        continue
                 download.get_temp_file(task, entry, handle_magnets=True, fail_html=True)
 
     @plugin.priority(135)
@@ -368,25 +405,14 @@ class PluginTransmission(TransmissionBase):
                 logger.debug('Successfully connected to transmission.')
             else:
                 raise plugin.PluginError("Couldn't connect to transmission.")
-        session_torrents = self.client.get_torrents()
+        snapshot = self.get_snapshot(config)
         for entry in task.accepted:
             if task.options.test:
                 logger.info('Would {} {} in transmission.', config['action'], entry['title'])
                 continue
             # Compile user options into appropriate dict
             options = self._make_torrent_options_dict(config, entry)
-            torrent_info = None
-            for t in session_torrents:
-                if t.hashString.lower() == entry.get(
-                    'torrent_info_hash', ''
-                ).lower() or t.id == entry.get('transmission_id'):
-                    torrent_info = t
-                    logger.debug(
-                        'Found {} already loaded in transmission as {}',
-                        entry['title'],
-                        torrent_info.name,
-                    )
-                    break
+            torrent_info = self._verify_snapshot_hit(task, entry, snapshot, config)
 
             if not torrent_info:
                 if config['action'] != 'add':
@@ -434,8 +460,14 @@ class PluginTransmission(TransmissionBase):
                 logger.info('"{}" torrent added to transmission', entry['title'])
                 # The info returned by the add call is incomplete, refresh it
                 torrent_info = self.client.get_torrent(torrent_info.id)
+                snapshot.add(torrent_info)
             else:
                 # Torrent already loaded in transmission
+                logger.debug(
+                    'Found {} already loaded in transmission as {}',
+                    entry['title'],
+                    torrent_info.name,
+                )
                 if options['add'].get('download_dir'):
                     logger.verbose(
                         'Moving {} to "{}"', torrent_info.name, options['add']['download_dir']
@@ -630,6 +662,7 @@ class PluginTransmission(TransmissionBase):
                     self.client.remove_torrent(
                         [torrent_info.id], delete_data=config['action'] == 'purge'
                     )
+                    snapshot.remove(torrent_info)
                     logger.info('{}d {} from transmission', config['action'], torrent_info.name)
                 elif config['action'] == 'pause':
                     self.client.stop_torrent([torrent_info.id])
@@ -650,6 +683,26 @@ class PluginTransmission(TransmissionBase):
                 logger.error(msg)
                 continue
 
+    def _verify_snapshot_hit(self, task, entry, snapshot, config):
+        """
+        Looks up `entry` in the snapshot, and makes sure a hit is still loaded in transmission.
+
+        The snapshot may be shared with earlier tasks, the torrent could have been removed since.
+        """
+        torrent_info = snapshot.find_entry(entry, 'transmission_id')
+        if not torrent_info:
+            return None
+        try:
+            return self.client.get_torrent(torrent_info.id, arguments=self.snapshot_fields)
+        except (KeyError, TransmissionError):
+            logger.debug('{} is no longer loaded in transmission', entry['title'])
+            snapshot.remove(torrent_info)
+        # The download phase skipped the temp file, as the torrent seemed to be loaded
+        if config['action'] == 'add' and 'file' not in entry and 'download' not in task.config:
+            download = plugin.get('download', self)
+            download.get_temp_file(task, entry, handle_magnets=True, fail_html=True)
+        return None
+
     def _make_torrent_options_dict(self, config, entry):
 
         opt_dic = {}
@@ -823,6 +876,25 @@ class PluginTransmissionClean(TransmissionBase):
         ],
     }
 
+    clean_fields = [
+        'id',
+        'hashString',
+        'name',
+        'status',
+        'uploadRatio',
+        'addedDate',
+        'doneDate',
+        'activityDate',
+        'seedRatioMode',
+        'seedRatioLimit',
+        'seedIdleMode',
+        'seedIdleLimit',
+        'trackers',
+        'downloadDir',
+        'totalSize',
+    ]
+    file_fields = ['files', 'fileStats', 'priorities', 'wanted']
+
     def on_task_exit(self, task, config):
         config = self.prepare_config(config)
         if not config['enabled'] or task.options.learn:
@@ -838,8 +910,10 @@ class PluginTransmissionClean(TransmissionBase):
 
         session = self.client.get_session()
 
-        remove_ids = []
-        for torrent in self.client.get_torrents():
+        # Only ask for the file lists of torrents passing all the other checks, they are by far
+        # the most expensive part of the listing. Ids are session scoped, hashes are used instead.
+        candidates = []
+        for torrent in self.client.get_torrents(arguments=self.clean_fields):
             logger.verbose(
                 'Torrent "{}": status: "{}" - ratio: {} - date added: {}',
                 torrent.name,
@@ -847,9 +921,6 @@ class PluginTransmissionClean(TransmissionBase):
                 torrent.ratio,
                 torrent.date_added,
             )
-            downloaded, dummy = self.torrent_info(torrent, config)
-            if not downloaded:
-                continue
             if config.get('transmission_seed_limits'):
                 seed_ratio_ok, idle_limit_ok = self.check_seed_limits(torrent, session)
                 if not seed_ratio_ok or not idle_limit_ok:
@@ -876,13 +947,26 @@ class PluginTransmissionClean(TransmissionBase):
                     re.search(d, torrent.downloadDir, re.IGNORECASE) for d in config['directories']
                 ):
                     continue
-            if task.options.test:
-                logger.info('Would remove finished torrent `{}` from transmission', torrent.name)
-                continue
-            logger.info('Removing finished torrent `{}` from transmission', torrent.name)
-            remove_ids.append(torrent.id)
+            candidates.append(torrent.hashString)
+
+        remove_ids = []
+        if candidates:
+            for torrent in self.client.get_torrents(
+                ids=candidates, arguments=self.clean_fields + self.file_fields
+            ):
+                downloaded, dummy = self.torrent_info(torrent, config)
+                if not downloaded:
+                    continue
+                if task.options.test:
+                    logger.info(
+                        'Would remove finished torrent `{}` from transmission', torrent.name
+                    )
+                    continue
+                logger.info('Removing finished torrent `{}` from transmission', torrent.name)
+                remove_ids.append(torrent.id)
         if remove_ids:
             self.client.remove_torrent(remove_ids, config.get('delete_files'))
+            invalidate_snapshots('transmission', config['host'], config['port'])
 
 
 @event('plugin.register')
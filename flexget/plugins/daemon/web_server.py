@@ -1,3 +1,4 @@
+from flask import Flask, Response
 from loguru import logger
 
 from flexget.api import api_app
@@ -5,6 +6,7 @@ from flexget.config_schema import register_config_key
 from flexget.event import event
 from flexget.ui.v1 import register_web_ui as register_web_ui_v1
 from flexget.ui.v2 import register_web_ui as register_web_ui_v2
+from flexget.utils import metrics
 from flexget.utils.tools import get_config_hash
 from flexget.webserver import get_secret, register_app, setup_server
 
@@ -12,6 +14,14 @@ logger = logger.bind(name="web_server_daemon")
 config_hash = ''
 web_server = None
 
+metrics_app = Flask(__name__)
+
+
+@metrics_app.route('/')
+def metrics_page():
+    return Response(metrics.registry.render(), content_type=metrics.CONTENT_TYPE)
+
+
 web_config_schema = {
     'oneOf': [
         {'type': 'boolean'},
@@ -30,6 +40,7 @@ web_config_schema = {
                     'deprecated': 'v2 is registered by default if web_ui: true so `run_v2` is now redundant. To run v1 alongside, use the `run_v1`.',
                 },
                 'run_v1': {'type': 'boolean'},
+                'metrics': {'type': 'boolean'},
             },
             'additionalProperties': False,
             'dependencies': {
@@ -56,6 +67,7 @@ def prepare_config(config):
     config.setdefault('base_url', '')
     config.setdefault('run_v2', False)
     config.setdefault('run_v1', False)
+    config.setdefault('metrics', False)
     if config['base_url']:
         if not config['base_url'].startswith('/'):
             config['base_url'] = '/' + config['base_url']
@@ -111,6 +123,12 @@ def register_web_server(manager):
         logger.info('Registering WebUI v2')
         register_web_ui_v2(web_server_config)
 
+    # Metrics are not authenticated, so they are only served when enabled
+    if web_server_config['metrics']:
+        logger.info('Registering metrics')
+        metrics.enable()
+        register_app('/metrics', metrics_app, 'Metrics')
+
     web_server = setup_server(web_server_config)
 
 
@@ -125,3 +143,4 @@ def stop_server(manager):
     if web_server and web_server.is_alive():
         web_server.stop()
     web_server = None
+    metrics.disable()
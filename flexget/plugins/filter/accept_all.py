@@ -17,6 +17,7 @@ class FilterAcceptAll:
 
     schema = {'type': 'boolean'}
 
+    @plugin.no_session
     def on_task_filter(self, task, config):
         if config:
             for entry in task.entries:
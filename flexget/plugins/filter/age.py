@@ -33,48 +33,46 @@ class Age:
         'additionalProperties': False,
     }
 
-    def on_task_filter(self, task, config):
-        for entry in task.entries:
-            field = config['field']
-            if field not in entry:
-                entry.fail('Field {0} does not exist'.format(field))
-                continue
-
-            field_value = entry[field]
+    @staticmethod
+    def parse_date(value):
+        if isinstance(value, datetime):
+            return value
+        if isinstance(value, float):
+            return datetime.fromtimestamp(value)
+        if isinstance(value, str):
+            return dateutil_parse(value)
+        raise ValueError('not a date')
 
-            if isinstance(field_value, datetime):
-                field_date = field_value
-            elif isinstance(field_value, float):
-                field_date = datetime.fromtimestamp(field_value)
-            elif isinstance(field_value, str):
-                try:
-                    field_date = dateutil_parse(entry[field])
-                except ValueError:
-                    logger.warning(
-                        'Entry {} ignored: {} is not a valid date', entry['title'], field_value
-                    )
-                    continue
-            else:
-                logger.warning(
-                    'Entry {} ignored: {} is not a valid date', entry['title'], field_value
-                )
-                continue
+    @plugin.no_session
+    def on_task_filter(self, task, config):
+        field = config['field']
+        batch = task.entries.batch()
+        batch.fail(
+            batch.where(lambda entry: field not in entry),
+            'Field {0} does not exist'.format(field),
+        )
 
-            age_cutoff = datetime.now() - parse_timedelta(config['age'])
+        values = batch.column(field)
+        dates = values.map(self.parse_date)
+        for entry, value, invalid in zip(batch, values, values.valid & dates.missing):
+            if invalid:
+                logger.warning('Entry {} ignored: {} is not a valid date', entry['title'], value)
 
-            if field_date < age_cutoff:
-                info_string = 'Date in field `{0}` is older than {1}'.format(field, config['age'])
-                if config['action'] == 'accept':
-                    entry.accept(info_string)
-                else:
-                    entry.reject(info_string)
-                logger.debug(
-                    'Entry {} was {}ed because date in field `{}` is older than {}',
-                    entry['title'],
-                    config['action'],
-                    field,
-                    config['age'],
-                )
+        age_cutoff = datetime.now() - parse_timedelta(config['age'])
+        older = dates.where(lambda date: date < age_cutoff)
+        info_string = 'Date in field `{0}` is older than {1}'.format(field, config['age'])
+        if config['action'] == 'accept':
+            batch.accept(older, info_string)
+        else:
+            batch.reject(older, info_string)
+        for entry in batch.select(older):
+            logger.debug(
+                'Entry {} was {}ed because date in field `{}` is older than {}',
+                entry['title'],
+                config['action'],
+                field,
+                config['age'],
+            )
 
 
 @event('plugin.register')
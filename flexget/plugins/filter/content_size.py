@@ -20,33 +20,42 @@ class FilterContentSize:
         'additionalProperties': False,
     }
 
-    def process_entry(self, task, entry, config, remember=True):
-        """Rejects this entry if it does not pass content_size requirements. Returns true if the entry was rejected."""
-        if 'content_size' in entry:
-            size = entry['content_size']
-            logger.debug('{} size {} MB', entry['title'], size)
-            # Avoid confusion by printing a reject message to info log, as
-            # download plugin has already printed a downloading message.
-            if size < config.get('min', 0):
-                log_once('Entry `%s` too small, rejecting' % entry['title'], logger)
-                entry.reject(
-                    'minimum size %s MB, got %s MB' % (config['min'], size), remember=remember
-                )
-                return True
-            if size > config.get('max', maxsize):
-                log_once('Entry `%s` too big, rejecting' % entry['title'], logger)
-                entry.reject(
-                    'maximum size %s MB, got %s MB' % (config['max'], size), remember=remember
-                )
-                return True
+    def reject_by_size(self, batch, config, remember=True):
+        """Rejects the entries of `batch` which do not pass content_size requirements."""
+        size = batch.column('content_size')
+        minimum = config.get('min', 0)
+        maximum = config.get('max', maxsize)
+        too_small = size.where(lambda value: value < minimum)
+        too_big = size.where(lambda value: value > maximum) & ~too_small
+        for entry, value, valid in zip(batch, size, size.valid):
+            if valid:
+                logger.debug('{} size {} MB', entry['title'], value)
+        # Avoid confusion by printing a reject message to info log, as
+        # download plugin has already printed a downloading message.
+        for entry in batch.select(too_small):
+            log_once('Entry `%s` too small, rejecting' % entry['title'], logger)
+        batch.reject(
+            too_small,
+            lambda entry: 'minimum size %s MB, got %s MB' % (config['min'], entry['content_size']),
+            remember=remember,
+        )
+        for entry in batch.select(too_big):
+            log_once('Entry `%s` too big, rejecting' % entry['title'], logger)
+        batch.reject(
+            too_big,
+            lambda entry: 'maximum size %s MB, got %s MB' % (config['max'], entry['content_size']),
+            remember=remember,
+        )
+        return size
 
     @plugin.priority(130)
+    @plugin.no_session
     def on_task_filter(self, task, config):
         # Do processing on filter phase in case input plugin provided the size
-        for entry in task.entries:
-            self.process_entry(task, entry, config, remember=False)
+        self.reject_by_size(task.entries.batch(), config, remember=False)
 
     @plugin.priority(150)
+    @plugin.no_session
     def on_task_modify(self, task, config):
         if task.options.test or task.options.learn:
             logger.info(
@@ -56,19 +65,26 @@ class FilterContentSize:
             return
 
         num_rejected = len(task.rejected)
-        for entry in task.accepted:
-            if 'content_size' in entry:
-                self.process_entry(task, entry, config)
-            elif config['strict']:
+        batch = task.accepted.batch()
+        size = self.reject_by_size(batch, config)
+        if config['strict']:
+            unknown = batch.select(size.missing)
+            for entry in unknown:
                 logger.debug(
                     'Entry {} size is unknown, rejecting because of strict mode (default)',
                     entry['title'],
                 )
                 logger.info('No size information available for {}, rejecting', entry['title'])
-                if 'file' not in entry:
-                    entry.reject('no size info available nor file to read it from', remember=True)
-                else:
-                    entry.reject('no size info available from downloaded file', remember=True)
+            unknown.reject(
+                unknown.where(lambda entry: 'file' not in entry),
+                'no size info available nor file to read it from',
+                remember=True,
+            )
+            unknown.reject(
+                unknown.where(lambda entry: 'file' in entry),
+                'no size info available from downloaded file',
+                remember=True,
+            )
 
         if len(task.rejected) > num_rejected:
             # Since we are rejecting after the filter event,
@@ -22,19 +22,26 @@ class FilterQuality:
 
     # Run before series and imdb plugins, so correct qualities are chosen
     @plugin.priority(175)
+    @plugin.no_session
     def on_task_filter(self, task, config):
         if not isinstance(config, list):
             config = [config]
         reqs = [qualities.Requirements(req) for req in config]
-        for entry in task.entries:
-            if entry.get('quality') is None:
-                entry.reject('Entry doesn\'t have a quality')
-                continue
-            if not any(req.allows(entry['quality']) for req in reqs):
-                text_reqs = ', '.join(f'`{req}`' for req in reqs)
-                entry.reject(
-                    f'`{entry["quality"]}` does not match any of quality requirements: {text_reqs}'
-                )
+        batch = task.entries.batch()
+        quality = batch.column('quality')
+        batch.reject(quality.missing, 'Entry doesn\'t have a quality')
+        text_reqs = ', '.join(f'`{req}`' for req in reqs)
+
+        def reason(entry):
+            return f'`{entry["quality"]}` does not match any of quality requirements: {text_reqs}'
+
+        # Feeds only have a handful of distinct qualities, check each of them once
+        allowed = {
+            value: any(req.allows(value) for req in reqs)
+            for value in set(quality.values)
+            if value is not None
+        }
+        batch.reject(quality.where(lambda value: not allowed[value]), reason)
 
 
 @event('plugin.register')
@@ -142,6 +142,7 @@ class FilterRegexp:
         return out_config
 
     @plugin.priority(172)
+    @plugin.no_session
     def on_task_filter(self, task, config):
         # TODO: what if accept and accept_excluding configured? Should raise error ...
         config = self.prepare_config(config)
@@ -15,6 +15,7 @@ class UrlFix:
     schema = {'type': 'boolean'}
 
     @plugin.priority(plugin.PRIORITY_LAST)
+    @plugin.no_session
     def on_task_input(self, task, config):
         if config is False:
             return
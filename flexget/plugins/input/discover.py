@@ -1,6 +1,11 @@
+import contextlib
 import datetime
+import functools
 import itertools
 import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 from loguru import logger
 from sqlalchemy import Column, DateTime, Index, Integer, Unicode
@@ -8,6 +13,7 @@ from sqlalchemy import Column, DateTime, Index, Integer, Unicode
 from flexget import db_schema, options, plugin
 from flexget.event import event
 from flexget.manager import Session
+from flexget.utils.search_cache import SEARCH_CACHE_SCHEMA, SearchCache
 from flexget.utils.tools import aggregate_inputs, multiply_timedelta, parse_timedelta
 
 logger = logger.bind(name='discover')
@@ -48,6 +54,29 @@ def db_cleanup(manager, session):
         session.delete(discover_entry)
 
 
+class SearchLimiter:
+    """Limits how many searches run on a search plugin at a time, and how often they are started."""
+
+    def __init__(self, concurrency, interval):
+        self.semaphore = threading.BoundedSemaphore(concurrency)
+        self.interval = parse_timedelta(interval).total_seconds()
+        self.lock = threading.Lock()
+        self.next_start = 0
+
+    def __enter__(self):
+        self.semaphore.acquire()
+        if self.interval:
+            with self.lock:
+                now = time.monotonic()
+                wait = self.next_start - now
+                self.next_start = max(now, self.next_start) + self.interval
+            if wait > 0:
+                time.sleep(wait)
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.semaphore.release()
+
+
 class Discover:
     """
     Discover content based on other inputs material.
@@ -61,6 +90,17 @@ class Discover:
           - piratebay
         interval: [1 hours|days|weeks]
         release_estimations: [strict|loose|ignore]
+        concurrency:
+          searches: 4
+          per_plugin: 1
+          interval: 2 seconds
+        stop_after_results: 5
+        cache:
+          ttl: 1 hour
+          negative_ttl: 15 minutes
+          plugins:
+            piratebay:
+              ttl: 6 hours
     """
 
     schema = {
@@ -96,6 +136,17 @@ class Discover:
                 ]
             },
             'limit': {'type': 'integer', 'minimum': 1},
+            'concurrency': {
+                'type': 'object',
+                'properties': {
+                    'searches': {'type': 'integer', 'minimum': 1, 'default': 4},
+                    'per_plugin': {'type': 'integer', 'minimum': 1, 'default': 1},
+                    'interval': {'type': 'string', 'format': 'interval', 'default': '0 seconds'},
+                },
+                'additionalProperties': False,
+            },
+            'stop_after_results': {'type': 'integer', 'minimum': 1},
+            'cache': SEARCH_CACHE_SCHEMA,
         },
         'required': ['what', 'from'],
         'additionalProperties': False,
@@ -108,59 +159,160 @@ class Discover:
         :param task: Task being run
         :return: List of entries found from search engines listed under `from` configuration
         """
+        searches = []
+        for item in config['from']:
+            if isinstance(item, dict):
+                plugin_name, plugin_config = list(item.items())[0]
+            else:
+                plugin_name, plugin_config = item, None
+            search = plugin.get(plugin_name, self)
+            if not callable(getattr(search, 'search')):
+                logger.critical('Search plugin {} does not implement search method', plugin_name)
+                continue
+            searches.append((plugin_name, search, plugin_config))
+
+        cache = SearchCache(config['cache']) if config.get('cache') else None
+        if config.get('concurrency'):
+            entry_results = self.execute_concurrent_searches(
+                config, searches, entries, task, cache
+            )
+        else:
+            entry_results = (
+                self.search_entry(config, searches, entry, index, len(entries), task, cache=cache)
+                for index, entry in enumerate(entries)
+            )
 
         result = []
-        for index, entry in enumerate(entries):
-            entry_results = []
-            for item in config['from']:
-                if isinstance(item, dict):
-                    plugin_name, plugin_config = list(item.items())[0]
-                else:
-                    plugin_name, plugin_config = item, None
-                search = plugin.get(plugin_name, self)
-                if not callable(getattr(search, 'search')):
-                    logger.critical(
-                        'Search plugin {} does not implement search method', plugin_name
-                    )
-                    continue
-                logger.verbose(
-                    'Searching for `{}` with plugin `{}` ({} of {})',
-                    entry['title'],
-                    plugin_name,
-                    index + 1,
-                    len(entries),
-                )
-                try:
-                    search_results = search.search(task=task, entry=entry, config=plugin_config)
-                    if not search_results:
-                        logger.debug('No results from {}', plugin_name)
-                        continue
-                    if config.get('limit'):
-                        search_results = itertools.islice(search_results, config['limit'])
-                    # 'search_results' can be any iterable, make sure it's a list.
-                    search_results = list(search_results)
-                    logger.debug('Discovered {} entries from {}', len(search_results), plugin_name)
-                    for e in search_results:
-                        e['discovered_from'] = entry['title']
-                        e['discovered_with'] = plugin_name
-                        e.on_complete(
-                            self.entry_complete, query=entry, search_results=search_results
-                        )
-
-                    entry_results.extend(search_results)
-
-                except plugin.PluginWarning as e:
-                    logger.verbose('No results from {}: {}', plugin_name, e)
-                except plugin.PluginError as e:
-                    logger.error('Error searching with {}: {}', plugin_name, e)
-            if not entry_results:
+        for entry, search_results in zip(entries, entry_results):
+            if not search_results:
                 logger.verbose('No search results for `{}`', entry['title'])
                 entry.complete()
                 continue
-            result.extend(entry_results)
-
+            result.extend(search_results)
         return result
 
+    def execute_concurrent_searches(self, config, searches, entries, task, cache=None):
+        """
+        Searches for `entries` from several threads, limiting the searches running on (and started
+        on) each search plugin according to the `concurrency` config.
+
+        :return: List with the search results for each of `entries`
+        """
+        concurrency = config['concurrency']
+        limiters = {
+            plugin_name: SearchLimiter(concurrency['per_plugin'], concurrency['interval'])
+            for plugin_name, _, _ in searches
+        }
+        results = [None] * len(entries)
+        with ThreadPoolExecutor(
+            concurrency['searches'], thread_name_prefix='discover'
+        ) as executor:
+            futures = {
+                executor.submit(
+                    self.search_entry,
+                    config,
+                    searches,
+                    entry,
+                    index,
+                    len(entries),
+                    task,
+                    limiters,
+                    cache,
+                ): index
+                for index, entry in enumerate(entries)
+            }
+            for done, future in enumerate(as_completed(futures), start=1):
+                index = futures[future]
+                results[index] = future.result()
+                logger.debug(
+                    'Search for `{}` completed ({} of {})',
+                    entries[index]['title'],
+                    done,
+                    len(entries),
+                )
+        return results
+
+    def search_entry(self, config, searches, entry, index, total, task, limiters=None, cache=None):
+        """
+        Searches for `entry` with each of `searches` in turn, until `stop_after_results` results
+        have been found.
+
+        :param limiters: Optional dict of :class:`SearchLimiter` by search plugin name
+        :param cache: Optional :class:`SearchCache` to look up and store results in
+        :return: List of search results
+        """
+        entry_results = []
+        for plugin_name, search, plugin_config in searches:
+            if (
+                config.get('stop_after_results')
+                and len(entry_results) >= config['stop_after_results']
+            ):
+                logger.debug(
+                    'Found {} results for `{}`, not searching remaining plugins',
+                    len(entry_results),
+                    entry['title'],
+                )
+                break
+            logger.verbose(
+                'Searching for `{}` with plugin `{}` ({} of {})',
+                entry['title'],
+                plugin_name,
+                index + 1,
+                total,
+            )
+            try:
+                fetch = functools.partial(
+                    self.fetch_results,
+                    config,
+                    search,
+                    task,
+                    entry,
+                    plugin_config,
+                    limiters[plugin_name] if limiters else None,
+                )
+                if cache:
+                    # Results are cut to `limit`, which needs to be part of the cache key
+                    cache_config = plugin_config
+                    if config.get('limit'):
+                        cache_config = {'config': plugin_config, 'limit': config['limit']}
+                    search_results = cache.search(
+                        plugin_name, task, entry, fetch, config=cache_config
+                    )
+                else:
+                    search_results = fetch()
+                if not search_results:
+                    logger.debug('No results from {}', plugin_name)
+                    continue
+                logger.debug('Discovered {} entries from {}', len(search_results), plugin_name)
+                for e in search_results:
+                    e['discovered_from'] = entry['title']
+                    e['discovered_with'] = plugin_name
+                    e.on_complete(self.entry_complete, query=entry, search_results=search_results)
+
+                entry_results.extend(search_results)
+
+            except plugin.PluginWarning as e:
+                logger.verbose('No results from {}: {}', plugin_name, e)
+            except plugin.PluginError as e:
+                logger.error('Error searching with {}: {}', plugin_name, e)
+        return entry_results
+
+    def fetch_results(self, config, search, task, entry, plugin_config, limiter=None):
+        """Runs a search with `search` plugin, within `limiter` if given."""
+        # suppress() without exceptions is a no-op context, nullcontext needs python 3.7
+        with limiter or contextlib.suppress():
+            search_results = search.search(task=task, entry=entry, config=plugin_config)
+            return self.collect_results(config, search_results)
+
+    @staticmethod
+    def collect_results(config, search_results):
+        if not search_results:
+            return []
+        if config.get('limit'):
+            search_results = itertools.islice(search_results, config['limit'])
+        # 'search_results' can be any iterable, make sure it's a list.
+        return list(search_results)
+
     def entry_complete(self, entry, query=None, search_results=None, **kwargs):
         """Callback for Entry"""
         if entry.accepted:
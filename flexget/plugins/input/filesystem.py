@@ -9,6 +9,7 @@ from flexget import plugin
 from flexget.config_schema import one_or_more
 from flexget.entry import Entry
 from flexget.event import event
+from flexget.utils.tools import unique_entries
 
 logger = logger.bind(name='filesystem')
 
@@ -199,10 +200,10 @@ class Filesystem:
                                 "Path object's {} type doesn't match requested object types.",
                                 path_object,
                             )
-                        if entry and entry not in entries:
+                        if entry:
                             entries.append(entry)
 
-        return entries
+        return unique_entries(entries)
 
     def on_task_input(self, task, config):
         config = self.prepare_config(config)
@@ -3,6 +3,7 @@ import zlib
 from pathlib import Path
 from urllib import parse
 
+from bs4 import FeatureNotFound
 from jinja2 import Template
 from loguru import logger
 
@@ -10,7 +11,8 @@ from flexget import plugin
 from flexget.entry import Entry
 from flexget.event import event
 from flexget.utils.cached_input import cached
-from flexget.utils.soup import get_soup
+from flexget.utils.high_watermark import HighWatermark
+from flexget.utils.soup import PARSERS, fast_parser, get_soup
 
 logger = logger.bind(name='html')
 
@@ -26,6 +28,20 @@ class InputHtml:
 
     Note: This returns ALL links on url so you need to configure filters
     to match only to desired content.
+
+    With all_entries set to no, only the links added to the page since the previous run are
+    returned.
+
+    Pages are parsed with lxml when it is installed (html5lib otherwise), which can be changed
+    with the parser option. Only the links within the elements matching a CSS selector are
+    considered when selector is given.
+
+    Example::
+
+      html:
+        url: <url>
+        parser: html.parser
+        selector: table.torrents td.name
     """
 
     schema = {
@@ -40,6 +56,9 @@ class InputHtml:
                     'dump': {'type': 'string'},
                     'title_from': {'type': 'string'},
                     'allow_empty_links': {'type': 'boolean'},
+                    'all_entries': {'type': 'boolean'},
+                    'parser': {'type': 'string', 'enum': PARSERS},
+                    'selector': {'type': 'string'},
                     'links_re': {'type': 'array', 'items': {'type': 'string', 'format': 'regex'}},
                     'increment': {
                         'oneOf': [
@@ -88,7 +107,12 @@ class InputHtml:
     @plugin.internet(logger)
     def on_task_input(self, task, config):
         config = self.build_config(config)
+        entries = self.get_entries(task, config)
+        if config.get('all_entries', True):
+            return entries
+        return HighWatermark(task, 'html', config['url']).filter(entries or [])
 
+    def get_entries(self, task, config):
         auth = None
         if config.get('username') and config.get('password'):
             logger.debug(
@@ -141,7 +165,11 @@ class InputHtml:
         logger.verbose('Requesting: {}', url)
         page = task.requests.get(url, auth=auth)
         logger.verbose('Response: {} ({})', page.status_code, page.reason)
-        soup = get_soup(page.content)
+        parser = config.get('parser') or fast_parser()
+        try:
+            soup = get_soup(page.content, parser)
+        except FeatureNotFound:
+            raise plugin.PluginError('Parser %s is not installed' % parser)
 
         # dump received content into a file
         if dump_name:
@@ -174,19 +202,28 @@ class InputHtml:
             name = Path(parts.path).name
         return parse.unquote_plus(name)
 
+    @staticmethod
+    def _find_links(soup, config):
+        """Returns the links in the page, or within the elements matching `selector`"""
+        if not config.get('selector'):
+            return soup.find_all('a')
+        links = []
+        for element in soup.select(config['selector']):
+            if element.name == 'a':
+                links.append(element)
+            else:
+                links.extend(element.find_all('a'))
+        # An element and its ancestor may both match the selector
+        return list({id(link): link for link in links}.values())
+
     def create_entries(self, page_url, soup, config):
 
         queue = []
+        titles = set()
         duplicates = {}
         duplicate_limit = 4
 
-        def title_exists(title):
-            """Helper method. Return True if title is already added to entries"""
-            for entry in queue:
-                if entry['title'] == title:
-                    return True
-
-        for link in soup.find_all('a'):
+        for link in self._find_links(soup, config):
             # not a valid link
             if not link.has_attr('href'):
                 continue
@@ -232,7 +269,7 @@ class InputHtml:
                     continue
                 # automatic mode, check if title is unique
                 # if there are too many duplicate titles, switch to title_from: url
-                if title_exists(title):
+                if title in titles:
                     # ignore index links as a counter
                     if 'index' in title and len(title) < 10:
                         logger.debug('ignored index title {}', title)
@@ -274,13 +311,13 @@ class InputHtml:
             if title.lower().find('.torrent') > 0:
                 title = title[: title.lower().find('.torrent')]
 
-            if title_exists(title):
+            if title in titles:
                 # title link should be unique, add CRC32 to end if it's not
                 hash = zlib.crc32(url.encode("utf-8"))
                 crc32 = '%08X' % (hash & 0xFFFFFFFF)
                 title = '%s [%s]' % (title, crc32)
                 # truly duplicate, title + url crc already exists in queue
-                if title_exists(title):
+                if title in titles:
                     continue
                 logger.debug('uniqued title to {}', title)
 
@@ -292,6 +329,7 @@ class InputHtml:
                 entry['download_auth'] = (config['username'], config['password'])
 
             queue.append(entry)
+            titles.add(title)
 
         # add from queue to task
         return queue
@@ -8,6 +8,7 @@ from flexget import plugin
 from flexget.entry import Entry
 from flexget.event import event
 from flexget.utils import json
+from flexget.utils.high_watermark import HighWatermark
 
 logger = logger.bind(name='json')
 
@@ -27,6 +28,9 @@ class Json:
     this plugin asssumes that keys named 'title' and 'url' exist within the JSON.
     'encoding' defaults to 'utf-8'
 
+    With 'all_entries' set to no, only the items added to the file since the previous run are
+    returned.
+
     Example::
 
       json:
@@ -42,6 +46,7 @@ class Json:
             'file': {'type': 'string', 'format': 'file'},
             'encoding': {'type': 'string'},
             'field_map': {'type': 'object', 'additionalProperties': {'type': 'string'}},
+            'all_entries': {'type': 'boolean'},
         },
         'required': ['file'],
         'additionalProperties': False,
@@ -55,6 +60,12 @@ class Json:
             return val
 
     def on_task_input(self, task, config):
+        entries = self.entries_from_file(config)
+        if config.get('all_entries', True):
+            return entries
+        return HighWatermark(task, 'json', config['file']).filter(entries)
+
+    def entries_from_file(self, config):
         file = Path(config['file'])
         field_map = config.get('field_map', {})
         # Switch the field map to map from json to flexget fields
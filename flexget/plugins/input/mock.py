@@ -30,6 +30,7 @@ class Mock:
         },
     }
 
+    @plugin.no_session
     def on_task_input(self, task, config):
         entries = []
         for line in config:
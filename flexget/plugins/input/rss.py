@@ -5,6 +5,7 @@ import posixpath
 import xml.sax
 from datetime import datetime
 from urllib.parse import urlparse, urlsplit
+from xml.etree import ElementTree
 
 import dateutil.parser
 import feedparser
@@ -16,6 +17,7 @@ from flexget.config_schema import one_or_more
 from flexget.entry import Entry
 from flexget.event import event
 from flexget.utils.cached_input import cached
+from flexget.utils.high_watermark import HighWatermark
 from flexget.utils.pathscrub import pathscrub
 from flexget.utils.tools import decode_html
 
@@ -28,6 +30,115 @@ def fp_field_name(name):
     return name.replace(':', '_').lower()
 
 
+ATOM_NS = 'http://www.w3.org/2005/Atom'
+CONTENT_NS = 'http://purl.org/rss/1.0/modules/content/'
+# Chunk size used when reading streamed feeds
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def parse_date(value):
+    """Parses a feed date to a time tuple, the same way feedparser does with our date handler."""
+    try:
+        return dateutil.parser.parse(value).timetuple()
+    except (ValueError, OverflowError):
+        return None
+
+
+def parse_feed_item(element, prefixes):
+    """
+    Converts an RSS `item` or Atom `entry` element to the same structure feedparser produces for it.
+
+    Only the fields used by :class:`InputRSS` are filled in the feedparser way, other child
+    elements are added under their sanitized name (`prefix_name` for namespaced elements).
+
+    :param prefixes: Mapping from namespace uri to the prefix used for it in the document
+    """
+    # feedparser derives `enclosures` from the `links` with enclosure relation
+    item = {'links': []}
+    namespaced = {}
+    guid_link = None
+    for child in element:
+        if not isinstance(child.tag, str):
+            continue
+        namespace, name = '', child.tag
+        if name.startswith('{'):
+            namespace, _, name = name[1:].partition('}')
+        name = name.lower()
+        text = (child.text or '').strip()
+        if namespace == CONTENT_NS and name == 'encoded':
+            item.setdefault('content', []).append(feedparser.FeedParserDict(value=text))
+        elif namespace and namespace != ATOM_NS:
+            prefix = prefixes.get(namespace)
+            key = '%s_%s' % (prefix, name) if prefix else name
+            item[key] = text
+            namespaced.setdefault(name, text)
+        elif name == 'enclosure':
+            enclosure = feedparser.FeedParserDict(child.attrib, rel='enclosure')
+            if 'url' in enclosure:
+                enclosure['href'] = enclosure.pop('url')
+            item['links'].append(enclosure)
+        elif name == 'link' and 'href' in child.attrib:
+            # Atom links
+            link = feedparser.FeedParserDict(child.attrib)
+            link.setdefault('rel', 'alternate')
+            item['links'].append(link)
+            if link['rel'] == 'alternate':
+                item.setdefault('link', link['href'])
+        elif name in ('guid', 'id'):
+            item['id'] = text
+            if name == 'guid' and child.get('isPermaLink', 'true') == 'true':
+                guid_link = text
+        elif name in ('description', 'summary'):
+            item['summary'] = text
+        elif name in ('pubdate', 'published'):
+            item['published'] = text
+            item['published_parsed'] = parse_date(text)
+        elif name == 'updated':
+            item['updated'] = text
+            item['updated_parsed'] = parse_date(text)
+        elif name == 'author':
+            # Atom authors have the name in a child element
+            text = child.findtext('{%s}name' % ATOM_NS, text).strip()
+            item['author'] = text
+        else:
+            item[name] = text
+    for name, text in namespaced.items():
+        item.setdefault(name, text)
+    if guid_link and 'link' not in item:
+        item['link'] = guid_link
+    return feedparser.FeedParserDict(item)
+
+
+def iter_feed_items(chunks):
+    """
+    Incrementally parses an RSS or Atom feed, yielding its items as they are parsed.
+
+    The parsed elements are dropped as soon as they have been converted, so memory use does not
+    grow with the size of the feed.
+
+    :param chunks: Iterable of bytes, eg. `response.iter_content()`
+    :raises ElementTree.ParseError: If the feed is not valid XML
+    """
+    parser = ElementTree.XMLPullParser(events=('start', 'end', 'start-ns'))
+    prefixes = {}
+    parents = []
+    for chunk in chunks:
+        parser.feed(chunk)
+        for event_name, element in parser.read_events():
+            if event_name == 'start-ns':
+                prefix, uri = element
+                prefixes.setdefault(uri, prefix)
+            elif event_name == 'start':
+                parents.append(element)
+            else:
+                parents.pop()
+                if element.tag in ('item', '{%s}entry' % ATOM_NS) or element.tag.endswith('}item'):
+                    yield parse_feed_item(element, prefixes)
+                    if parents:
+                        parents[-1].remove(element)
+    parser.close()
+
+
 class InputRSS:
     """
     Parses RSS feed.
@@ -91,6 +202,18 @@ class InputRSS:
       rss:
         url: <url>
         group_links: yes
+
+    Very large feeds can be parsed while they are being downloaded, without keeping the whole feed
+    in memory, by setting stream to yes. Combined with all_entries: no, the download also stops at
+    the first item which was already seen on the previous run. This does not work together with
+    the ascii and escape options.
+
+    Example::
+
+      rss:
+        url: <url>
+        stream: yes
+        all_entries: no
     """
 
     schema = {
@@ -110,6 +233,7 @@ class InputRSS:
             'filename': {'type': 'boolean'},
             'group_links': {'type': 'boolean', 'default': False},
             'all_entries': {'type': 'boolean', 'default': True},
+            'stream': {'type': 'boolean'},
             'other_fields': {
                 'type': 'array',
                 'items': {
@@ -221,10 +345,36 @@ class InputRSS:
             entry['filename'] = basename
             logger.trace('filename `{}` from enclosure', entry['filename'])
 
+    def stream_items(self, task, config, chunks):
+        """Yields the items of a streamed feed, see :func:`iter_feed_items`."""
+        count = 0
+        try:
+            for count, item in enumerate(iter_feed_items(chunks), start=1):
+                yield item
+        except ElementTree.ParseError as e:
+            if not count:
+                if task.options.debug:
+                    logger.error('error parsing rss: {}', e)
+                raise plugin.PluginError(
+                    'Received invalid RSS content from task %s (%s)' % (task.name, config['url'])
+                )
+            msg = 'Error %s while parsing feed, but entries were produced, ignoring the error.' % e
+            if config.get('silent', False):
+                logger.debug(msg)
+            else:
+                logger.verbose(msg)
+
+    @staticmethod
+    def read_chunks(path):
+        with open(path, 'rb') as f:
+            yield from iter(lambda: f.read(STREAM_CHUNK_SIZE), b'')
+
     @cached('rss')
     @plugin.internet(logger)
     def on_task_input(self, task, config):
         config = self.build_config(config)
+        stream = config.get('stream') and not (config.get('ascii') or config.get('escape'))
+        response = None
 
         logger.debug('Requesting task `{}` url `{}`', task.name, config['url'])
 
@@ -266,9 +416,14 @@ class InputRSS:
             try:
                 # Use the raw response so feedparser can read the headers and status values
                 response = task.requests.get(
-                    config['url'], timeout=60, headers=headers, raise_status=False, auth=auth
+                    config['url'],
+                    timeout=60,
+                    headers=headers,
+                    raise_status=False,
+                    auth=auth,
+                    stream=stream,
                 )
-                content = response.content
+                content = None if stream else response.content
             except RequestException as e:
                 raise plugin.PluginError(
                     'Unable to download the RSS for task %s (%s): %s'
@@ -319,12 +474,28 @@ class InputRSS:
                     logger.debug('last modified {} saved for task {}', modified, task.name)
         else:
             # This is a file, open it
-            with open(config['url'], 'rb') as f:
-                content = f.read()
+            if stream:
+                content = None
+            else:
+                with open(config['url'], 'rb') as f:
+                    content = f.read()
             if config.get('ascii'):
                 # Just assuming utf-8 file in this case
                 content = content.decode('utf-8', 'ignore').encode('ascii', 'ignore')
 
+        if stream:
+            if response is not None:
+                chunks = response.iter_content(STREAM_CHUNK_SIZE)
+            else:
+                chunks = self.read_chunks(config['url'])
+            try:
+                return self.create_entries(
+                    task, config, url_hash, all_entries, self.stream_items(task, config, chunks)
+                )
+            finally:
+                if response is not None:
+                    response.close()
+
         if not content:
             logger.error('No data recieved for rss feed.')
             return []
@@ -382,7 +553,6 @@ class InputRSS:
 
         logger.debug('encoding {}', rss.encoding)
 
-        last_entry_id = ''
         if not all_entries:
             # Test to make sure entries are in descending order
             if (
@@ -393,10 +563,23 @@ class InputRSS:
                 if rss.entries[0]['published_parsed'] < rss.entries[-1]['published_parsed']:
                     # Sort them if they are not
                     rss.entries.sort(key=lambda x: x['published_parsed'], reverse=True)
+        return self.create_entries(task, config, url_hash, all_entries, rss.entries)
+
+    def create_entries(self, task, config, url_hash, all_entries, items):
+        """
+        Creates entries from the feedparser `items` of the feed, stopping at the last item seen on
+        the previous run unless `all_entries` is set.
+        """
+        last_entry_id = ''
+        last_pubdate = None
+        if not all_entries:
             last_entry_id = task.simple_persistence.get('%s_last_entry' % url_hash)
+            if config.get('stream'):
+                last_pubdate = task.simple_persistence.get('%s_last_pubdate' % url_hash)
 
         # new entries to be created
         entries = []
+        first_item = None
 
         # Dict with fields to grab mapping from rss field name to FlexGet field name
         fields = {
@@ -412,7 +595,9 @@ class InputRSS:
         # field name for url can be configured by setting link.
         # default value is auto but for example guid is used in some feeds
         ignored = 0
-        for entry in rss.entries:
+        for entry in items:
+            if first_item is None:
+                first_item = entry
 
             # Check if title field is overridden in config
             title_field = config.get('title', 'title')
@@ -431,6 +616,15 @@ class InputRSS:
                 # Let details plugin know that it is ok if this task doesn't produce any entries
                 task.no_entries_ok = True
                 break
+            # Streamed feeds are not sorted, they are expected to have the newest items first
+            if (
+                last_pubdate
+                and entry.get('published_parsed')
+                and datetime(*entry.published_parsed[:6]) < last_pubdate
+            ):
+                logger.verbose('Reached entries published before last run, not processing them.')
+                task.no_entries_ok = True
+                break
 
             # remove annoying zero width spaces
             entry.title = entry.title.replace('\u200B', '')
@@ -563,11 +757,11 @@ class InputRSS:
             add_entry(e)
 
         # Save last spot in rss
-        if rss.entries:
+        if first_item is not None:
             logger.debug('Saving location in rss feed.')
 
             try:
-                entry_id = rss.entries[0].title + rss.entries[0].get('guid', '')
+                entry_id = first_item.title + first_item.get('guid', '')
             except AttributeError:
                 entry_id = ''
 
@@ -577,6 +771,10 @@ class InputRSS:
                 logger.debug(
                     'rss feed location saving skipped: no title information in first entry'
                 )
+            if config.get('stream') and first_item.get('published_parsed'):
+                task.simple_persistence['%s_last_pubdate' % url_hash] = datetime(
+                    *first_item.published_parsed[:6]
+                )
 
         if ignored:
             if not config.get('silent'):
@@ -585,6 +783,9 @@ class InputRSS:
                     ignored,
                 )
 
+        if not all_entries:
+            # Catches the items the last entry check misses, when the feed is not sorted by date
+            entries = HighWatermark(task, 'rss', config['url']).filter(entries)
         return entries
 
 
@@ -4,19 +4,27 @@ from xml.etree import ElementTree
 from loguru import logger
 
 from flexget import plugin
+from flexget.components.sites.episode_batch import BATCH_SCHEMA, batch_search, is_episode
 from flexget.components.sites.utils import torrent_availability
 from flexget.entry import Entry
 from flexget.event import event
 from flexget.plugin import PluginError
 from flexget.utils.requests import RequestException
+from flexget.utils.tools import TimedDict
 
 logger = logger.bind(name='torznab')
 
+# Capabilities of the indexers, by caps url
+_caps = TimedDict('1 day')
+
 
 class Torznab:
     """Torznab search plugin
 
     Handles searching for tv shows and movies, with fallback to simple query strings if these are not available.
+
+    With `batch` set, episodes are searched for with `tvsearch` queries for their whole season
+    (`season`) or the latest releases of the indexer (`feed`), shared by all the wanted episodes.
     """
 
     @property
@@ -33,6 +41,7 @@ class Torznab:
                     'default': 'search',
                 },
                 'website': {'type': 'string', 'format': 'url'},
+                'batch': BATCH_SCHEMA,
             },
             'required': ['website', 'apikey'],
             'additionalProperties': False,
@@ -42,6 +51,8 @@ class Torznab:
     def search(self, task, entry, config=None):
         """Search interface"""
         self._setup(task, config)
+        if config.get('batch') and self.params['t'] == 'tvsearch' and is_episode(entry):
+            return self._batch_search(task, entry, config['batch'])
         params = {}
         if self.params['t'] == 'movie':
             params = self._convert_query_parameters(entry, ['imdbid'])
@@ -62,6 +73,19 @@ class Torznab:
             entries.extend(results)
         return entries
 
+    def _batch_search(self, task, entry, batch):
+        """Search for an episode with a query shared with the other episodes of the season"""
+        params = {}
+        if batch == 'season':
+            params = self._convert_query_parameters(
+                entry, ['rid', 'tvdbid', 'traktid', 'tvmazeid', 'imdbid', 'tmdbid', 'season']
+            )
+            params.setdefault('q', entry['series_name'])
+        url = self._build_url(**params)
+        return batch_search(
+            ('torznab', url), lambda: self.create_entries_from_query(url, task), entry
+        )
+
     def _build_url(self, **kwargs):
         """Builds the url with query parameters from the arguments"""
         params = self.params.copy()
@@ -87,9 +111,13 @@ class Torznab:
     def _setup_caps(self, task, searcher, categories):
         """Gets the capabilities of the torznab indexer and matches it with the provided configuration"""
 
-        response = task.requests.get(self._build_url(t='caps'))
-        logger.debug('Raw caps response {}', response.content)
-        root = ElementTree.fromstring(response.content)
+        url = self._build_url(t='caps')
+        root = _caps.get(url)
+        if root is None:
+            response = task.requests.get(url)
+            logger.debug('Raw caps response {}', response.content)
+            root = ElementTree.fromstring(response.content)
+            _caps[url] = root
         self._setup_searcher(root, searcher, categories)
 
     def _setup_searcher(self, xml_root, searcher, categories):
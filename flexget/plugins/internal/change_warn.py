@@ -18,6 +18,7 @@ class ChangeWarn:
         Contains ugly hacks, better to include all deprecation warnings here during 1.0 BETA phase
     """
 
+    @plugin.no_session
     def on_task_start(self, task, config):
         global found_deprecated
 
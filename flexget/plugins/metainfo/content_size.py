@@ -23,6 +23,7 @@ class MetainfoContentSize:
 
     schema = {'type': 'boolean', 'default': False}
 
+    @plugin.no_session
     def on_task_metainfo(self, task, config):
         # check if disabled (value set to false)
         if config is False:
@@ -14,6 +14,7 @@ class MetainfoMediaId(object):
     schema = {'type': 'boolean'}
 
     @plugin.priority(0)  # run after other metainfo plugins
+    @plugin.no_session
     def on_task_metainfo(self, task, config):
         # Don't run if we are disabled
         if config is False:
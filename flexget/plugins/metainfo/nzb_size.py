@@ -17,6 +17,7 @@ class NzbSize:
     """
 
     @plugin.priority(200)
+    @plugin.no_session
     def on_task_modify(self, task, config):
         """
         The downloaded file is accessible in modify phase
@@ -17,6 +17,7 @@ class MetainfoQuality:
     schema = {'type': 'boolean'}
 
     @plugin.priority(127)  # Run after other plugins that might fill quality (series)
+    @plugin.no_session
     def on_task_metainfo(self, task, config):
         # check if disabled (value set to false)
         if config is False:
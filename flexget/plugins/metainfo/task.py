@@ -13,6 +13,7 @@ class MetainfoTask:
 
     schema = {'type': 'boolean'}
 
+    @plugin.no_session
     def on_task_metainfo(self, task, config):
         # check if explicitly disabled (value set to false)
         if config is False:
@@ -33,6 +33,7 @@ class PluginPriority:
                 logger.debug('stored {} original value {}', phase, phase_event.priority)
                 phase_event.priority = priority
                 logger.debug('set {} new value {}', phase, priority)
+        plugin.invalidate_phase_plans()
         logger.debug('Changed priority for: {}', ', '.join(names))
 
     def on_task_exit(self, task, config):
@@ -45,6 +46,7 @@ class PluginPriority:
             originals = self.priorities[name]
             for phase, priority in originals.items():
                 plugin.plugins[name].phase_handlers[phase].priority = priority
+        plugin.invalidate_phase_plans()
         logger.debug('Restored priority for: {}', ', '.join(names))
         self.priorities = {}
 
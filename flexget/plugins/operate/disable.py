@@ -40,6 +40,7 @@ class DisablePlugin:
     disabled_builtins = None
 
     @plugin.priority(254)
+    @plugin.no_session
     def on_task_start(self, task, config):
         disabled = set()
 
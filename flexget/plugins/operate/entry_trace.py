@@ -27,6 +27,7 @@ class EntryOperations:
     """
 
     @plugin.priority(plugin.PRIORITY_LAST)
+    @plugin.no_session
     def on_task_input(self, task, config):
         for entry in task.all_entries:
             entry.on_accept(on_entry_action, act='accepted', task=task)
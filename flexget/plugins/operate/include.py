@@ -26,6 +26,7 @@ class PluginInclude:
     schema = one_or_more({'type': 'string'})
 
     @plugin.priority(256)
+    @plugin.no_session
     def on_task_prepare(self, task, config):
         if not config:
             return
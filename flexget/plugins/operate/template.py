@@ -58,6 +58,7 @@ class PluginTemplate:
         return config
 
     @plugin.priority(257)
+    @plugin.no_session
     def on_task_prepare(self, task, config):
         if config is False:  # handles 'template: no' form to turn off template on this task
             return
@@ -16,6 +16,7 @@ class Verbose:
 
     # Run first thing after input phase
     @plugin.priority(plugin.PRIORITY_FIRST)
+    @plugin.no_session
     def on_task_metainfo(self, task, config):
         if task.options.silent:
             return
@@ -31,6 +32,7 @@ class Verbose:
             msg = f'{msg} because {reason[0].lower() + reason[1:]}'
         task_logger.opt(colors=True).verbose(f"{act.log_markup}: {{}}", msg)
 
+    @plugin.no_session
     def on_task_exit(self, task, config):
         if task.options.silent:
             return
@@ -38,7 +40,7 @@ class Verbose:
         if task.options.verbose:
             undecided = False
             for entry in task.entries:
-                if entry in task.accepted:
+                if entry.accepted:
                     continue
                 undecided = True
                 logger.verbose('UNDECIDED: `{}`', entry['title'])
@@ -7,11 +7,13 @@ logger = logger.bind(name='details')
 
 
 class PluginDetails:
+    @plugin.no_session
     def on_task_start(self, task, config):
         # Make a flag for tasks to declare if it is ok not to produce entries
         task.no_entries_ok = False
 
     @plugin.priority(-512)
+    @plugin.no_session
     def on_task_input(self, task, config):
         if not task.entries:
             if task.no_entries_ok:
@@ -25,6 +27,7 @@ class PluginDetails:
             logger.verbose('Produced {} entries.', len(task.entries))
 
     @plugin.priority(-512)
+    @plugin.no_session
     def on_task_download(self, task, config):
         # Needs to happen as the first in download, so it runs after urlrewrites
         # and IMDB queue acceptance.
@@ -44,6 +47,7 @@ class NoEntriesOk:
 
     # Run after details plugin task_start
     @plugin.priority(127)
+    @plugin.no_session
     def on_task_start(self, task, config):
         task.no_entries_ok = config
 
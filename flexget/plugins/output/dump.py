@@ -75,6 +75,7 @@ class OutputDump:
     schema = {'type': 'boolean'}
 
     @plugin.priority(0)
+    @plugin.no_session
     def on_task_output(self, task, config):
         if not config and task.options.dump_entries is None:
             return
@@ -5,6 +5,7 @@ from loguru import logger
 from flexget import options, plugin
 from flexget.event import event
 from flexget.terminal import console
+from flexget.utils.copy_on_write import thaw
 
 logger = logger.bind(name='dump_config')
 
@@ -15,12 +16,13 @@ class OutputDumpConfig:
     """
 
     @plugin.priority(plugin.PRIORITY_LAST)
+    @plugin.no_session
     def on_task_start(self, task, config):
         if task.options.dump_config:
             import yaml
 
             console('--- config from task: %s' % task.name)
-            console(yaml.safe_dump(task.config))
+            console(yaml.safe_dump(thaw(task.config)))
             console('---')
             task.abort(silent=True)
         if task.options.dump_config_python:
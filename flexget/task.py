@@ -1,3 +1,4 @@
+import collections
 import contextlib
 import copy
 import inspect
@@ -5,6 +6,7 @@ import itertools
 import random
 import string
 import threading
+import weakref
 from functools import total_ordering, wraps
 from typing import Iterable, List, Union, Optional, TYPE_CHECKING
 
@@ -20,7 +22,7 @@ from flexget.plugin import (
     DependencyError,
     PluginError,
     PluginWarning,
-    get_plugins,
+    get_phase_plugins,
     phase_methods,
     plugin_schemas,
 )
@@ -28,7 +30,9 @@ from flexget.plugin import plugins as all_plugins
 from flexget.plugin import task_phases
 from flexget.terminal import capture_console
 from flexget.utils import requests
+from flexget.utils.copy_on_write import CowDict, freeze
 from flexget.utils.database import with_session
+from flexget.utils.entry_batch import EntryBatch
 from flexget.utils.simple_persistence import SimpleTaskPersistence
 from flexget.utils.sqlalchemy_utils import ContextSession
 from flexget.utils.template import FlexGetTemplate, render_from_task
@@ -96,15 +100,26 @@ class EntryIterator:
         self.all_entries = entries
         if isinstance(states, EntryState):
             states = [states]
-        self.filter = lambda e: e._state in states
+        self.states = frozenset(states)
+        self.filter = lambda e: e._state in self.states
+
+    @property
+    def _indexed(self) -> bool:
+        return isinstance(self.all_entries, EntryContainer) and self.all_entries._indexed
 
     def __iter__(self) -> Iterable[Entry]:
+        if self._indexed:
+            return self.all_entries._iter_states(self.states)
         return filter(self.filter, self.all_entries)
 
     def __bool__(self):
+        if self._indexed:
+            return self.all_entries._count_states(self.states) > 0
         return any(e for e in self)
 
     def __len__(self):
+        if self._indexed:
+            return self.all_entries._count_states(self.states)
         return sum(1 for _e in self)
 
     def __add__(self, other):
@@ -124,6 +139,10 @@ class EntryIterator:
         else:
             raise IndexError(f'{item} is out of bounds')
 
+    def batch(self) -> EntryBatch:
+        """Returns a columnar view of the entries, see :mod:`flexget.utils.entry_batch`."""
+        return EntryBatch(self)
+
     def reverse(self):
         self.all_entries.sort(reverse=True)
 
@@ -132,10 +151,17 @@ class EntryIterator:
 
 
 class EntryContainer(list):
-    """Container for a list of entries, also contains accepted, rejected failed iterators over them."""
+    """
+    Container for a list of entries, also contains accepted, rejected failed iterators over them.
+
+    The entries of each state are indexed, and the index is kept up to date by the entries when
+    they are accepted, rejected or failed, so counting the entries in a state is O(1) and iterating
+    over them only visits those. Iteration order is the order of the list, as if it was filtered.
+    """
 
     def __init__(self, iterable: list = None):
         list.__init__(self, iterable or [])
+        self._reindex()
 
         self._entries = EntryIterator(self, [EntryState.UNDECIDED, EntryState.ACCEPTED])
         self._accepted = EntryIterator(
@@ -157,6 +183,152 @@ class EntryContainer(list):
     def __repr__(self) -> str:
         return f'<EntryContainer({list.__repr__(self)})>'
 
+    # State index
+
+    def _reindex(self) -> None:
+        # Entries are identified by id(), Entry equality and hash are based on their title and url
+        self._positions = {}
+        self._states = {state: {} for state in EntryState}
+        self._transitions = []
+        self._indexed = True
+        for entry in self:
+            self._add_to_index(entry)
+
+    def _add_to_index(self, entry) -> None:
+        if not self._indexed:
+            return
+        if not isinstance(entry, Entry) or id(entry) in self._positions:
+            # Duplicates (or anything but entries) can't be indexed, filter the list instead
+            self._indexed = False
+            return
+        self._positions[id(entry)] = len(self._positions)
+        self._states[entry._state][id(entry)] = entry
+        if not any(ref() is self for ref in entry._containers):
+            entry._containers = entry._containers + (weakref.ref(self),)
+
+    def _is_member(self, entry) -> bool:
+        position = self._positions.get(id(entry))
+        return position is not None and list.__getitem__(self, position) is entry
+
+    def _state_changed(self, entry: Entry, old_state: EntryState) -> None:
+        """Called by `entry` when its state changes."""
+        if not self._indexed or not self._is_member(entry):
+            return
+        self._states[old_state].pop(id(entry), None)
+        self._states[entry._state][id(entry)] = entry
+        self._transitions.append(entry)
+
+    def _count_states(self, states: Iterable[EntryState]) -> int:
+        return sum(len(self._states[state]) for state in states)
+
+    def _iter_states(self, states: frozenset) -> Iterable[Entry]:
+        """
+        Yields the entries in `states` in list order. Like filtering a list iterator, entries
+        changing state during the iteration are yielded if they are in `states` once reached.
+        """
+        positions = self._positions
+        pending = [
+            (positions[entry_id], entry)
+            for state in states
+            for entry_id, entry in self._states[state].items()
+        ]
+        pending.sort(key=lambda item: item[0])
+        pending = collections.deque(pending)
+        transitions = self._transitions
+        seen_transitions = len(transitions)
+        length = len(positions)
+        position = -1
+        while True:
+            if self._positions is not positions or not self._indexed:
+                # The list was changed structurally, continue as a list iterator would
+                for entry in self[position + 1 :]:
+                    if entry._state in states:
+                        yield entry
+                return
+            if len(positions) > length:
+                # Appended entries come after all the pending ones
+                pending.extend(
+                    (length + offset, entry)
+                    for offset, entry in enumerate(self[length:])
+                    if entry._state in states
+                )
+                length = len(positions)
+            if len(transitions) > seen_transitions:
+                # Entries which entered `states` after the current position must still be reached
+                entered = [
+                    (positions[id(entry)], entry)
+                    for entry in transitions[seen_transitions:]
+                    if entry._state in states and positions[id(entry)] > position
+                ]
+                seen_transitions = len(transitions)
+                if entered:
+                    merged = {id(entry): (pos, entry) for pos, entry in pending}
+                    merged.update((id(entry), (pos, entry)) for pos, entry in entered)
+                    pending = collections.deque(sorted(merged.values(), key=lambda i: i[0]))
+            if not pending:
+                return
+            position, entry = pending.popleft()
+            if entry._state in states:
+                yield entry
+
+    # List mutations keep the index up to date, appending incrementally and reindexing otherwise
+
+    def append(self, entry) -> None:
+        list.append(self, entry)
+        self._add_to_index(entry)
+
+    def extend(self, entries) -> None:
+        entries = list(entries)
+        list.extend(self, entries)
+        for entry in entries:
+            self._add_to_index(entry)
+
+    def __iadd__(self, entries):
+        self.extend(entries)
+        return self
+
+    def insert(self, index, entry) -> None:
+        list.insert(self, index, entry)
+        self._reindex()
+
+    def remove(self, entry) -> None:
+        list.remove(self, entry)
+        self._reindex()
+
+    def pop(self, index=-1):
+        entry = list.pop(self, index)
+        self._reindex()
+        return entry
+
+    def clear(self) -> None:
+        list.clear(self)
+        self._reindex()
+
+    def sort(self, *args, **kwargs) -> None:
+        list.sort(self, *args, **kwargs)
+        self._reindex()
+
+    def reverse(self) -> None:
+        list.reverse(self)
+        self._reindex()
+
+    def __setitem__(self, index, value) -> None:
+        list.__setitem__(self, index, value)
+        self._reindex()
+
+    def __delitem__(self, index) -> None:
+        list.__delitem__(self, index)
+        self._reindex()
+
+    def __imul__(self, count):
+        list.__imul__(self, count)
+        self._reindex()
+        return self
+
+    def __reduce__(self):
+        # Copies are indexed from scratch, the index is keyed by the ids of the entries
+        return self.__class__, (list(self),)
+
 
 class TaskAbort(Exception):
     def __init__(self, reason: str, silent: bool = False) -> None:
@@ -233,7 +405,9 @@ class Task:
         self.manager = manager
         if config is None:
             config = manager.config['tasks'].get(name, {})
-        self.config = copy.deepcopy(config)
+        # Frozen (copied) once here, then shared by the prepared config, reruns and task copies,
+        # which only copy the parts of it which are read
+        self.config = CowDict(freeze(config))
         self.prepared_config = None
         if options is None:
             options = copy.copy(self.manager.options.execute)
@@ -449,12 +623,8 @@ class Task:
           An iterator over configured :class:`flexget.plugin.PluginInfo` instances enabled on this task.
         """
         if phase:
-            plugins = sorted(
-                get_plugins(phase=phase), key=lambda p: p.phase_handlers[phase], reverse=True
-            )
-        else:
-            plugins = iter(all_plugins.values())
-        return (p for p in plugins if p.name in self.config or p.builtin)
+            return iter(get_phase_plugins(phase, self.config))
+        return (p for p in all_plugins.values() if p.name in self.config or p.builtin)
 
     def __run_task_phase(self, phase):
         """Executes task phase, ie. call all enabled plugins on the task.
@@ -507,7 +677,12 @@ class Task:
                 args = (self, copy.copy(self.config.get(plugin.name)))
 
             # Hack to make task.session only active for a single plugin
-            with Session() as session:
+            if getattr(plugin.phase_handlers[phase].func, 'no_session', False):
+                # No-op context, contextlib.nullcontext needs python 3.7
+                session_context = contextlib.suppress()
+            else:
+                session_context = Session()
+            with session_context as session:
                 self.session = session
                 try:
                     fire_event('task.execute.before_plugin', self, plugin.name)
@@ -626,11 +801,11 @@ class Task:
         Checks the task's config hash and updates the hash if necessary.
         """
         # Save current config hash and set config_modified flag
-        config_hash = get_config_hash(self.config)
+        config_hash = get_config_hash(freeze(self.config))
         if self.is_rerun:
             # Restore the config to state right after start phase
             if self.prepared_config:
-                self.config = copy.deepcopy(self.prepared_config)
+                self.config = CowDict(self.prepared_config)
             else:
                 logger.error('BUG: No prepared_config on rerun, please report.')
         with Session() as session:
@@ -688,7 +863,7 @@ class Task:
                     self.__run_task_phase(phase)
                     if phase == 'start':
                         # Store a copy of the config state after start phase to restore for reruns
-                        self.prepared_config = copy.deepcopy(self.config)
+                        self.prepared_config = freeze(self.config)
         except TaskAbort:
             try:
                 self.__run_task_phase('abort')
@@ -754,7 +929,7 @@ class Task:
         new.__dict__.update(self.__dict__)
         # Some mutable objects need to be copies
         new.options = copy.copy(self.options)
-        new.config = copy.deepcopy(self.config)
+        new.config = CowDict(freeze(self.config))
         return new
 
     copy = __copy__
@@ -1,5 +1,10 @@
+from unittest import mock
+
+from flexget.api.app import response_cache
+from flexget.components.managed_lists.lists.movie_list import db
+from flexget.components.managed_lists.lists.movie_list.api import MOVIE_LIST_TABLES
 from flexget.components.managed_lists.lists.movie_list.api import ObjectsContainer as OC
-from flexget.utils import json
+from flexget.utils import change_tracking, json
 
 
 class TestETAG:
@@ -59,3 +64,28 @@ class TestETAG:
 
         # Verify all 3 lists are received as payload
         assert len(data) == 3
+
+    def test_response_cache(self, api_client):
+        response_cache.clear()
+        rsp = api_client.json_post('/movie_list/', data=json.dumps({'name': 'list_1'}))
+        assert rsp.status_code == 201, 'Response code is %s' % rsp.status_code
+
+        rsp = api_client.get('/movie_list/')
+        assert rsp.status_code == 200, 'Response code is %s' % rsp.status_code
+        etag = rsp.headers['etag']
+        assert len(response_cache._responses) == 1
+
+        # Served from the cache while the lists don't change
+        versions = change_tracking.versions(MOVIE_LIST_TABLES)
+        with mock.patch.object(db, 'get_movie_lists') as get_movie_lists:
+            rsp = api_client.get('/movie_list/')
+        assert not get_movie_lists.called
+        assert rsp.headers['etag'] == etag
+
+        rsp = api_client.json_post('/movie_list/', data=json.dumps({'name': 'list_2'}))
+        assert rsp.status_code == 201, 'Response code is %s' % rsp.status_code
+        assert change_tracking.versions(MOVIE_LIST_TABLES) != versions
+
+        rsp = api_client.get('/movie_list/')
+        assert rsp.headers['etag'] != etag
+        assert len(json.loads(rsp.get_data(as_text=True))) == 2
@@ -0,0 +1,62 @@
+from flexget.utils.event_bus import Subscription, bus
+
+
+def read_events(stream, count):
+    events = []
+    while len(events) < count:
+        chunk = next(stream)
+        chunk = chunk.decode() if isinstance(chunk, bytes) else chunk
+        if chunk.startswith(':'):
+            continue
+        lines = dict(line.split(': ', 1) for line in chunk.strip().split('\n'))
+        events.append(lines)
+    return events
+
+
+class TestEventsAPI:
+    config = """
+        tasks:
+          test:
+            mock:
+              - {title: 'entry 1'}
+            accept_all: yes
+          other:
+            mock:
+              - {title: 'entry 2'}
+    """
+
+    def test_stream(self, api_client, execute_task):
+        rsp = api_client.get(
+            '/events/?task=test&type=task_started&type=entry_state&type=task_finished'
+        )
+        assert rsp.status_code == 200, 'Response code is %s' % rsp.status_code
+        assert rsp.mimetype == 'text/event-stream'
+        assert bus.has_subscribers
+
+        execute_task('other')
+        execute_task('test')
+        events = read_events(iter(rsp.response), 3)
+        assert [e['event'] for e in events] == ['task_started', 'entry_state', 'task_finished']
+        assert '"entry 1"' in events[1]['data']
+        assert '"accepted": 1' in events[2]['data']
+
+        rsp.close()
+        assert not bus.has_subscribers
+
+    def test_bounded_buffer(self):
+        subscription = Subscription(buffer_size=2)
+        for i in range(5):
+            subscription.put({'id': i, 'type': 'task_started', 'data': {}})
+        items = subscription.get(timeout=0)
+        assert items[0] == {'type': 'dropped', 'data': {'count': 3}}
+        assert [item['id'] for item in items[1:]] == [3, 4]
+        assert subscription.get(timeout=0) == []
+
+    def test_log_level(self):
+        subscription = bus.subscribe(types=['log'], level='warning')
+        try:
+            bus.publish('log', task=None, level='INFO', level_no=20, message='info')
+            bus.publish('log', task=None, level='ERROR', level_no=40, message='error')
+        finally:
+            bus.unsubscribe(subscription)
+        assert [item['data']['message'] for item in subscription.get(timeout=0)] == ['error']
@@ -1,3 +1,5 @@
+from datetime import datetime
+
 import pytest
 
 from flexget.api.app import base_message
@@ -197,6 +199,71 @@ class TestSeriesRootAPI:
 
         assert len(data) == 1
 
+    def test_series_cursor(self, api_client, schema_match):
+        with Session() as session:
+            for i in range(5):
+                series = Series()
+                series.name = 'test series %s' % i
+                series.in_tasks = [SeriesTask('test task')]
+                session.add(series)
+                episode = Episode()
+                episode.identifier = 'S01E0%s' % (i + 1)
+                episode.identified_by = 'ep'
+                episode.season = 1
+                episode.number = i + 1
+                series.episodes.append(episode)
+                release = EpisodeRelease()
+                release.title = 'test series %s S01E0%s' % (i, i + 1)
+                release.downloaded = True
+                # Newest releases for the first shows by name
+                release.first_seen = datetime(2020, 1, 10 - i)
+                episode.releases = [release]
+
+        for sort in ('sort_by=show_name&order=asc', 'sort_by=last_download_date&order=desc'):
+            rsp = api_client.get('/series/?per_page=5&' + sort)
+            expected = [show['name'] for show in json.loads(rsp.get_data(as_text=True))]
+
+            names = []
+            url = '/series/?per_page=2&' + sort
+            while True:
+                rsp = api_client.get(url)
+                assert rsp.status_code == 200, 'Response code is %s' % rsp.status_code
+                data = json.loads(rsp.get_data(as_text=True))
+                errors = schema_match(OC.series_list_schema, data)
+                assert not errors
+                names.extend(show['name'] for show in data)
+                if 'Next-Cursor' not in rsp.headers:
+                    break
+                url = '/series/?per_page=2&%s&cursor=%s' % (sort, rsp.headers['Next-Cursor'])
+            assert names == expected
+        assert names == ['test series %s' % i for i in range(5)]
+        assert data[0]['latest_entity']['identifier'] == 'S01E05'
+
+        # Series without releases are sorted first by date
+        with Session() as session:
+            for i in range(3):
+                series = Series()
+                series.name = 'new series %s' % i
+                series.in_tasks = [SeriesTask('test task')]
+                session.add(series)
+        names = []
+        url = '/series/?per_page=2&sort_by=last_download_date&order=asc'
+        while True:
+            rsp = api_client.get(url)
+            assert rsp.status_code == 200, 'Response code is %s' % rsp.status_code
+            names.extend(show['name'] for show in json.loads(rsp.get_data(as_text=True)))
+            if 'Next-Cursor' not in rsp.headers:
+                break
+            url = '/series/?per_page=2&sort_by=last_download_date&order=asc&cursor=%s' % (
+                rsp.headers['Next-Cursor']
+            )
+        assert names == ['new series %s' % i for i in range(3)] + [
+            'test series %s' % i for i in reversed(range(5))
+        ]
+
+        rsp = api_client.get('/series/?sort_by=show_name&cursor=bla')
+        assert rsp.status_code == 400, 'Response code is %s' % rsp.status_code
+
     @pytest.mark.online
     def test_series_lookup_param(self, api_client, schema_match):
         # Add two real shows
@@ -0,0 +1,100 @@
+"""
+Benchmarks of the hot paths, run with `pytest flexget/tests/benchmarks --run-benchmarks`.
+
+Results can be saved with `--benchmarks-save results.json`, and a later run given
+`--benchmarks-compare results.json` fails the benchmarks which got slower by more than
+`--benchmarks-threshold`. Don't run them with xdist, parallel runs skew the timings.
+"""
+import json
+import platform
+import statistics
+import time
+from datetime import datetime
+
+import pytest
+
+from flexget import __version__
+
+
+@pytest.fixture(scope='session')
+def benchmark_results(pytestconfig):
+    compare_path = pytestconfig.getoption('benchmarks_compare')
+    previous = {}
+    if compare_path:
+        with open(compare_path) as f:
+            previous = json.load(f)['benchmarks']
+    results = {}
+    yield previous, results
+    save_path = pytestconfig.getoption('benchmarks_save')
+    if save_path and results:
+        with open(save_path, 'w') as f:
+            json.dump(
+                {
+                    'time': datetime.now().isoformat(),
+                    'flexget': __version__,
+                    'python': platform.python_version(),
+                    'machine': platform.platform(),
+                    'benchmarks': results,
+                },
+                f,
+                indent=2,
+            )
+
+
+def pytest_terminal_summary(terminalreporter):
+    """Reports the timings recorded by the :func:`benchmark` fixture, which are not captured."""
+    timings = [
+        (report.nodeid, dict(report.user_properties))
+        for state in ('passed', 'failed')
+        for report in terminalreporter.stats.get(state, [])
+        if report.when == 'call'
+    ]
+    timings = [
+        (nodeid, properties) for nodeid, properties in timings if 'benchmark_min' in properties
+    ]
+    if not timings:
+        return
+    terminalreporter.write_sep('=', 'benchmarks')
+    for nodeid, properties in timings:
+        terminalreporter.write_line(
+            '%s: min %.4f s, median %.4f s'
+            % (nodeid, properties['benchmark_min'], properties['benchmark_median'])
+        )
+
+
+@pytest.fixture()
+def benchmark(request, record_property, benchmark_results):
+    """
+    Runs a function a number of times, records its timings, and returns its last result::
+
+        parsed = benchmark(parse_all, titles, rounds=3)
+    """
+    previous, results = benchmark_results
+    threshold = request.config.getoption('benchmarks_threshold')
+
+    def run(func, *args, rounds=5, **kwargs):
+        timings = []
+        result = None
+        for _ in range(rounds):
+            start = time.perf_counter()
+            result = func(*args, **kwargs)
+            timings.append(time.perf_counter() - start)
+        name = request.node.name
+        results[name] = {
+            'min': min(timings),
+            'median': statistics.median(timings),
+            'mean': statistics.mean(timings),
+            'rounds': rounds,
+        }
+        record_property('benchmark_min', results[name]['min'])
+        record_property('benchmark_median', results[name]['median'])
+        if name in previous:
+            baseline = previous[name]['min']
+            if min(timings) > baseline * (1 + threshold):
+                pytest.fail(
+                    '%s regressed: %.4f s, was %.4f s' % (name, min(timings), baseline),
+                    pytrace=False,
+                )
+        return result
+
+    return run
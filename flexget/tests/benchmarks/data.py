@@ -0,0 +1,27 @@
+"""Synthetic data for the benchmarks, generated instead of stored so its size can be changed."""
+from datetime import datetime, timedelta
+from email.utils import format_datetime
+from xml.sax.saxutils import escape
+
+from flexget.plugins.cli import generate_db
+
+
+def release_titles(count, shows=200, seed=0):
+    return list(generate_db.release_titles(count, shows, seed))
+
+
+def rss_feed(count, shows=200):
+    """Returns an RSS document with `count` items."""
+    now = datetime.now().astimezone()
+    items = []
+    for index, title in enumerate(release_titles(count, shows)):
+        items.append(
+            '<item><title>%s</title><link>http://example.com/%s.torrent</link>'
+            '<guid>http://example.com/%s</guid><pubDate>%s</pubDate></item>'
+            % (escape(title), index, index, format_datetime(now - timedelta(minutes=index)))
+        )
+    return (
+        '<?xml version="1.0" encoding="utf-8"?><rss version="2.0"><channel>'
+        '<title>Benchmark</title><link>http://example.com/</link>%s</channel></rss>'
+        % ''.join(items)
+    )
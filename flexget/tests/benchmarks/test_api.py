@@ -0,0 +1,50 @@
+import pytest
+
+from flexget.api.app import response_cache
+from flexget.manager import Session
+from flexget.plugins.cli.generate_db import populate_seen, populate_series
+
+pytestmark = pytest.mark.benchmark
+
+SERIES_COUNT = 2000
+SEEN_COUNT = 50000
+
+
+class TestDatabaseApi:
+    config = """
+        tasks: {}
+    """
+
+    @pytest.fixture()
+    def large_database(self, manager):
+        with Session() as session:
+            populate_series(session, SERIES_COUNT)
+            populate_seen(session, SEEN_COUNT)
+
+    @pytest.fixture()
+    def get(self, api_client):
+        def uncached_get(url):
+            # Measures the queries rather than the ETag response cache
+            response_cache.clear()
+            return api_client.get(url)
+
+        return uncached_get
+
+    @pytest.mark.parametrize('sort_by', ['show_name', 'last_download_date'])
+    def test_series_list(self, large_database, get, benchmark, sort_by):
+        url = '/series/?in_config=all&per_page=100&page=5&sort_by=%s' % sort_by
+        response = benchmark(get, url)
+        assert response.status_code == 200
+        assert response.headers['total-count'] == str(SERIES_COUNT)
+
+    def test_series_episodes(self, large_database, get, benchmark):
+        response = benchmark(get, '/series/%s/episodes/' % (SERIES_COUNT // 2))
+        assert response.status_code == 200
+
+    def test_seen_list(self, large_database, get, benchmark):
+        response = benchmark(get, '/seen/?per_page=100&page=100')
+        assert response.status_code == 200
+
+    def test_seen_search(self, large_database, get, benchmark):
+        response = benchmark(get, '/seen/?value=%25Number.1%25&per_page=100')
+        assert response.status_code == 200
@@ -0,0 +1,51 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+import flexget
+from flexget.plugins.cli.generate_db import show_names
+
+pytestmark = pytest.mark.benchmark
+
+TASK_COUNT = 200
+
+
+def large_config():
+    tasks = {
+        'task %s'
+        % index: {
+            'template': ['tv'],
+            'rss': 'http://example.com/feed/%s' % index,
+            'series': show_names(20),
+            'regexp': {'reject': ['(?i)\\bcam\\b', 'subbed']},
+        }
+        for index in range(TASK_COUNT)
+    }
+    templates = {'tv': {'quality': '720p+', 'download': '/tmp', 'seen': 'local'}}
+    return {'templates': templates, 'tasks': tasks}
+
+
+class TestConfig:
+    config = """
+        tasks: {}
+    """
+
+    def test_config_validation(self, manager, benchmark):
+        rounds = 3
+        # Validation may change the config, each round gets its own copy
+        configs = iter([large_config() for _ in range(rounds)])
+        config = benchmark(lambda: manager.validate_config(next(configs)), rounds=rounds)
+        assert len(config['tasks']) == TASK_COUNT
+
+
+def test_plugin_loading(benchmark):
+    # Plugins can only be loaded once in a process, so they are loaded in a fresh one
+    command = [
+        sys.executable,
+        '-c',
+        'from flexget import plugin; plugin.load_plugins(); assert plugin.plugins',
+    ]
+    env = dict(os.environ, PYTHONPATH=os.path.dirname(os.path.dirname(flexget.__file__)))
+    benchmark(subprocess.run, command, check=True, env=env, rounds=3)
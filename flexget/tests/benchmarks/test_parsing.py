@@ -0,0 +1,62 @@
+import pytest
+
+from flexget.components.parsing.parsers.parser_internal import ParserInternal
+from flexget.entry import Entry
+from flexget.utils import qualities
+from flexget.utils.bittorrent import bdecode, bencode
+from flexget.utils.template import render_from_entry
+
+from .data import release_titles
+
+pytestmark = pytest.mark.benchmark
+
+
+def test_series_parser(benchmark):
+    parser = ParserInternal()
+    titles = release_titles(2000)
+    names = [title.split('.S')[0].replace('.', ' ') for title in titles]
+
+    def parse_all():
+        return [parser.parse_series(title, name=name) for title, name in zip(titles, names)]
+
+    results = benchmark(parse_all, rounds=3)
+    assert all(result.valid for result in results)
+
+
+def test_quality_parser(benchmark):
+    titles = release_titles(5000)
+    results = benchmark(lambda: [qualities.Quality(title) for title in titles])
+    assert all(
+        result.resolution.name != 'unknown' or 'XviD' in title
+        for result, title in zip(results, titles)
+    )
+
+
+def test_bdecode(benchmark):
+    files = [
+        {'length': index * 1024, 'path': ['folder %s' % (index % 100), 'file %s.mkv' % index]}
+        for index in range(20000)
+    ]
+    data = bencode(
+        {
+            'announce': 'http://tracker.example.com/announce',
+            'info': {
+                'name': 'big',
+                'piece length': 262144,
+                'pieces': b'x' * 20 * 5000,
+                'files': files,
+            },
+        }
+    )
+    result = benchmark(bdecode, data)
+    assert len(result['info']['files']) == 20000
+
+
+def test_template_rendering(benchmark):
+    entries = [
+        Entry(title=title, url='http://example.com/%s' % index, content_size=index)
+        for index, title in enumerate(release_titles(2000))
+    ]
+    template = "{{ title|replace('.', ' ') }} - {{ content_size|default(0) }} MB {{ url|lower }}"
+    results = benchmark(lambda: [render_from_entry(template, entry) for entry in entries])
+    assert results[0].startswith(entries[0]['title'].replace('.', ' '))
@@ -0,0 +1,32 @@
+import pytest
+
+from flexget.plugins.cli.generate_db import show_names
+
+from .data import rss_feed
+
+pytestmark = pytest.mark.benchmark
+
+ENTRY_COUNT = 5000
+
+
+class TestPipeline:
+    config = """
+        tasks:
+          pipeline:
+            rss: __tmp__/feed.xml
+            series: [%s]
+            quality: 720p+
+    """ % ', '.join(
+        show_names(50)
+    )
+
+    @pytest.fixture()
+    def feed(self, tmpdir):
+        # Must be written before the manager validates the config
+        tmpdir.join('feed.xml').write(rss_feed(ENTRY_COUNT))
+
+    def test_rss_seen_series_quality(self, feed, tmpdir, execute_task, benchmark):
+        # Entries are seen after the first run, so a single run is measured
+        task = benchmark(execute_task, 'pipeline', rounds=1)
+        assert len(task.all_entries) == ENTRY_COUNT
+        assert task.accepted
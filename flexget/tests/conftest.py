@@ -201,6 +201,30 @@ def caplog(pytestconfig, _caplog):
 # --- End Public Fixtures ---
 
 
+def pytest_addoption(parser):
+    group = parser.getgroup('benchmarks')
+    group.addoption(
+        '--run-benchmarks',
+        action='store_true',
+        default=False,
+        help='run the benchmarks, which are skipped otherwise',
+    )
+    group.addoption(
+        '--benchmarks-save', metavar='PATH', help='save the benchmark results into a json file'
+    )
+    group.addoption(
+        '--benchmarks-compare',
+        metavar='PATH',
+        help='fail the benchmarks which are slower than in this saved results file',
+    )
+    group.addoption(
+        '--benchmarks-threshold',
+        type=float,
+        default=0.25,
+        help='slowdown from the compared results considered a regression (default 0.25)',
+    )
+
+
 def pytest_configure(config):
     # register the filecopy marker
     config.addinivalue_line(
@@ -210,6 +234,18 @@ def pytest_configure(config):
     config.addinivalue_line(
         'markers', 'online: mark a test that goes online. VCR will automatically be used.'
     )
+    config.addinivalue_line(
+        'markers', 'benchmark: mark a benchmark, only run with --run-benchmarks.'
+    )
+
+
+def pytest_collection_modifyitems(config, items):
+    if config.getoption('run_benchmarks'):
+        return
+    skip = pytest.mark.skip(reason='benchmarks only run with --run-benchmarks')
+    for item in items:
+        if item.get_closest_marker('benchmark'):
+            item.add_marker(skip)
 
 
 def pytest_runtest_setup(item):
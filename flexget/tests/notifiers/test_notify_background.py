@@ -0,0 +1,84 @@
+import time
+from unittest import mock
+
+from flexget.components.notify import notification_framework
+from flexget.components.notify.notification_framework import NotificationDispatcher
+from flexget.plugin import PluginWarning
+from flexget.utils.simple_persistence import SimplePersistence
+
+
+class TestNotifyBackground:
+    config = """
+        tasks:
+          test_background_wait:
+            mock:
+             - {title: 'foo', url: 'http://bla.com'}
+             - {title: 'bar', url: 'http://bla2.com'}
+            accept_all: yes
+            notify:
+              background: yes
+              wait: yes
+              entries:
+                title: "{{title}}"
+                message: "{{url}}"
+                via:
+                  - debug_notification:
+                      api_key: apikey
+        """
+
+    def test_background_wait(self, debug_notifications, execute_task):
+        execute_task('test_background_wait')
+
+        assert sorted(debug_notifications) == [
+            ('bar', 'http://bla2.com', {'api_key': 'apikey'}),
+            ('foo', 'http://bla.com', {'api_key': 'apikey'}),
+        ]
+
+
+class TestNotificationDispatcher:
+    def test_retry(self):
+        dispatcher = NotificationDispatcher(retry_delay=0)
+        notifier = mock.Mock()
+        notifier.notify.side_effect = [PluginWarning('timeout'), None]
+        with mock.patch.object(notification_framework.plugin, 'get', return_value=notifier):
+            assert dispatcher.submit('pushover', 'title', 'message', {}).result() is False
+            # The retry is scheduled on a timer thread
+            for _ in range(100):
+                if not dispatcher.pending():
+                    break
+                time.sleep(0.01)
+        assert notifier.notify.call_count == 2
+        assert dispatcher.pending() == []
+        dispatcher.shutdown()
+
+    def test_gives_up(self):
+        dispatcher = NotificationDispatcher(max_retries=0)
+        notifier = mock.Mock()
+        notifier.notify.side_effect = PluginWarning('bad token')
+        with mock.patch.object(notification_framework.plugin, 'get', return_value=notifier):
+            assert dispatcher.submit('pushover', 'title', 'message', {}).result() is False
+        assert dispatcher.pending() == []
+
+
+class TestPersistUnsent:
+    config = 'tasks: {}'
+
+    def test_persisted_on_shutdown(self, manager):
+        notifier = mock.Mock()
+        notifier.notify.side_effect = PluginWarning('timeout')
+        with mock.patch.object(notification_framework.plugin, 'get', return_value=notifier):
+            notification_framework.dispatcher.submit('pushover', 'title', 'message', {}).result()
+        notification_framework.persist_notifications(manager)
+
+        persistence = SimplePersistence('notification_framework')
+        pending = persistence['pending']
+        del persistence['pending']
+        assert pending == [
+            {
+                'notifier': 'pushover',
+                'title': 'title',
+                'message': 'message',
+                'config': {},
+                'attempt': 1,
+            }
+        ]
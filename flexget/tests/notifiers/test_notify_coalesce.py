@@ -0,0 +1,134 @@
+from unittest import mock
+
+import pytest
+
+from flexget.components.notify.notify import Coalescer
+from flexget.utils.requests import TokenBucketLimiter
+
+
+class TestNotifyCoalesce:
+    config = """
+        tasks:
+          test_coalesce:
+            mock:
+             - {title: 'foo', url: 'http://bla.com'}
+             - {title: 'bar', url: 'http://bla2.com'}
+             - {title: 'baz', url: 'http://bla3.com'}
+            accept_all: yes
+            notify:
+              entries:
+                title: "{{title}}"
+                message: "{{url}}"
+                coalesce:
+                  message: "{% for n in notifications %}{{ n.title }} {% endfor %}"
+                via:
+                  - debug_notification:
+                      api_key: apikey
+          test_single:
+            mock:
+             - {title: 'foo', url: 'http://bla.com'}
+            accept_all: yes
+            notify:
+              entries:
+                title: "{{title}}"
+                message: "{{url}}"
+                coalesce: {}
+                via:
+                  - debug_notification:
+                      api_key: apikey
+          test_background_wait:
+            mock:
+             - {title: 'foo', url: 'http://bla.com'}
+             - {title: 'bar', url: 'http://bla2.com'}
+            accept_all: yes
+            notify:
+              background: yes
+              wait: yes
+              entries:
+                title: "{{title}}"
+                message: "{{url}}"
+                coalesce:
+                  message: "{% for n in notifications %}{{ n.title }} {% endfor %}"
+                via:
+                  - debug_notification:
+                      api_key: apikey
+        """
+
+    def test_coalesce(self, debug_notifications, execute_task):
+        execute_task('test_coalesce')
+
+        assert debug_notifications == [
+            ('[FlexGet] 3 new notifications', 'foo bar baz ', {'api_key': 'apikey'})
+        ]
+
+    def test_single_sent_as_is(self, debug_notifications, execute_task):
+        execute_task('test_single')
+
+        assert debug_notifications == [('foo', 'http://bla.com', {'api_key': 'apikey'})]
+
+    def test_background_wait(self, debug_notifications, execute_task):
+        execute_task('test_background_wait')
+
+        # Waited for, though delivered from a background thread
+        assert debug_notifications == [
+            ('[FlexGet] 2 new notifications', 'foo bar ', {'api_key': 'apikey'})
+        ]
+
+
+class TestCoalescer:
+    coalesce = {
+        'window': '0 seconds',
+        'title': '{{ notifications|length }}',
+        'message': '',
+        'rate_limit': {'tokens': 1, 'interval': '1 hour'},
+    }
+
+    @pytest.fixture(autouse=True)
+    def reset_rate_limit(self):
+        def reset():
+            for key in list(TokenBucketLimiter.state_cache):
+                if key.startswith('notify/'):
+                    del TokenBucketLimiter.state_cache[key]
+
+        reset()
+        yield
+        reset()
+
+    def test_rate_limit_holds_notifications(self):
+        coalescer = Coalescer()
+        with mock.patch.object(coalescer, 'send') as send:
+            key = coalescer.add(('pushover', 'a', 'a', {}), self.coalesce, 'task')
+            coalescer.flush(key)
+            assert send.call_count == 1
+
+            coalescer.add(('pushover', 'b', 'b', {}), self.coalesce, 'task')
+            coalescer.add(('pushover', 'c', 'c', {}), self.coalesce, 'task')
+            coalescer.flush(key)
+            # No token left, held for later
+            assert send.call_count == 1
+            assert coalescer.batches[key]['timer'] is not None
+
+            coalescer.flush_all()
+        assert send.call_count == 2
+        batch = send.call_args[0][0]
+        assert [n['title'] for n in batch['notifications']] == ['b', 'c']
+        assert not coalescer.batches
+
+    def test_rate_limit_per_config(self):
+        coalescer = Coalescer()
+        with mock.patch.object(coalescer, 'send') as send:
+            for config in ({'user_key': 'a'}, {'user_key': 'b'}):
+                coalescer.flush(
+                    coalescer.add(('pushover', 'a', 'a', config), self.coalesce, 'task')
+                )
+        assert send.call_count == 2
+
+    def test_discard(self):
+        coalescer = Coalescer()
+        coalesce = dict(self.coalesce, window='1 hour')
+        coalescer.add(('pushover', 'a', 'a', {}), coalesce, 'task', task_id='1')
+        key = coalescer.add(('pushover', 'b', 'b', {}), coalesce, 'other', task_id='2')
+        coalescer.discard('2')
+        assert [n['title'] for n in coalescer.batches[key]['notifications']] == ['a']
+        coalescer.discard('1')
+        assert not coalescer.batches
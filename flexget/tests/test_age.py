@@ -0,0 +1,36 @@
+class TestAge:
+    config = """
+        templates:
+          global:
+            disable: builtins
+            mock:
+              - {title: 'old', date: '2001-01-01'}
+              - {title: 'new', date: '2099-01-01'}
+              - {title: 'invalid', date: 'not a date'}
+              - {title: 'missing'}
+        tasks:
+          test_reject:
+            accept_all: yes
+            age:
+              field: date
+              age: 7 days
+              action: reject
+          test_accept:
+            age:
+              field: date
+              age: 7 days
+              action: accept
+    """
+
+    def test_reject(self, execute_task):
+        task = execute_task('test_reject')
+        assert task.find_entry('rejected', title='old')
+        assert task.find_entry('accepted', title='new')
+        assert task.find_entry('accepted', title='invalid')
+        assert task.find_entry('failed', title='missing')
+
+    def test_accept(self, execute_task):
+        task = execute_task('test_accept')
+        assert task.find_entry('accepted', title='old')
+        assert task.find_entry('undecided', title='new')
+        assert task.find_entry('failed', title='missing')
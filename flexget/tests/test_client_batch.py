@@ -0,0 +1,99 @@
+from unittest import mock
+
+from flexget.entry import Entry
+from flexget.plugins.clients.aria2 import OutputAria2
+from flexget.plugins.clients.qbittorrent import OutputQBitTorrent
+
+
+def make_task(entries):
+    task = mock.Mock()
+    task.accepted = entries
+    task.options.test = False
+    task.options.learn = False
+    task.manager.options.test = False
+    return task
+
+
+class TestAria2Batch:
+    def test_multicall(self):
+        server = mock.Mock()
+        server.system.multicall.return_value = [
+            ['2089b05ecca3d829'],
+            {'faultCode': 1, 'faultString': 'bad uri'},
+        ]
+        entries = [Entry(title='a', url='http://a/a.zip'), Entry(title='b', url='bad://b')]
+        plugin = OutputAria2()
+        with mock.patch.object(plugin, 'aria2_server', return_value=server):
+            plugin.on_task_output(
+                make_task(entries), {'path': '/downloads/{{title}}', 'secret': 's', 'batch': True}
+            )
+
+        calls = server.system.multicall.call_args[0][0]
+        assert [c['methodName'] for c in calls] == ['aria2.addUri', 'aria2.addUri']
+        assert list(calls[0]['params']) == ['token:s', ['http://a/a.zip'], {'dir': '/downloads/a'}]
+        assert calls[1]['params'][2] == {'dir': '/downloads/b'}
+        assert not entries[0].failed
+        assert entries[1].failed
+
+
+class TestQBitTorrentBatch:
+    def make_plugin(self):
+        plugin = OutputQBitTorrent()
+        plugin.url = 'http://localhost:8080'
+        plugin.api_url_upload = plugin.api_url_download = '/api/v2/torrents/add'
+        plugin.api_url_info = '/api/v2/torrents/info'
+        plugin.connected = True
+        plugin.session = mock.Mock()
+        plugin.session.request.return_value.json.return_value = []
+        plugin.session.request.return_value.text = 'Ok.'
+        return plugin
+
+    def test_grouped_by_options(self):
+        entries = [
+            Entry(title='a', url='magnet:?xt=urn:btih:a'),
+            Entry(title='b', url='magnet:?xt=urn:btih:b'),
+            Entry(title='c', url='magnet:?xt=urn:btih:c', label='tv'),
+        ]
+        plugin = self.make_plugin()
+        plugin.add_entries(make_task(entries), plugin.prepare_config({'batch': True}))
+
+        uploads = [c[1]['files'] for c in plugin.session.request.call_args_list]
+        assert len(uploads) == 2
+        assert ('urls', (None, 'magnet:?xt=urn:btih:a\nmagnet:?xt=urn:btih:b')) in uploads[0]
+        assert ('category', (None, 'tv')) in uploads[1]
+
+    def test_failed_batch_added_one_by_one(self):
+        entries = [
+            Entry(title='a', url='magnet:?xt=urn:btih:a'),
+            Entry(title='b', url='magnet:?xt=urn:btih:b'),
+        ]
+        plugin = self.make_plugin()
+        responses = [mock.Mock(text=text) for text in ('Fails.', 'Ok.', 'Fails.')]
+        with mock.patch.object(plugin, 'get_snapshot', return_value=()):
+            plugin.session.request.side_effect = responses
+            plugin.add_entries(make_task(entries), plugin.prepare_config({'batch': True}))
+
+        assert plugin.session.request.call_count == 3
+        assert not entries[0].failed
+        assert entries[1].failed
+
+    def test_unreadable_file_fails_only_its_entry(self, tmp_path):
+        torrent = tmp_path / 'a.torrent'
+        torrent.write_bytes(b'd4:infod4:name1:aee')
+        # Exists, but can not be read as a file
+        unreadable = tmp_path / 'b.torrent'
+        unreadable.mkdir()
+        entries = [
+            Entry(title='a', url='http://a/a.torrent', file=str(torrent)),
+            Entry(title='b', url='http://b/b.torrent', file=str(unreadable)),
+            Entry(title='c', url='magnet:?xt=urn:btih:c'),
+        ]
+        plugin = self.make_plugin()
+        with mock.patch.object(plugin, 'get_snapshot', return_value=()):
+            plugin.add_entries(make_task(entries), plugin.prepare_config({'batch': True}))
+
+        # The batch could not be sent, then a and c were added one by one
+        assert plugin.session.request.call_count == 2
+        assert not entries[0].failed
+        assert entries[1].failed
+        assert not entries[2].failed
@@ -0,0 +1,78 @@
+from unittest import mock
+
+import pytest
+
+from flexget.plugins.clients.connection_pool import ConnectionPool, connection_pool
+from flexget.plugins.clients.deluge import DelugePlugin
+
+
+class TestConnectionPool:
+    def test_reuse(self):
+        pool = ConnectionPool()
+        connect = mock.Mock(side_effect=lambda: object())
+        first = pool.get(('client', 'host'), connect)
+        assert pool.get(('client', 'host'), connect) is first
+        assert pool.get(('client', 'other'), connect) is not first
+        assert connect.call_count == 2
+
+    def test_reconnect_when_unhealthy(self):
+        pool = ConnectionPool()
+        close = mock.Mock()
+        first = pool.get('key', object, close=close)
+        check = mock.Mock(side_effect=Exception('connection reset'))
+        second = pool.get('key', object, check=check, close=close)
+        assert second is not first
+        check.assert_called_once_with(first)
+        close.assert_called_once_with(first)
+
+    def test_reconnect_when_idle(self):
+        pool = ConnectionPool(max_idle=-1)
+        first = pool.get('key', object)
+        assert pool.get('key', object) is not first
+
+    def test_close_all(self):
+        pool = ConnectionPool()
+        close = mock.Mock(side_effect=Exception('already closed'))
+        client = pool.get('key', object, close=close)
+        pool.close_all()
+        close.assert_called_once_with(client)
+        assert 'key' not in pool
+
+
+class TestDelugePool:
+    config = 'tasks: {}'
+
+    @pytest.fixture(autouse=True)
+    def clear_pool(self):
+        yield
+        connection_pool.close_all()
+
+    def test_login_reused_between_tasks(self):
+        client = mock.Mock(connected=True)
+        plugin = DelugePlugin()
+        config = {'username': 'user', 'password': 'pass'}
+        with mock.patch.object(plugin, 'setup_client', return_value=client) as setup_client:
+            assert plugin.connect_client(config) is client
+            assert plugin.connect_client(config) is client
+        setup_client.assert_called_once()
+        client.connect.assert_called_once_with()
+        client.call.assert_called_once_with('daemon.info')
+
+    def test_reconnect_after_daemon_restart(self):
+        client = mock.Mock(connected=True)
+        plugin = DelugePlugin()
+        config = {'username': 'user', 'password': 'pass'}
+        with mock.patch.object(plugin, 'setup_client', return_value=client):
+            plugin.connect_client(config)
+            client.connected = False
+            plugin.connect_client(config)
+        assert client.connect.call_count == 2
+        client.disconnect.assert_called_once_with()
+
+    def test_closed_on_shutdown(self, manager):
+        client = mock.Mock(connected=True)
+        plugin = DelugePlugin()
+        with mock.patch.object(plugin, 'setup_client', return_value=client):
+            plugin.connect_client({'username': 'user', 'password': 'pass'})
+        manager.shutdown()
+        client.disconnect.assert_called_once_with()
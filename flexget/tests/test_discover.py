@@ -1,4 +1,5 @@
 from datetime import datetime, timedelta
+from unittest import mock
 
 from flexget import plugin
 from flexget.entry import Entry
@@ -99,6 +100,42 @@ class TestDiscover:
                 identified_by: ep
             mock_output: yes
             max_reruns: 3
+          test_concurrent:
+            discover:
+              release_estimations: ignore
+              concurrency:
+                searches: 3
+                per_plugin: 2
+              what:
+              - mock:
+                - title: Foo
+                - title: Bar
+                - title: Baz
+              from:
+              - test_search: [' a', ' b']
+          test_stop_after_results:
+            discover:
+              release_estimations: ignore
+              stop_after_results: 1
+              what:
+              - mock:
+                - title: Foo
+              from:
+              - test_search: [' a']
+              - test_search: [' b']
+          test_cache:
+            discover:
+              release_estimations: ignore
+              cache:
+                negative_ttl: 0 seconds
+              what:
+              - mock:
+                - title: Foo
+                - title: Bar
+                  search_strings: [nothing]
+              from:
+              - test_search: [' a']
+              - test_search: no
 
     """
 
@@ -150,6 +187,39 @@ class TestDiscover:
         assert len(task.mock_output) == 4, 'Should have kept rerunning and accepted 4 episodes'
         assert task.find_entry(title='My Show S01E04 a')
 
+    def test_concurrent(self, execute_task):
+        task = execute_task('test_concurrent')
+        assert len(task.entries) == 6
+        # Results are kept in the order of the searched entries
+        assert [e['title'] for e in task.entries] == [
+            'Foo a',
+            'Foo b',
+            'Bar a',
+            'Bar b',
+            'Baz a',
+            'Baz b',
+        ]
+
+    def test_stop_after_results(self, execute_task):
+        task = execute_task('test_stop_after_results')
+        assert [e['title'] for e in task.entries] == ['Foo a']
+
+    def test_cache(self, execute_task):
+        original_search = SearchPlugin.search
+        with mock.patch.object(SearchPlugin, 'search', autospec=True) as search:
+            search.side_effect = original_search
+            task = execute_task('test_cache', options={'discover_now': True})
+            assert sorted(e['title'] for e in task.entries) == ['Bar a', 'Foo a']
+            assert search.call_count == 4
+
+            task = execute_task('test_cache', options={'discover_now': True})
+            assert sorted(e['title'] for e in task.entries) == ['Bar a', 'Foo a']
+            # Only the searches without results (not cached, negative_ttl is 0) are run again
+            assert search.call_count == 6
+
+            execute_task('test_cache', options={'discover_now': True, 'nocache': True})
+            assert search.call_count == 10
+
 
 class TestEmitSeriesInDiscover:
     config = """
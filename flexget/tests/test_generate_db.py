@@ -0,0 +1,68 @@
+from io import StringIO
+
+from flexget.components.archive import db as archive_db
+from flexget.components.archive.db import ArchiveEntry, ArchiveSource, ArchiveTag
+from flexget.components.history.db import History
+from flexget.components.seen.db import SeenEntry, SeenField
+from flexget.components.series import db as series_db
+from flexget.components.status.db import StatusTask, TaskExecution
+from flexget.manager import Session, get_parser
+from flexget.plugins.cli.generate_db import ARCHIVE_TAGS
+from flexget.terminal import capture_console
+
+
+class TestGenerateDb:
+    config = """
+        tasks:
+          series:
+            mock:
+              - {title: 'Show Number 3 S01E21 720p HDTV'}
+            series:
+              - Show Number 3
+    """
+
+    def generate(self, manager, *args):
+        options = get_parser().parse_args(['generate-db'] + list(args))
+        buffer = StringIO()
+        with capture_console(buffer):
+            manager.handle_cli(options=options)
+        return buffer.getvalue()
+
+    def test_generate(self, manager):
+        output = self.generate(
+            manager,
+            *'--series 5 --episodes 3 --releases 2 --seen 10 --archive 7 --history 4 '
+            '--status-tasks 2 --executions 6'.split(),
+        )
+        assert 'Generated 30 series releases' in output
+        with Session() as session:
+            assert session.query(series_db.Series).count() == 5
+            assert session.query(series_db.Episode).count() == 15
+            assert session.query(series_db.SeriesSummary).count() == 5
+            series = session.query(series_db.Series).filter_by(name='Show Number 3').one()
+            assert series_db.get_latest_episode_release(series).identifier == 'S01E03'
+            assert session.query(SeenEntry).count() == 10
+            assert session.query(SeenField).count() == 20
+            archived = session.query(ArchiveEntry).first()
+            assert len(archived.tags) == 1 and len(archived.sources) == 1
+            assert session.query(History).count() == 4
+            assert session.query(TaskExecution).count() == 12
+
+    def test_generate_after_existing(self, manager, execute_task):
+        args = '--series 2 --seen 3 --archive 4 --status-tasks 2 --executions 3 --tasks 2'
+        self.generate(manager, *args.split())
+        self.generate(manager, *args.split())
+        with Session() as session:
+            assert session.query(series_db.Series).count() == 4
+            assert session.query(SeenEntry).count() == 6
+            assert session.query(ArchiveEntry).count() == 8
+            # Tags, sources and status tasks with the same names are reused
+            assert archive_db.get_tag('tv', session).name == 'tv'
+            assert archive_db.get_source('task 0', session).name == 'task 0'
+            assert session.query(ArchiveTag).count() == len(ARCHIVE_TAGS)
+            assert session.query(ArchiveSource).count() == 2
+            status_task = session.query(StatusTask).filter(StatusTask.name == 'task 0').one()
+            assert status_task.executions.count() == 6
+        # Generated series are handled like the ones learnt by tasks
+        task = execute_task('series')
+        assert task.find_entry('accepted', title='Show Number 3 S01E21 720p HDTV')
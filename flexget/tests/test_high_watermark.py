@@ -0,0 +1,62 @@
+from datetime import datetime
+from unittest import mock
+
+import pytest
+
+from flexget.entry import Entry
+from flexget.utils import json
+from flexget.utils.high_watermark import HighWatermark
+
+
+def item(guid, hour):
+    return Entry(
+        title=guid,
+        url='http://localhost/%s' % guid,
+        guid=guid,
+        rss_pubdate=datetime(2020, 1, 1, hour),
+    )
+
+
+class TestHighWatermark:
+    def filter(self, task, entries):
+        return [e['title'] for e in HighWatermark(task, 'test', 'http://feed').filter(entries)]
+
+    def test_ordering(self):
+        task = mock.Mock(simple_persistence={})
+        assert self.filter(task, [item('b', 2), item('a', 1)]) == ['b', 'a']
+        assert self.filter(task, [item('c', 3), item('b', 2), item('a', 1)]) == ['c']
+        # Backdated items which were not seen are kept, items older than the last run are dropped
+        assert self.filter(task, [item('x', 2), item('c', 3), item('old', 0)]) == ['x']
+
+    def test_no_dates(self):
+        task = mock.Mock(simple_persistence={})
+        entries = [Entry(title='a', url='http://a'), Entry(title='b', url='http://b')]
+        assert self.filter(task, entries) == ['a', 'b']
+        entries.insert(0, Entry(title='c', url='http://c'))
+        assert self.filter(task, entries) == ['c']
+
+
+class TestJsonAllEntries:
+    config = """
+        tasks:
+          test:
+            json:
+              file: __tmp__/feed.json
+              all_entries: no
+    """
+
+    def write(self, tmpdir, *titles):
+        items = [{'title': t, 'url': 'http://localhost/%s' % t} for t in titles]
+        tmpdir.join('feed.json').write(json.dumps(items))
+
+    @pytest.fixture(autouse=True)
+    def feed(self, tmpdir):
+        # The file needs to exist for the config to validate
+        self.write(tmpdir, 'a', 'b')
+
+    def test_only_new(self, execute_task, tmpdir):
+        task = execute_task('test')
+        assert len(task.entries) == 2
+        self.write(tmpdir, 'c', 'a', 'b')
+        task = execute_task('test')
+        assert [e['title'] for e in task.entries] == ['c']
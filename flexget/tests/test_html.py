@@ -0,0 +1,37 @@
+from flexget.plugins.input.html import InputHtml
+from flexget.utils.soup import get_soup
+
+PAGE = """<html><body>
+<div class="nav"><a href="/index">index</a></div>
+<table class="torrents">
+  <tr><td class="name"><a href="/a.torrent">Show A</a></td></tr>
+  <tr><td class="name"><a href="/b.torrent">Show B</a></td></tr>
+  <tr><td class="name"><a href="/b2.torrent">Show B</a></td></tr>
+  <tr><td class="name"><a href="/b2.torrent">Show B</a></td></tr>
+</table>
+</body></html>"""
+
+
+class TestHtmlEntries:
+    config = 'tasks: {}'
+
+    def create_entries(self, parser, **config):
+        soup = get_soup(PAGE, parser)
+        return InputHtml().create_entries('http://localhost/', soup, config)
+
+    def test_selector(self):
+        for parser in ('html.parser', 'html5lib'):
+            entries = self.create_entries(parser, selector='table.torrents td.name')
+            assert [e['url'] for e in entries] == [
+                'http://localhost/a.torrent',
+                'http://localhost/b.torrent',
+                'http://localhost/b2.torrent',
+            ]
+
+    def test_duplicate_titles(self):
+        entries = self.create_entries('html.parser')
+        titles = [e['title'] for e in entries]
+        assert titles[:3] == ['index', 'Show A', 'Show B']
+        # The second link with the same title gets the url crc added, the exact duplicate is dropped
+        assert len(titles) == 4
+        assert titles[3].startswith('Show B [')
@@ -0,0 +1,68 @@
+import pytest
+
+from flexget.plugins.daemon.web_server import metrics_app
+from flexget.utils import metrics
+
+
+@pytest.fixture()
+def enabled_metrics():
+    metrics.registry.clear()
+    metrics.enable()
+    yield metrics
+    metrics.disable()
+    metrics.registry.clear()
+
+
+class TestMetrics:
+    config = """
+        tasks:
+          test:
+            mock:
+              - {title: 'entry 1'}
+              - {title: 'entry 2'}
+            accept_all: yes
+            seen: local
+    """
+
+    def test_render(self):
+        counter = metrics.Counter('test_total', 'Test counter', ['name'])
+        counter.inc(name='a "quoted"\nname')
+        counter.inc(2, name='b')
+        histogram = metrics.Histogram('test_seconds', 'Test histogram', buckets=[1, 5])
+        histogram.observe(0.5)
+        histogram.observe(3)
+        lines = (counter.render() + '\n' + histogram.render()).splitlines()
+        assert '# TYPE test_total counter' in lines
+        assert 'test_total{name="a \\"quoted\\"\\nname"} 1' in lines
+        assert 'test_total{name="b"} 2' in lines
+        assert 'test_seconds_bucket{le="1"} 1' in lines
+        assert 'test_seconds_bucket{le="5"} 2' in lines
+        assert 'test_seconds_bucket{le="+Inf"} 2' in lines
+        assert 'test_seconds_sum 3.5' in lines
+        assert 'test_seconds_count 2' in lines
+
+    def test_disabled(self, execute_task):
+        metrics.registry.clear()
+        execute_task('test')
+        assert not metrics.task_runs.samples()
+
+    def test_task_metrics(self, execute_task, enabled_metrics):
+        execute_task('test')
+        client = metrics_app.test_client()
+        response = client.get('/')
+        assert response.status_code == 200
+        assert response.content_type == metrics.CONTENT_TYPE
+        lines = response.get_data(as_text=True).splitlines()
+        assert 'flexget_task_runs_total{task="test",result="completed"} 1' in lines
+        assert 'flexget_task_entries{task="test",state="accepted"} 2' in lines
+        assert 'flexget_plugin_runs_total{phase="filter",plugin="accept_all"} 1' in lines
+        assert 'flexget_task_duration_seconds_count{task="test"} 1' in lines
+        assert any(line.startswith('flexget_db_queries_total ') for line in lines)
+
+    def test_http_metrics(self, enabled_metrics):
+        metrics.record_http_request('http://example.com/path', 200, 0.2)
+        metrics.record_http_request('http://example.com/other', 'timeout', 30)
+        lines = metrics.registry.render().splitlines()
+        assert 'flexget_http_requests_total{domain="example.com",status="200"} 1' in lines
+        assert 'flexget_http_requests_total{domain="example.com",status="timeout"} 1' in lines
+        assert 'flexget_http_request_duration_seconds_count{domain="example.com"} 2' in lines
@@ -1,11 +1,14 @@
 # pylint: disable=no-self-use
+import copy
 import os
+import pickle
 import stat
 import sys
 
 import pytest
 
 from flexget.entry import Entry, EntryUnicodeError
+from flexget.utils.tools import unique_entries
 
 
 class TestDisableBuiltins:
@@ -160,6 +163,58 @@ class TestEntryStringCoercion:
         assert type(e['test']) == str  # pylint: disable=unidiomatic-typecheck
 
 
+class TestEntryCompact:
+    def test_no_instance_dict(self):
+        e = Entry('title', 'url')
+        assert not hasattr(e, '__dict__')
+        with pytest.raises(AttributeError):
+            e.some_attribute = True
+
+    def test_lazy_containers(self):
+        e = Entry('title', 'url')
+        assert e._traces is None and e._hooks is None
+        accepted = []
+        e.on_accept(lambda entry, **kwargs: accepted.append(kwargs['reason']))
+        e.accept('because')
+        assert accepted == ['because']
+        assert e.traces == [(None, 'accept', 'because')]
+        with pytest.raises(ValueError):
+            e.add_hook('bogus', lambda entry: None)
+
+    def test_copy_and_pickle(self):
+        e = Entry('title', 'url', field='value')
+        e.accept()
+        for copied in (copy.deepcopy(e), pickle.loads(pickle.dumps(e))):
+            assert copied['field'] == 'value'
+            assert copied.accepted
+        # Entries pickled when Entry had an instance dict
+        old = Entry.__new__(Entry)
+        old.__setstate__({'store': {'title': 'old', 'url': ''}, 'traces': [], 'task': None})
+        assert old['title'] == 'old'
+        assert old.undecided
+
+
+class TestEntryIdentity:
+    def test_identity_cache(self):
+        a = Entry('title', 'url', field='a')
+        b = Entry('title', 'url', field='b')
+        assert a == b and hash(a) == hash(b)
+        assert a.identity == ('title', 'url')
+        b['title'] = 'changed'
+        assert a == b, 'original_title is kept when title changes'
+        b['original_title'] = 'changed'
+        assert a != b
+        assert b.identity == ('changed', 'url')
+        del b['original_title']
+        assert b.identity == (None, 'url')
+
+    def test_unique_entries(self):
+        entries = [Entry('a', 'url'), Entry('b', 'url'), Entry('a', 'url', field=1)]
+        unique = unique_entries(entries)
+        assert unique == entries[:2]
+        assert unique[0] is entries[0]
+
+
 class TestFilterRequireField:
     config = """
         tasks:
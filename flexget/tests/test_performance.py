@@ -0,0 +1,41 @@
+import json
+
+import pytest
+
+from flexget.plugins.cli import performance
+
+
+class TestProfile:
+    config = """
+        tasks:
+          test:
+            mock:
+              - {title: 'entry 1'}
+              - {title: 'entry 2'}
+            accept_all: yes
+    """
+
+    @pytest.mark.parametrize(
+        'mode,extension', [('cprofile', '.pstats'), ('sample', '.speedscope.json')]
+    )
+    def test_profile(self, execute_task, manager, tmpdir, monkeypatch, mode, extension):
+        monkeypatch.setattr(manager, 'config_base', tmpdir.strpath)
+        task = execute_task(
+            'test', options={'profile_plugins': ['mock', 'filter'], 'profile_mode': mode}
+        )
+        assert len(task.accepted) == 2
+        profiles = tmpdir.join(performance.PROFILE_DIR)
+        (report_path,) = [
+            path
+            for path in profiles.listdir()
+            if path.ext == '.json' and not path.basename.endswith(extension)
+        ]
+        report = json.loads(report_path.read())
+        assert profiles.join(report['profile']).check(file=True)
+        assert report['profile'].endswith(extension)
+        profiled = {(data['phase'], data['plugin']) for data in report['plugins']}
+        assert {('input', 'mock'), ('filter', 'accept_all')} <= profiled
+        assert all(phase == 'filter' or plugin == 'mock' for phase, plugin in profiled)
+        for data in report['plugins']:
+            assert data['runs'] == 1
+            assert data['wall'] >= data['sql_time']
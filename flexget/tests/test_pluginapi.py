@@ -4,7 +4,7 @@ import os
 import pytest
 
 from flexget import plugin, plugins
-from flexget.event import event, fire_event
+from flexget.event import add_event_handler, event, fire_event, remove_event_handler
 
 
 class TestPluginApi:
@@ -85,3 +85,73 @@ class TestExternalPluginLoading:
         # TODO: This isn't working because calling load_plugins again doesn't cause the schema for tasks to regenerate
         task = execute_task('ext_plugin')
         assert task.find_entry(title='test entry'), 'External plugin did not create entry'
+
+
+class TestPhasePlugins:
+    config = """
+        tasks:
+          test:
+            mock:
+              - {title: 'entry 1 720p'}
+            quality: 720p+
+            accept_all: yes
+            plugin_priority: {}
+          priority:
+            mock:
+              - {title: 'entry 1 720p'}
+            quality: 720p+
+            accept_all: yes
+            plugin_priority:
+              accept_all: 255
+    """
+
+    def test_cached_plan(self, execute_task):
+        plan = plugin.get_phase_plugins('filter', ['accept_all', 'quality'])
+        assert plugin.get_phase_plugins('filter', ['quality', 'accept_all']) is plan
+        names = [p.name for p in plan]
+        # Ordered by priority, and only configured or builtin plugins
+        assert names.index('quality') < names.index('accept_all')
+        assert 'regexp' not in names
+        assert all(p.builtin for p in plan if p.name not in ('accept_all', 'quality'))
+        plugin.invalidate_phase_plans()
+        assert plugin.get_phase_plugins('filter', ['accept_all', 'quality']) is not plan
+
+    def test_changed_priority(self, execute_task):
+        filters = []
+
+        def record_filter(task, plugin_name):
+            if task.current_phase == 'filter' and plugin_name in ('accept_all', 'quality'):
+                filters.append((task.name, plugin_name))
+
+        add_event_handler('task.execute.before_plugin', record_filter)
+        try:
+            # Both tasks use the same plan, cached with the default priorities first
+            for name in ('test', 'priority', 'test'):
+                execute_task(name)
+        finally:
+            remove_event_handler('task.execute.before_plugin', record_filter)
+        assert filters == [
+            ('test', 'quality'),
+            ('test', 'accept_all'),
+            ('priority', 'accept_all'),
+            ('priority', 'quality'),
+            ('test', 'quality'),
+            ('test', 'accept_all'),
+        ]
+
+    def test_no_session(self, execute_task):
+        sessions = {}
+
+        def record_session(task, plugin_name):
+            sessions[task.current_phase, plugin_name] = task.session
+
+        add_event_handler('task.execute.before_plugin', record_session)
+        try:
+            task = execute_task('test')
+        finally:
+            remove_event_handler('task.execute.before_plugin', record_session)
+        assert task.accepted
+        assert sessions['input', 'mock'] is None
+        assert sessions['filter', 'accept_all'] is None
+        # Plugins which did not declare that they do not use it still get a session
+        assert sessions['filter', 'seen'] is not None
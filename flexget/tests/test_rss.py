@@ -178,6 +178,41 @@ class TestInputRSS:
         ), 'RSS entry missing: multiple content tags'
 
 
+class TestInputRSSStream(TestInputRSS):
+    """Runs the same tests with the feed parsed while it is streamed."""
+
+    config = TestInputRSS.config.replace('silent: yes', 'silent: yes\n              stream: yes')
+
+    def test_stop_at_older_entries(self, execute_task, manager, tmpdir):
+        from flexget.utils.cached_input import cached
+
+        item = (
+            '<item><title>{0}</title><link>http://localhost/{0}</link>'
+            '<pubDate>{1}</pubDate></item>'
+        )
+        feed = tmpdir.join('feed.xml')
+        manager.config['tasks']['test_all_entries_no']['rss']['url'] = str(feed)
+
+        feed.write(
+            '<rss><channel>%s</channel></rss>' % item.format('b', 'Sun, 28 Dec 2008 14:00:00')
+        )
+        task = execute_task('test_all_entries_no')
+        assert [e['title'] for e in task.entries] == ['b']
+
+        cached.cache.clear()
+        feed.write(
+            '<rss><channel>%s%s%s</channel></rss>'
+            % (
+                item.format('c', 'Sun, 28 Dec 2008 15:00:00'),
+                item.format('a', 'Sun, 28 Dec 2008 13:00:00'),
+                item.format('b', 'Sun, 28 Dec 2008 14:00:00'),
+            )
+        )
+        task = execute_task('test_all_entries_no')
+        # Parsing stops at the first item published before the previous run's newest item
+        assert [e['title'] for e in task.entries] == ['c']
+
+
 class TestEscapeInputRSS:
     config = """
         tasks:
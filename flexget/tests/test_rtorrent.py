@@ -13,6 +13,15 @@ with open(torrent_file, 'rb') as tor_file:
     torrent_raw = tor_file.read()
 
 
+def loaded_torrents(*torrents):
+    """Mocks `RTorrent.torrents`, returning only the requested fields like the real client does."""
+
+    def listing(view='main', fields=None):
+        return [{field: torrent[field] for field in fields} for torrent in torrents]
+
+    return listing
+
+
 @mock.patch('flexget.plugins.clients.rtorrent.xmlrpc_client.ServerProxy')
 class TestRTorrentClient:
     def test_load(self, mocked_proxy):
@@ -51,6 +60,37 @@ class TestRTorrentClient:
         assert 'd.custom1.set=testing' in fields
         assert 'd.priority.set=3' in fields
 
+    def test_load_many(self, mocked_proxy):
+        mocked_proxy = mocked_proxy()
+        mocked_proxy.system.multicall.side_effect = [
+            # mkdir of both directories
+            [[0], {'faultCode': -503, 'faultString': 'permission denied'}],
+            # load of the torrents with creatable directories
+            [[0], {'faultCode': -501, 'faultString': 'invalid torrent'}],
+        ]
+
+        client = RTorrent('http://localhost/RPC2')
+
+        results = client.load_many(
+            [
+                (torrent_raw, {'directory': '/data/a'}),
+                (torrent_raw, {'directory': '/data/b'}),
+                (torrent_raw, {'directory': '/data/a', 'custom1': 'testing'}),
+            ],
+            start=True,
+            mkdir=True,
+        )
+
+        assert results[0] == 0
+        assert isinstance(results[1], xmlrpc_client.Error)
+        assert isinstance(results[2], xmlrpc_client.Fault)
+
+        mkdir_calls, load_calls = [c[0][0] for c in mocked_proxy.system.multicall.call_args_list]
+        assert [c['params'][3] for c in mkdir_calls] == ['/data/a', '/data/b']
+        assert [c['methodName'] for c in load_calls] == ['load.raw_start', 'load.raw_start']
+        assert 'd.custom1.set=testing' in load_calls[1]['params']
+        assert not mocked_proxy.load.raw_start.called
+
     def test_torrent(self, mocked_proxy):
         mocked_proxy = mocked_proxy()
         mocked_proxy.system.multicall.return_value = [
@@ -218,6 +258,17 @@ class TestRTorrentOutputPlugin:
               priority: high
               path: /data/downloads
               custom1: test_custom1
+          test_add_torrent_batch:
+            accept_all: yes
+            mock:
+              - {title: 'test', url: '"""
+        + torrent_url
+        + """'}
+            rtorrent:
+              action: add
+              uri: http://localhost/SCGI
+              path: /data/downloads
+              batch: yes
           test_add_torrent_set:
             accept_all: yes
             set:
@@ -275,7 +326,8 @@ class TestRTorrentOutputPlugin:
         mocked_client = mocked_client()
         mocked_client.load.return_value = 0
         mocked_client.version = [0, 9, 4]
-        mocked_client.torrent.side_effect = [False, {'hash': torrent_info_hash}]
+        mocked_client.torrents.return_value = []
+        mocked_client.torrent.return_value = {'hash': torrent_info_hash}
 
         execute_task('test_add_torrent')
 
@@ -286,11 +338,27 @@ class TestRTorrentOutputPlugin:
             mkdir=True,
         )
 
+    def test_add_batch(self, mocked_client, execute_task):
+        mocked_client = mocked_client()
+        mocked_client.load_many.return_value = [0]
+        mocked_client.torrents.return_value = []
+        mocked_client.multicall.return_value = ['/data/downloads/test']
+
+        task = execute_task('test_add_torrent_batch')
+
+        mocked_client.load_many.assert_called_once_with(
+            [(torrent_raw, {'directory': '/data/downloads'})], start=True, mkdir=True
+        )
+        mocked_client.multicall.assert_called_once_with([('d.base_path', (torrent_info_hash,))])
+        assert not mocked_client.load.called
+        assert not task.failed
+
     def test_add_set(self, mocked_client, execute_task):
         mocked_client = mocked_client()
         mocked_client.load.return_value = 0
         mocked_client.version = [0, 9, 4]
-        mocked_client.torrent.side_effect = [False, {'hash': torrent_info_hash}]
+        mocked_client.torrents.return_value = []
+        mocked_client.torrent.return_value = {'hash': torrent_info_hash}
 
         execute_task('test_add_torrent_set')
 
@@ -310,8 +378,7 @@ class TestRTorrentOutputPlugin:
         mocked_client = mocked_client()
         mocked_client.version = [0, 9, 4]
         mocked_client.update.return_value = 0
-        # ntpath complains on windows if base_path is a MagicMock
-        mocked_client.torrent.side_effect = [False, {'base_path': ''}]
+        mocked_client.torrents.return_value = []
 
         execute_task('test_update')
 
@@ -324,7 +391,9 @@ class TestRTorrentOutputPlugin:
         mocked_client.version = [0, 9, 4]
         mocked_client.update.return_value = 0
         mocked_client.move.return_value = 0
-        mocked_client.torrent.return_value = {'base_path': '/some/path'}
+        mocked_client.torrents.side_effect = loaded_torrents(
+            {'hash': torrent_info_hash, 'name': 'test', 'base_path': '/some/path'}
+        )
 
         execute_task('test_update_path')
 
@@ -332,6 +401,18 @@ class TestRTorrentOutputPlugin:
 
         mocked_client.move.assert_called_with(torrent_info_hash, '/new/path')
 
+    def test_add_already_loaded(self, mocked_client, execute_task):
+        mocked_client = mocked_client()
+        mocked_client.version = [0, 9, 4]
+        mocked_client.torrents.side_effect = loaded_torrents(
+            {'hash': torrent_info_hash, 'name': 'test', 'base_path': '/data/downloads'}
+        )
+
+        execute_task('test_add_torrent')
+
+        mocked_client.torrents.assert_called_once_with(fields=['hash', 'base_path'])
+        assert not mocked_client.load.called
+
     def test_delete(self, mocked_client, execute_task):
         mocked_client = mocked_client()
         mocked_client.load.return_value = 0
@@ -1,3 +1,9 @@
+import copy
+
+from flexget.entry import Entry
+from flexget.task import EntryContainer
+
+
 class TestTemplate:
     config = """
         templates:
@@ -25,3 +31,100 @@ class TestTemplate:
 
         task = execute_task('test')
         assert len(task.entries) == 2, 'Should have emitted House S01E02 and Hawaii Five-O S01E01'
+
+    def test_config_not_shared(self, manager, execute_task):
+        config = copy.deepcopy(manager.config)
+        task = execute_task('test')
+        task.config['series']['test'].append('Hawaii Five-O')
+        assert manager.config == config
+        assert 'Hawaii Five-O' in copy.copy(task).config['series']['test']
+
+
+class TestEntryContainer:
+    def make_container(self, count=5):
+        return EntryContainer(Entry(title='entry %s' % i, url='') for i in range(count))
+
+    def titles(self, entries):
+        return [entry['title'] for entry in entries]
+
+    def test_state_index(self):
+        container = self.make_container()
+        assert len(container.undecided) == 5
+        assert not container.accepted
+        container[1].accept()
+        container[3].accept()
+        container[4].reject()
+        container[0].fail()
+        assert len(container.accepted) == 2
+        assert len(container.entries) == 3
+        assert len(container.rejected) == 1
+        assert len(container.failed) == 1
+        assert self.titles(container.accepted) == ['entry 1', 'entry 3']
+        assert self.titles(container.entries) == ['entry 1', 'entry 2', 'entry 3']
+        assert container.accepted[1]['title'] == 'entry 3'
+
+        container.sort(key=lambda e: e['title'], reverse=True)
+        assert self.titles(container.accepted) == ['entry 3', 'entry 1']
+        container.append(Entry(title='entry 5', url=''))
+        container[-1].accept()
+        assert self.titles(container.accepted) == ['entry 3', 'entry 1', 'entry 5']
+        del container[1]
+        assert self.titles(container.accepted) == ['entry 1', 'entry 5']
+
+    def test_state_changes_while_iterating(self):
+        container = self.make_container()
+        visited = []
+        for entry in container.undecided:
+            visited.append(entry['title'])
+            # Entries leaving the state before being reached are skipped
+            container[3].accept()
+        assert visited == ['entry 0', 'entry 1', 'entry 2', 'entry 4']
+
+        visited = []
+        for entry in container.accepted:
+            visited.append(entry['title'])
+            # Entries entering the state after the current one are reached
+            container[4].accept()
+            container.append(Entry(title='new', url=''))
+            container[-1].accept()
+            if len(visited) > 5:
+                break
+        assert visited[:3] == ['entry 3', 'entry 4', 'new']
+
+    def test_entries_in_several_containers(self):
+        container = self.make_container()
+        other = EntryContainer()
+        other[:] = container[1:3]
+        container[2].reject()
+        assert len(container.rejected) == 1
+        assert self.titles(other.rejected) == ['entry 2']
+        # Copies are not in the containers of their original
+        copy.deepcopy(container)[0].accept()
+        assert not container.accepted
+
+    def test_duplicates(self):
+        entry = Entry(title='entry', url='')
+        container = EntryContainer([entry, entry])
+        entry.accept()
+        assert len(container.accepted) == 2
+
+    def test_batch(self):
+        container = self.make_container()
+        for size, entry in zip([10, None, 300, 50, 700], container):
+            if size is not None:
+                entry['size'] = size
+        container[4].reject()
+        batch = container.entries.batch()
+        size = batch.column('size')
+        assert len(batch) == 4
+        assert size.values == [10, None, 300, 50]
+        assert size.missing == [False, True, False, False]
+        small = size.where(lambda value: value < 100)
+        assert small == [True, False, False, True]
+        assert (small | size.missing) == [True, True, False, True]
+        assert (~small & size.valid).count == 1
+        assert batch.reject(small, lambda entry: 'size %s' % entry['size']) == 2
+        assert self.titles(container.entries) == ['entry 1', 'entry 2']
+        assert container[3].traces[-1][2] == 'size 50'
+        assert self.titles(batch.select(size.missing)) == ['entry 1']
+        assert size.map(lambda value: value // 100 or None).values == [None, None, 3, None]
@@ -0,0 +1,145 @@
+from unittest import mock
+
+import pytest
+
+from flexget.entry import Entry
+from flexget.plugins.clients import torrent_snapshot
+from flexget.plugins.clients.connection_pool import connection_pool
+from flexget.plugins.clients.deluge import OutputDeluge
+from flexget.plugins.clients.qbittorrent import OutputQBitTorrent
+from flexget.plugins.clients.torrent_snapshot import (
+    TorrentSnapshot,
+    get_snapshot,
+    invalidate_snapshots,
+)
+from flexget.plugins.clients.transmission import PluginTransmissionClean
+
+HASH1 = '09977FE761AAAAAAAAAAAAAAAAAAAAAAAAAAAAAA'
+HASH2 = '09977FE761BBBBBBBBBBBBBBBBBBBBBBBBBBBBBB'
+
+
+@pytest.fixture(autouse=True)
+def clear_snapshots():
+    torrent_snapshot._snapshots.clear()
+    yield
+    torrent_snapshot._snapshots.clear()
+    connection_pool.close_all()
+
+
+def make_task(entries, **config):
+    task = mock.Mock()
+    task.accepted = entries
+    task.config = config
+    task.options.test = False
+    task.options.learn = False
+    task.manager.options.test = False
+    return task
+
+
+class TestTorrentSnapshot:
+    def test_lookup(self):
+        snapshot = TorrentSnapshot(
+            [{'hash': HASH1, 'id': 1}, {'hash': HASH2, 'id': 2}],
+            hash_getter=lambda t: t['hash'],
+            id_getter=lambda t: t['id'],
+        )
+        assert len(snapshot) == 2
+        assert HASH1.lower() in snapshot
+        assert None not in snapshot
+        assert snapshot.find(torrent_id=2)['hash'] == HASH2
+        assert snapshot.find(info_hash=HASH1.lower())['id'] == 1
+        assert snapshot.find_entry(Entry(title='a', url='', torrent_info_hash=HASH2))['id'] == 2
+        assert snapshot.find_entry(Entry(title='a', url='', my_id=1), 'my_id')['id'] == 1
+
+        snapshot.remove({'hash': HASH1, 'id': 1})
+        assert HASH1 not in snapshot
+        assert snapshot.find(torrent_id=1) is None
+        snapshot.add({'hash': HASH1, 'id': 3})
+        assert snapshot.find(torrent_id=3)['hash'] == HASH1
+
+    def test_shared_until_invalidated(self):
+        fetch = mock.Mock(return_value=[HASH1])
+        first = get_snapshot(('client', 'host', 1), fetch, hash_getter=str)
+        second = get_snapshot(('client', 'host', 1), fetch, hash_getter=str)
+        assert first is second
+        assert fetch.call_count == 1
+
+        get_snapshot(('client', 'host', 1), fetch, hash_getter=str, refresh=True)
+        assert fetch.call_count == 2
+
+        get_snapshot(('client', 'other', 1), fetch, hash_getter=str)
+        invalidate_snapshots('client', 'host')
+        assert list(torrent_snapshot._snapshots) == [('client', 'other', 1)]
+
+
+class TestTransmissionClean:
+    def make_torrent(self, info_hash, torrent_id, ratio):
+        torrent = mock.Mock(
+            hashString=info_hash, id=torrent_id, ratio=ratio, totalSize=100, downloadDir='/d'
+        )
+        torrent.name = info_hash
+        torrent.trackers = []
+        return torrent
+
+    def test_removes_by_hash_from_fresh_listing(self):
+        plugin = PluginTransmissionClean()
+        plugin.client = mock.Mock()
+        plugin.client.get_torrents.side_effect = [
+            [self.make_torrent(HASH1, 1, 2.0), self.make_torrent(HASH2, 2, 0.1)],
+            [self.make_torrent(HASH1, 7, 2.0)],
+        ]
+        with mock.patch.object(plugin, 'torrent_info', return_value=(True, None)):
+            plugin.on_task_exit(make_task([]), {'min_ratio': 1.0})
+
+        # The file lists are only requested for candidates, looked up by hash
+        second_call = plugin.client.get_torrents.call_args_list[1]
+        assert second_call[1]['ids'] == [HASH1]
+        plugin.client.remove_torrent.assert_called_once_with([7], None)
+
+
+class TestDelugeSkipLoaded:
+    def test_download_skips_loaded(self):
+        client = mock.Mock()
+        client.call.return_value = [HASH1.lower()]
+        loaded = Entry(title='loaded', url='', torrent_info_hash=HASH1)
+        new = Entry(title='new', url='', torrent_info_hash=HASH2)
+        download = mock.Mock()
+        plugin = OutputDeluge()
+        with mock.patch.object(plugin, 'setup_client', return_value=client), mock.patch(
+            'flexget.plugins.clients.deluge.plugin.get', return_value=download
+        ):
+            plugin.on_task_download(make_task([loaded, new]), {})
+        assert [c[0][1] for c in download.get_temp_file.call_args_list] == [new]
+
+    def test_download_ignores_connection_problems(self):
+        new = Entry(title='new', url='', torrent_info_hash=HASH2)
+        download = mock.Mock()
+        plugin = OutputDeluge()
+        with mock.patch.object(
+            plugin, 'setup_client', side_effect=Exception('bad login')
+        ), mock.patch('flexget.plugins.clients.deluge.plugin.get', return_value=download):
+            plugin.on_task_download(make_task([new]), {})
+        assert download.get_temp_file.called
+
+
+class TestQBitTorrentSkipLoaded:
+    def test_skips_loaded(self, tmpdir):
+        torrent_file = tmpdir.join('new.torrent')
+        torrent_file.write('data')
+        loaded = Entry(title='loaded', url='http://a', torrent_info_hash=HASH1)
+        new = Entry(title='new', url='http://b', torrent_info_hash=HASH2, file=str(torrent_file))
+
+        plugin = OutputQBitTorrent()
+        plugin.url = 'http://localhost:8080'
+        plugin.api_url_info = '/api/v2/torrents/info'
+        plugin.session = mock.Mock()
+        plugin.session.request.return_value.json.return_value = [{'hash': HASH1.lower()}]
+        config = plugin.prepare_config({})
+        with mock.patch.object(plugin, 'add_torrent_file') as add_torrent_file:
+            plugin.add_entries(make_task([loaded, new]), config)
+
+        assert plugin.session.request.call_args[1]['params'] == {
+            'hashes': '|'.join(sorted([HASH1.lower(), HASH2.lower()]))
+        }
+        add_torrent_file.assert_called_once()
+        assert add_torrent_file.call_args[0][0] == str(torrent_file)
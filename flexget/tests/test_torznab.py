@@ -0,0 +1,83 @@
+from unittest import mock
+
+import pytest
+
+from flexget.components.sites import episode_batch
+from flexget.entry import Entry
+from flexget.plugins.input import torznab
+from flexget.plugins.input.torznab import Torznab
+
+CAPS = b"""<?xml version="1.0" encoding="UTF-8"?>
+<caps>
+  <searching>
+    <search available="yes" supportedParams="q"/>
+    <tv-search available="yes" supportedParams="q,season,ep"/>
+  </searching>
+  <categories>
+    <category id="5000" name="TV"/>
+  </categories>
+</caps>
+"""
+
+ITEM = """
+    <item>
+      <title>{}</title>
+      <enclosure url="http://indexer/{}.torrent" length="1048576" type="application/x-bittorrent"/>
+    </item>"""
+
+
+def feed(*titles):
+    items = ''.join(ITEM.format(title, n) for n, title in enumerate(titles))
+    return ('<rss><channel>%s</channel></rss>' % items).encode()
+
+
+def episode(number):
+    return Entry(
+        title='Some Show S01E0%d' % number,
+        series_name='Some Show',
+        series_season=1,
+        series_episode=number,
+    )
+
+
+@pytest.fixture(autouse=True)
+def clear_caches():
+    yield
+    torznab._caps.clear()
+    episode_batch._results.clear()
+
+
+class TestTorznabBatch:
+    config = 'tasks: {}'
+
+    def make_task(self, results):
+        task = mock.Mock()
+        responses = {'caps': CAPS, 'tvsearch': results}
+        task.requests.get.side_effect = lambda url: mock.Mock(
+            content=next(v for k, v in responses.items() if 't=%s' % k in url)
+        )
+        return task
+
+    def test_season_batch(self, manager):
+        task = self.make_task(feed('Some Show S01E01 720p', 'Some Show S01E02 720p'))
+        config = {
+            'website': 'http://indexer',
+            'apikey': 'key',
+            'searcher': 'tv',
+            'categories': [],
+            'batch': 'season',
+        }
+        search = Torznab()
+
+        first = search.search(task, episode(1), dict(config))
+        second = search.search(task, episode(2), dict(config))
+        third = search.search(task, episode(3), dict(config))
+
+        assert [e['title'] for e in first] == ['Some Show S01E01 720p']
+        assert [e['title'] for e in second] == ['Some Show S01E02 720p']
+        assert third == []
+        urls = [c[0][0] for c in task.requests.get.call_args_list]
+        # Caps are fetched once, and the season only once for all the episodes
+        assert len(urls) == 2
+        assert 'season=1' in urls[1]
+        assert 'ep=' not in urls[1]
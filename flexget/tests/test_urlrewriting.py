@@ -1,6 +1,7 @@
 import pytest
 
-from flexget.plugin import get_plugin_by_name
+from flexget.components.sites.urlrewriting import RewriterIndex
+from flexget.plugin import get_plugin_by_name, get_plugins
 
 
 class TestURLRewriters:
@@ -104,3 +105,23 @@ class TestRegexpurlrewriter:
         assert task.find_entry(
             url='http://newzleech.com/?m=gen&dl=1&post=123'
         ), 'did not url_rewrite properly'
+
+
+class TestRewriterIndex:
+    config = 'tasks: {}'
+
+    def test_candidates(self, manager):
+        index = RewriterIndex(get_plugins(interface='urlrewriter'))
+
+        candidates = index.candidates('https://www.nyaa.si/view/15')
+        assert 'nyaa' in candidates
+        # Rewriters without declared hosts are always candidates
+        assert 'piratebay' in candidates
+        assert 'urlrewrite' in candidates
+        assert 'cinemageddon' not in candidates
+
+        assert 'rutracker' in index.candidates('https://rutracker.org/forum/viewtopic.php?t=1')
+        # Declared hosts also match their subdomains
+        assert 'shortened' in index.candidates('http://www.bit.ly/abc')
+        assert 'shortened' not in index.candidates('http://notbit.ly/abc')
+        assert 'nyaa' not in index.candidates(None)
@@ -3,6 +3,7 @@ from datetime import datetime
 import pytest
 
 from flexget.utils import json
+from flexget.utils.copy_on_write import CowDict, FrozenDict, freeze, thaw
 from flexget.utils.tools import merge_dict_from_to, parse_filesize, split_title_year
 
 
@@ -132,3 +133,49 @@ class TestDictMerge(object):
         d2 = {'setting': 'string_2'}
         merge_dict_from_to(d1, d2)
         assert d2 == {'setting': 'string_2'}
+
+
+class TestCopyOnWrite:
+    def test_view_write(self):
+        config = {'series': ['House'], 'settings': {'quality': '720p'}}
+        frozen = freeze(config)
+        view = CowDict(frozen)
+        view['series'].append('Hawaii Five-O')
+        view['settings']['quality'] = '1080p'
+        view['accept_all'] = True
+        assert view == {
+            'series': ['House', 'Hawaii Five-O'],
+            'settings': {'quality': '1080p'},
+            'accept_all': True,
+        }
+        assert frozen == config == {'series': ['House'], 'settings': {'quality': '720p'}}
+
+    def test_frozen(self):
+        frozen = freeze({'series': ['House']})
+        with pytest.raises(TypeError):
+            frozen['series'] = []
+        with pytest.raises(TypeError):
+            frozen['series'].append('Hawaii Five-O')
+
+    def test_freeze_shares_unread(self):
+        frozen = freeze({'series': ['House'], 'settings': {'quality': '720p'}})
+        view = CowDict(frozen)
+        view['series'].append('Hawaii Five-O')
+        refrozen = freeze(view)
+        assert refrozen['settings'] is frozen['settings']
+        assert refrozen['series'] == ['House', 'Hawaii Five-O']
+
+    def test_thaw(self):
+        thawed = thaw(CowDict(freeze({'series': [{'House': {'quality': '720p'}}]})))
+        assert type(thawed) is dict
+        assert type(thawed['series']) is list
+        assert type(thawed['series'][0]['House']) is dict
+        assert not isinstance(thawed, FrozenDict)
+
+    def test_merge_into_view(self):
+        view = CowDict(freeze({'series': ['House'], 'settings': {'quality': '720p'}}))
+        merge_dict_from_to({'series': ['Hawaii Five-O'], 'settings': {'path': '/tv'}}, view)
+        assert view == {
+            'series': ['House', 'Hawaii Five-O'],
+            'settings': {'quality': '720p', 'path': '/tv'},
+        }
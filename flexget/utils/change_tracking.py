@@ -0,0 +1,66 @@
+"""
+Counters of the changes committed to each database table.
+
+Anything caching data derived from the database (eg. API responses) can compare the counters of
+the tables it was built from with the ones it was cached with, to know whether it is still valid
+without running the queries again. Counters are bumped when a session which flushed changes to a
+table commits. Changes made with raw SQL statements are not seen.
+"""
+import threading
+from collections import defaultdict
+from typing import Iterable, Tuple
+
+from sqlalchemy import event
+
+from flexget.manager import Session
+
+_counters: defaultdict = defaultdict(int)
+_lock = threading.Lock()
+
+CHANGED_TABLES = 'changed_tables'
+
+
+def table_name(table) -> str:
+    """Returns the name of `table`, which can be given as a name, Table or mapped class."""
+    if isinstance(table, str):
+        return table
+    return getattr(table, '__tablename__', None) or table.name
+
+
+def versions(tables: Iterable) -> Tuple[int, ...]:
+    """Returns the change counters of `tables`, see :func:`table_name`."""
+    return tuple(_counters[table_name(table)] for table in tables)
+
+
+def bump(tables: Iterable[str]) -> None:
+    with _lock:
+        for table in tables:
+            _counters[table] += 1
+
+
+def _changed_tables(session) -> set:
+    return session.info.setdefault(CHANGED_TABLES, set())
+
+
+@event.listens_for(Session, 'after_flush')
+def record_flush(session, flush_context):
+    for instance in session.new | session.dirty | session.deleted:
+        table = getattr(instance, '__table__', None)
+        if table is not None:
+            _changed_tables(session).add(table.name)
+
+
+@event.listens_for(Session, 'after_bulk_update')
+@event.listens_for(Session, 'after_bulk_delete')
+def record_bulk(context):
+    _changed_tables(context.session).add(context.mapper.local_table.name)
+
+
+@event.listens_for(Session, 'after_commit')
+def bump_committed(session):
+    bump(session.info.pop(CHANGED_TABLES, ()))
+
+
+@event.listens_for(Session, 'after_rollback')
+def forget_rolled_back(session):
+    session.info.pop(CHANGED_TABLES, None)
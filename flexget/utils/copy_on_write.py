@@ -0,0 +1,188 @@
+"""
+Frozen configs, and copy-on-write views of them, to avoid deep copying task configs.
+
+A frozen config (:class:`FrozenDict`, :class:`FrozenList`) can not be modified, so it is shared
+instead of copied. A view (:class:`CowDict`, :class:`CowList`) is a normal modifiable dict or list,
+made from a frozen config, which copies a frozen dict or list into a view the first time it is
+read, so only the parts of the config which are used get copied::
+
+    frozen = freeze(config)
+    view = CowDict(frozen)
+    view['series'].append('Other Show')  # Copies `series`, `frozen` is unchanged
+
+Configs are made of dicts, lists and scalars, like the ones loaded from the config file. Other
+values are shared as they are.
+"""
+from typing import Any
+
+
+def _frozen(self, *args, **kwargs):
+    raise TypeError(
+        'frozen %s can not be modified, use copy.copy() to get a modifiable one'
+        % type(self).__name__
+    )
+
+
+class FrozenDict(dict):
+    __setitem__ = __delitem__ = __ior__ = _frozen
+    clear = pop = popitem = setdefault = update = _frozen
+
+    def __copy__(self) -> 'CowDict':
+        return CowDict(self)
+
+    copy = __copy__
+
+    def __deepcopy__(self, memo) -> dict:
+        return thaw(self)
+
+    def __reduce__(self):
+        return type(self), (dict(self),)
+
+
+class FrozenList(list):
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _frozen
+    append = extend = insert = pop = remove = clear = sort = reverse = _frozen
+
+    def __copy__(self) -> 'CowList':
+        return CowList(self)
+
+    copy = __copy__
+
+    def __deepcopy__(self, memo) -> list:
+        return thaw(self)
+
+    def __reduce__(self):
+        return type(self), (list(self),)
+
+
+def _view(value: Any) -> Any:
+    """Returns a view of `value` when it is frozen."""
+    value_type = type(value)
+    if value_type is FrozenDict:
+        return CowDict(value)
+    if value_type is FrozenList:
+        return CowList(value)
+    return value
+
+
+class CowDict(dict):
+    """Dict whose frozen values are replaced by views of them when they are read."""
+
+    def __getitem__(self, key):
+        value = dict.__getitem__(self, key)
+        view = _view(value)
+        if view is not value:
+            dict.__setitem__(self, key, view)
+        return view
+
+    def get(self, key, default=None):
+        if key in self:
+            return self[key]
+        return default
+
+    def setdefault(self, key, default=None):
+        if key in self:
+            return self[key]
+        self[key] = default
+        return default
+
+    def pop(self, key, *default):
+        return _view(dict.pop(self, key, *default))
+
+    def popitem(self):
+        key, value = dict.popitem(self)
+        return key, _view(value)
+
+    def _read_all(self) -> None:
+        for key, value in list(dict.items(self)):
+            view = _view(value)
+            if view is not value:
+                dict.__setitem__(self, key, view)
+
+    def values(self):
+        self._read_all()
+        return dict.values(self)
+
+    def items(self):
+        self._read_all()
+        return dict.items(self)
+
+    def __iter__(self):
+        # Defined so that dict(view) and {**view} read the values with __getitem__
+        return dict.__iter__(self)
+
+    def __copy__(self) -> 'CowDict':
+        return type(self)(dict.items(self))
+
+    copy = __copy__
+
+    def __deepcopy__(self, memo) -> dict:
+        return thaw(self)
+
+
+class CowList(list):
+    """List whose frozen items are replaced by views of them when they are read."""
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return type(self)(list.__getitem__(self, index))
+        value = list.__getitem__(self, index)
+        view = _view(value)
+        if view is not value:
+            list.__setitem__(self, index, view)
+        return view
+
+    def __iter__(self):
+        index = 0
+        while index < len(self):
+            yield self[index]
+            index += 1
+
+    def __reversed__(self):
+        for index in range(len(self) - 1, -1, -1):
+            yield self[index]
+
+    def pop(self, index=-1):
+        return _view(list.pop(self, index))
+
+    def __add__(self, other):
+        result = self.copy()
+        result.extend(other)
+        return result
+
+    def __radd__(self, other):
+        result = type(self)(other)
+        result.extend(list.__iter__(self))
+        return result
+
+    def __copy__(self) -> 'CowList':
+        return type(self)(list.__iter__(self))
+
+    copy = __copy__
+
+    def __deepcopy__(self, memo) -> list:
+        return thaw(self)
+
+
+def freeze(value: Any) -> Any:
+    """
+    Returns a frozen copy of `value`. Frozen dicts and lists in it are shared, so freezing a view
+    only copies the parts of it which were read.
+    """
+    value_type = type(value)
+    if value_type is FrozenDict or value_type is FrozenList:
+        return value
+    if isinstance(value, dict):
+        return FrozenDict((key, freeze(item)) for key, item in dict.items(value))
+    if isinstance(value, list):
+        return FrozenList(freeze(item) for item in list.__iter__(value))
+    return value
+
+
+def thaw(value: Any) -> Any:
+    """Returns a copy of `value` made of plain dicts and lists, for code which needs exactly these."""
+    if isinstance(value, dict):
+        return {key: thaw(item) for key, item in dict.items(value)}
+    if isinstance(value, list):
+        return [thaw(item) for item in list.__iter__(value)]
+    return value
@@ -0,0 +1,154 @@
+"""
+Columnar view over a batch of entries, for filters which evaluate the same predicate on every entry.
+
+Instead of looping over the entries and deciding on each one, a filter reads the fields it needs
+as columns, evaluates its predicate over a whole column at once, and accepts or rejects all the
+entries of the resulting mask::
+
+    batch = task.entries.batch()
+    size = batch.column('content_size')
+    batch.reject(size.where(lambda value: value > 1000), 'too big')
+
+Columns and masks are lists aligned with the entries of the batch. The entries are read once when
+the columns are built, so the predicates do not go through the entry lookups again.
+"""
+from typing import Any, Callable, Iterable, Iterator, List, Union
+
+from loguru import logger
+
+from flexget.entry import Entry
+
+logger = logger.bind(name='entry_batch')
+
+Reason = Union[str, Callable[[Entry], str], None]
+
+
+class Mask(list):
+    """List of booleans, one for each entry of a batch, combined with ``&``, ``|`` and ``~``."""
+
+    def __and__(self, other: Iterable[bool]) -> 'Mask':
+        return Mask(a and b for a, b in zip(self, other))
+
+    def __or__(self, other: Iterable[bool]) -> 'Mask':
+        return Mask(a or b for a, b in zip(self, other))
+
+    def __invert__(self) -> 'Mask':
+        return Mask(not a for a in self)
+
+    @property
+    def count(self) -> int:
+        return sum(self)
+
+
+class Column:
+    """
+    Values of one field for all the entries of a batch.
+
+    :param field: Name of the field
+    :param values: Value of the field for each entry, None when the entry does not have it
+    :param valid: Mask of the entries which have the field
+    """
+
+    __slots__ = ('field', 'values', 'valid')
+
+    def __init__(self, field: str, values: List[Any], valid: Mask) -> None:
+        self.field = field
+        self.values = values
+        self.valid = valid
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.values)
+
+    def __getitem__(self, index: int) -> Any:
+        return self.values[index]
+
+    @property
+    def missing(self) -> Mask:
+        return ~self.valid
+
+    def where(self, predicate: Callable[[Any], bool]) -> Mask:
+        """Returns the mask of the entries which have the field and whose value satisfies `predicate`."""
+        return Mask(
+            valid and bool(predicate(value)) for value, valid in zip(self.values, self.valid)
+        )
+
+    def map(self, func: Callable[[Any], Any]) -> 'Column':
+        """
+        Returns a column of `func` applied to the valid values. Values for which `func` returns
+        None or raises ValueError or TypeError become invalid.
+        """
+        values = []
+        valid = Mask()
+        for value, is_valid in zip(self.values, self.valid):
+            result = None
+            if is_valid:
+                try:
+                    result = func(value)
+                except (ValueError, TypeError):
+                    result = None
+            values.append(result)
+            valid.append(result is not None)
+        return Column(self.field, values, valid)
+
+
+class EntryBatch:
+    """
+    Batch of entries, usually those of a task in some states, see :meth:`EntryIterator.batch`.
+
+    :param entries: Entries of the batch, their order is kept
+    """
+
+    def __init__(self, entries: Iterable[Entry]) -> None:
+        self.entries = list(entries)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[Entry]:
+        return iter(self.entries)
+
+    def column(self, field: str, eval_lazy: bool = True) -> Column:
+        """
+        Reads `field` of all the entries. Entries without the field, or with a None value, are not
+        valid in the column.
+
+        :param eval_lazy: Evaluate lazy fields which have not been evaluated yet
+        """
+        values = [entry.get(field, eval_lazy=eval_lazy) for entry in self.entries]
+        return Column(field, values, Mask(value is not None for value in values))
+
+    def where(self, predicate: Callable[[Entry], bool]) -> Mask:
+        """Returns the mask of the entries satisfying `predicate`, for conditions on whole entries."""
+        return Mask(bool(predicate(entry)) for entry in self.entries)
+
+    def select(self, mask: Iterable[bool]) -> 'EntryBatch':
+        """Returns a batch of the entries in `mask`."""
+        return EntryBatch(entry for entry, selected in zip(self.entries, mask) if selected)
+
+    def accept(self, mask: Iterable[bool], reason: Reason = None, **kwargs) -> int:
+        """
+        Accepts the entries in `mask`.
+
+        :param reason: Reason for all of them, or callable returning the reason of an entry
+        :return: Number of entries in the mask
+        """
+        return self._apply(Entry.accept, mask, reason, **kwargs)
+
+    def reject(self, mask: Iterable[bool], reason: Reason = None, **kwargs) -> int:
+        """Rejects the entries in `mask`, see :meth:`accept`."""
+        return self._apply(Entry.reject, mask, reason, **kwargs)
+
+    def fail(self, mask: Iterable[bool], reason: Reason = None, **kwargs) -> int:
+        """Fails the entries in `mask`, see :meth:`accept`."""
+        return self._apply(Entry.fail, mask, reason, **kwargs)
+
+    def _apply(self, method, mask: Iterable[bool], reason: Reason, **kwargs) -> int:
+        count = 0
+        for entry, selected in zip(self.entries, mask):
+            if selected:
+                method(entry, reason(entry) if callable(reason) else reason, **kwargs)
+                count += 1
+        return count
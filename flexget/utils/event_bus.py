@@ -0,0 +1,207 @@
+"""
+Manager wide bus of task progress, entry state and log events, for clients (eg. the web UI) to
+subscribe to once instead of polling the task queue and status endpoints.
+
+Publishing never blocks the tasks: every subscriber has a bounded buffer, and when a subscriber does
+not keep up its oldest events are dropped, and it is told how many were lost with a `dropped` event.
+"""
+import itertools
+import threading
+import time
+from collections import deque
+from typing import Iterable, List, Optional
+
+from loguru import logger
+
+from flexget.event import event
+
+logger = logger.bind(name='event_bus')
+
+# Events kept for a subscriber which is not reading them, older ones are dropped
+DEFAULT_BUFFER_SIZE = 1000
+
+EVENT_TYPES = (
+    'task_started',
+    'task_phase',
+    'task_plugin',
+    'task_finished',
+    'entry_state',
+    'log',
+)
+
+
+class Subscription:
+    """
+    Buffer of the events wanted by one subscriber.
+
+    :param types: Event types to receive, all when not given
+    :param task: Only receive the events of the task with this name
+    :param level: Minimum level of the log records to receive
+    :param buffer_size: Maximum number of events kept until they are read
+    """
+
+    def __init__(
+        self,
+        types: Iterable[str] = None,
+        task: str = None,
+        level: str = 'INFO',
+        buffer_size: int = DEFAULT_BUFFER_SIZE,
+    ) -> None:
+        self.types = set(types) if types else set(EVENT_TYPES)
+        self.task = task.lower() if task else None
+        self.level = level.upper()
+        self.level_no = logger.level(self.level).no
+        self.buffer: deque = deque()
+        self.buffer_size = buffer_size
+        self.dropped = 0
+        self._condition = threading.Condition()
+
+    def wants(self, event_type: str, data: dict) -> bool:
+        if event_type not in self.types:
+            return False
+        if self.task and (data.get('task') or '').lower() != self.task:
+            return False
+        if event_type == 'log' and data['level_no'] < self.level_no:
+            return False
+        return True
+
+    def put(self, item: dict) -> None:
+        with self._condition:
+            if len(self.buffer) >= self.buffer_size:
+                self.buffer.popleft()
+                self.dropped += 1
+            self.buffer.append(item)
+            self._condition.notify()
+
+    def get(self, timeout: float = None) -> List[dict]:
+        """
+        Waits for events, and returns all the buffered ones.
+
+        :param timeout: Seconds to wait for events, returns an empty list when none came
+        """
+        with self._condition:
+            if not self.buffer and not self.dropped:
+                self._condition.wait(timeout)
+            items = list(self.buffer)
+            self.buffer.clear()
+            if self.dropped:
+                items.insert(0, {'type': 'dropped', 'data': {'count': self.dropped}})
+                self.dropped = 0
+        return items
+
+
+class EventBus:
+    def __init__(self) -> None:
+        self._subscriptions: List[Subscription] = []
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self._log_sink: Optional[int] = None
+        self._log_level_no: Optional[int] = None
+
+    def subscribe(self, **kwargs) -> Subscription:
+        """Takes the arguments of :class:`Subscription`, and returns it once it receives events."""
+        subscription = Subscription(**kwargs)
+        with self._lock:
+            self._subscriptions = self._subscriptions + [subscription]
+            self._update_log_sink()
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            self._subscriptions = [s for s in self._subscriptions if s is not subscription]
+            self._update_log_sink()
+
+    @property
+    def has_subscribers(self) -> bool:
+        return bool(self._subscriptions)
+
+    def publish(self, event_type: str, **data) -> None:
+        """Sends an event to the subscribers which want it. Must not log, it is called by a sink."""
+        subscriptions = self._subscriptions
+        if not subscriptions:
+            return
+        item = None
+        for subscription in subscriptions:
+            if subscription.wants(event_type, data):
+                if item is None:
+                    item = {'id': next(self._ids), 'type': event_type, 'data': data}
+                subscription.put(item)
+
+    def _update_log_sink(self) -> None:
+        # The sink only receives the records that some subscriber wants, formatting every trace
+        # message for nobody would slow down everything
+        levels = [s.level_no for s in self._subscriptions if 'log' in s.types]
+        level_no = min(levels) if levels else None
+        if level_no == self._log_level_no:
+            return
+        if self._log_sink is not None:
+            logger.remove(self._log_sink)
+            self._log_sink = None
+        if level_no is not None:
+            self._log_sink = logger.add(self._publish_log, level=level_no, format='{message}')
+        self._log_level_no = level_no
+
+    def _publish_log(self, message) -> None:
+        record = message.record
+        self.publish(
+            'log',
+            task=record['extra'].get('task') or None,
+            level=record['level'].name,
+            level_no=record['level'].no,
+            name=record['name'],
+            message=record['message'],
+            time=record['time'].timestamp(),
+        )
+
+
+bus = EventBus()
+
+
+def _task_data(task) -> dict:
+    return {'task': task.name, 'task_id': task.id}
+
+
+@event('task.execute.started')
+def publish_task_started(task):
+    if bus.has_subscribers:
+        bus.publish('task_started', time=time.time(), **_task_data(task))
+
+
+@event('task.execute.before_plugin')
+def publish_task_plugin(task, plugin_name):
+    if not bus.has_subscribers:
+        return
+    # Phase changes are not fired as events, but each phase starts with its first plugin
+    if getattr(task, '_bus_phase', None) != task.current_phase:
+        task._bus_phase = task.current_phase
+        bus.publish('task_phase', phase=task.current_phase, **_task_data(task))
+    bus.publish('task_plugin', phase=task.current_phase, plugin=plugin_name, **_task_data(task))
+
+
+@event('task.execute.completed')
+def publish_task_finished(task):
+    if bus.has_subscribers:
+        bus.publish(
+            'task_finished',
+            time=time.time(),
+            accepted=len(task.accepted),
+            rejected=len(task.rejected),
+            failed=len(task.failed),
+            undecided=len(task.undecided),
+            aborted=task.aborted,
+            abort_reason=task.abort_reason,
+            **_task_data(task),
+        )
+
+
+@event('entry.state_changed')
+def publish_entry_state(entry, reason=None):
+    if bus.has_subscribers and getattr(entry, 'task', None) is not None:
+        bus.publish(
+            'entry_state',
+            title=entry.get('title'),
+            state=str(entry.state),
+            reason=reason,
+            plugin=entry.task.current_plugin,
+            **_task_data(entry.task),
+        )
@@ -0,0 +1,106 @@
+"""
+Emit only the items added to a feed since the previous run.
+
+Many feeds ignore conditional requests and always return their whole window of recent items, which
+are then turned into entries only for `seen` to reject them again. Inputs can instead pass their
+entries through :class:`HighWatermark`, which remembers the publication date range and the ids of
+the items returned on the previous run (in the task's simple persistence), and drops the items
+which are not newer than that.
+
+Items are told apart by their `guid` or `id` field (`title` and `url` if they have neither), and
+ordered by their publication date. When the ordering can't be relied on, items are kept rather than
+lost: items without a date are only dropped if their id was seen on the previous run, and items
+with an unseen id dated within the previous run's range (eg. backdated by the feed) are kept.
+"""
+import hashlib
+from datetime import datetime
+
+from loguru import logger
+
+logger = logger.bind(name='high_watermark')
+
+# Ids of the items of the previous runs remembered at most
+MAX_IDS = 1000
+
+DATE_FIELDS = ('rss_pubdate', 'published', 'pubdate', 'date')
+
+
+def item_id(entry):
+    for field in ('guid', 'id'):
+        if entry.get(field):
+            return str(entry[field])
+    return '%s|%s' % (entry.get('title', ''), entry.get('url', ''))
+
+
+def item_date(entry):
+    for field in DATE_FIELDS:
+        if isinstance(entry.get(field), datetime):
+            return entry[field].replace(tzinfo=None)
+    return None
+
+
+class HighWatermark:
+    """
+    Filters the entries of an input down to the new ones, see module docstring.
+
+    :param task: Task the input is run for, the watermark is kept in its simple persistence
+    :param name: Name of the input plugin
+    :param url: Url (or other identifier) of the feed
+    """
+
+    def __init__(self, task, name, url):
+        self.task = task
+        url_hash = hashlib.md5(('%s|%s' % (name, url)).encode('utf-8')).hexdigest()
+        self.key = '%s_watermark' % url_hash
+
+    def filter(self, entries):
+        """
+        :param entries: All the entries of the feed
+        :return: The entries which are new since the previous run
+        """
+        entries = list(entries)
+        state = self.task.simple_persistence.get(self.key)
+        self.update(entries)
+        if not state:
+            return entries
+
+        known_ids = set(state['ids'])
+        newest, oldest = state.get('newest'), state.get('oldest')
+        result = []
+        violations = 0
+        for entry in entries:
+            if item_id(entry) in known_ids:
+                continue
+            date = item_date(entry)
+            if date is None or newest is None or date > newest:
+                result.append(entry)
+            elif oldest is not None and date >= oldest:
+                # Not seen before, but dated within the last run: the feed isn't ordered by date
+                violations += 1
+                result.append(entry)
+        if violations:
+            logger.verbose(
+                '{} new items were dated before items of the previous run, keeping them',
+                violations,
+            )
+        logger.debug('{} of {} entries are new since the previous run', len(result), len(entries))
+        if not result:
+            # Let details plugin know that it is ok if this feed doesn't produce any entries
+            self.task.no_entries_ok = True
+        return result
+
+    def update(self, entries):
+        """Moves the watermark to the `entries` of this run."""
+        state = self.task.simple_persistence.get(self.key) or {}
+        dates = [date for date in map(item_date, entries) if date is not None]
+        newest = state.get('newest')
+        if dates:
+            newest = max(dates + ([newest] if newest else []))
+        # Inputs may pass only part of the feed (eg. rss stopping at the last seen item), so the ids
+        # of the previous runs are kept too
+        ids = list(dict.fromkeys([item_id(entry) for entry in entries] + state.get('ids', [])))
+        self.task.simple_persistence[self.key] = {
+            'newest': newest,
+            'oldest': min(dates) if dates else state.get('oldest'),
+            'ids': ids[:MAX_IDS],
+        }
@@ -56,6 +56,8 @@ class LazyLookup:
 
 
 class LazyDict(MutableMapping):
+    __slots__ = ('store',)
+
     def __init__(self, *args, **kwargs):
         self.store = dict(*args, **kwargs)
 
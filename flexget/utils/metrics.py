@@ -0,0 +1,315 @@
+"""
+Metrics of the daemon (task runs, plugin durations, task queue, HTTP requests, database queries and
+caches) in the Prometheus text format, served at `/metrics` by the web server when `metrics` is
+enabled in the `web_server` config.
+
+Nothing is recorded until :func:`enable` is called, so the instrumented code paths only pay for a
+flag check otherwise.
+"""
+import math
+import threading
+import time
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlparse
+
+from loguru import logger
+from sqlalchemy import event as sqlalchemy_event
+from sqlalchemy.engine import Engine
+
+from flexget.event import event
+
+logger = logger.bind(name='metrics')
+
+CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+DURATION_BUCKETS = (0.1, 0.5, 1, 5, 10, 30, 60, 120, 300, 600)
+HTTP_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return '+Inf'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+class Metric:
+    """
+    Base of the metrics, holding one value per combination of label values.
+
+    :param name: Name of the metric
+    :param documentation: Help text of the metric
+    :param labels: Names of the labels of the metric
+    """
+
+    type_name = ''
+
+    def __init__(self, name: str, documentation: str, labels: Iterable[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labels = tuple(labels)
+        self._values: Dict[Tuple, object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> Tuple:
+        return tuple(str(labels[label]) for label in self.labels)
+
+    def _label_text(self, key: Tuple, extra: Iterable[Tuple[str, str]] = ()) -> str:
+        pairs = list(zip(self.labels, key)) + list(extra)
+        if not pairs:
+            return ''
+        return '{%s}' % ','.join('%s="%s"' % (name, _escape(value)) for name, value in pairs)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """Returns (name, labels, value) of each sample of the metric."""
+        with self._lock:
+            return [
+                (self.name, self._label_text(key), value) for key, value in self._values.items()
+            ]
+
+    def clear(self) -> None:
+        with self._lock:
+            self._values.clear()
+
+    def render(self) -> str:
+        lines = [
+            '# HELP %s %s' % (self.name, self.documentation),
+            '# TYPE %s %s' % (self.name, self.type_name),
+        ]
+        for name, labels, value in self.samples():
+            lines.append('%s%s %s' % (name, labels, _format_value(value)))
+        return '\n'.join(lines)
+
+
+class Counter(Metric):
+    type_name = 'counter'
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(Metric):
+    """Gauge, either set directly or read from a function returning the value when rendered."""
+
+    type_name = 'gauge'
+
+    def __init__(self, *args, function: Callable[[], Optional[float]] = None, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.function = function
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        if self.function is None:
+            return super().samples()
+        value = self.function()
+        return [] if value is None else [(self.name, '', value)]
+
+
+class Histogram(Metric):
+    type_name = 'histogram'
+
+    def __init__(self, *args, buckets: Iterable[float] = DURATION_BUCKETS, **kwargs) -> None:
+        super().__init__(*args, **kwargs)
+        self.buckets = tuple(sorted(buckets)) + (math.inf,)
+
+    def observe(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                # Count in each bucket, then the sum
+                counts = self._values[key] = [0] * len(self.buckets) + [0.0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            counts[-1] += value
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        with self._lock:
+            values = [(key, list(counts)) for key, counts in self._values.items()]
+        samples = []
+        for key, counts in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                labels = self._label_text(key, [('le', _format_value(float(bound)))])
+                samples.append((self.name + '_bucket', labels, cumulative))
+            samples.append((self.name + '_sum', self._label_text(key), counts[-1]))
+            samples.append((self.name + '_count', self._label_text(key), cumulative))
+        return samples
+
+
+class Registry:
+    def __init__(self) -> None:
+        self.metrics: List[Metric] = []
+        self.enabled = False
+
+    def register(self, metric: Metric) -> Metric:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        return '\n'.join(metric.render() for metric in self.metrics) + '\n'
+
+    def clear(self) -> None:
+        for metric in self.metrics:
+            metric.clear()
+
+
+registry = Registry()
+
+
+def _task_queue_length() -> Optional[float]:
+    from flexget.manager import manager
+
+    if manager is None:
+        return None
+    return len(manager.task_queue)
+
+
+def _task_running() -> Optional[float]:
+    from flexget.manager import manager
+
+    if manager is None:
+        return None
+    return 1 if manager.task_queue.current_task else 0
+
+
+task_runs = registry.register(
+    Counter('flexget_task_runs_total', 'Task runs by result', ['task', 'result'])
+)
+task_duration = registry.register(
+    Histogram('flexget_task_duration_seconds', 'Duration of the task runs', ['task'])
+)
+task_entries = registry.register(
+    Gauge(
+        'flexget_task_entries', 'Entries of the last run of the task by state', ['task', 'state']
+    )
+)
+phase_duration = registry.register(
+    Counter('flexget_phase_duration_seconds_total', 'Time spent in each task phase', ['phase'])
+)
+plugin_duration = registry.register(
+    Counter(
+        'flexget_plugin_duration_seconds_total', 'Time spent in each plugin', ['phase', 'plugin']
+    )
+)
+plugin_runs = registry.register(
+    Counter('flexget_plugin_runs_total', 'Plugin runs', ['phase', 'plugin'])
+)
+task_queue_length = registry.register(
+    Gauge('flexget_task_queue_length', 'Tasks waiting in the queue', function=_task_queue_length)
+)
+task_running = registry.register(
+    Gauge('flexget_task_running', 'Whether a task is running', function=_task_running)
+)
+http_requests = registry.register(
+    Counter('flexget_http_requests_total', 'HTTP requests by domain', ['domain', 'status'])
+)
+http_duration = registry.register(
+    Histogram(
+        'flexget_http_request_duration_seconds',
+        'Duration of the HTTP requests by domain',
+        ['domain'],
+        buckets=HTTP_BUCKETS,
+    )
+)
+db_queries = registry.register(Counter('flexget_db_queries_total', 'Database queries'))
+db_query_duration = registry.register(
+    Counter('flexget_db_query_duration_seconds_total', 'Time spent in database queries')
+)
+cache_requests = registry.register(
+    Counter('flexget_cache_requests_total', 'Cache lookups by result', ['cache', 'result'])
+)
+
+
+def record_http_request(url: str, status, seconds: float) -> None:
+    """Records a request made by :class:`flexget.utils.requests.Session`."""
+    if not registry.enabled:
+        return
+    domain = urlparse(url).hostname or ''
+    http_requests.inc(domain=domain, status=status)
+    http_duration.observe(seconds, domain=domain)
+
+
+def record_cache_lookup(cache: str, hit: bool) -> None:
+    if registry.enabled:
+        cache_requests.inc(cache=cache, result='hit' if hit else 'miss')
+
+
+def _before_query(conn, cursor, statement, parameters, context, executemany):
+    conn.info.setdefault('metrics_query_start', []).append(time.perf_counter())
+
+
+def _after_query(conn, cursor, statement, parameters, context, executemany):
+    starts = conn.info.get('metrics_query_start')
+    if starts:
+        db_query_duration.inc(time.perf_counter() - starts.pop())
+        db_queries.inc()
+
+
+def enable() -> None:
+    if registry.enabled:
+        return
+    logger.debug('Enabling metrics')
+    sqlalchemy_event.listen(Engine, 'before_cursor_execute', _before_query)
+    sqlalchemy_event.listen(Engine, 'after_cursor_execute', _after_query)
+    registry.enabled = True
+
+
+def disable() -> None:
+    if not registry.enabled:
+        return
+    registry.enabled = False
+    sqlalchemy_event.remove(Engine, 'before_cursor_execute', _before_query)
+    sqlalchemy_event.remove(Engine, 'after_cursor_execute', _after_query)
+
+
+_plugin_start: Dict[str, float] = {}
+_task_start: Dict[str, float] = {}
+
+
+@event('task.execute.started')
+def task_started(task):
+    if registry.enabled:
+        _task_start[task.id] = time.perf_counter()
+
+
+@event('task.execute.before_plugin')
+def plugin_started(task, plugin_name):
+    if registry.enabled:
+        _plugin_start[task.id] = time.perf_counter()
+
+
+@event('task.execute.after_plugin')
+def plugin_finished(task, plugin_name):
+    start = _plugin_start.pop(task.id, None)
+    if start is None or not registry.enabled:
+        return
+    took = time.perf_counter() - start
+    plugin_duration.inc(took, phase=task.current_phase, plugin=plugin_name)
+    plugin_runs.inc(phase=task.current_phase, plugin=plugin_name)
+    phase_duration.inc(took, phase=task.current_phase)
+
+
+@event('task.execute.completed')
+def task_finished(task):
+    start = _task_start.pop(task.id, None)
+    if start is None or not registry.enabled:
+        return
+    task_duration.observe(time.perf_counter() - start, task=task.name)
+    task_runs.inc(task=task.name, result='aborted' if task.aborted else 'completed')
+    for state in ('accepted', 'rejected', 'failed', 'undecided'):
+        task_entries.set(len(getattr(task, state)), task=task.name, state=state)
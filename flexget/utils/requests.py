@@ -14,6 +14,7 @@ from loguru import logger
 from requests import RequestException
 
 from flexget import __version__ as version
+from flexget.utils import metrics
 from flexget.utils.tools import TimedDict, parse_timedelta
 
 # If we use just 'requests' here, we'll get the logger created by requests, rather than our own
@@ -257,15 +258,21 @@ class Session(requests.Session):
             logger.debug('No adaptor, passing off to urllib')
             return _wrap_urlopen(url, timeout=kwargs['timeout'])
 
+        start = time.perf_counter()
+        status = 'error'
         try:
             logger.debug(
                 f'{method.upper()}ing URL {url} with args {args} and kwargs {kwargs}'
             )
             result = super().request(method, url, *args, **kwargs)
+            status = result.status_code
         except requests.Timeout:
             # Mark this site in known unresponsive list
             set_unresponsive(url)
+            status = 'timeout'
             raise
+        finally:
+            metrics.record_http_request(url, status, time.perf_counter() - start)
 
         if raise_status:
             result.raise_for_status()
@@ -0,0 +1,187 @@
+"""
+Persistent cache for the results of search plugins.
+
+Search plugins are usually backed by indexers with strict rate limits, while `discover` and
+`urlrewrite_search` keep asking them the same questions: entries which were not found are searched
+for again every interval, with identical queries. Results are stored here keyed by search plugin,
+normalized query and search config, and reused until they expire. Searches which did not return
+anything are cached as well (usually for a shorter time), so that entries which are not available
+yet do not hit the indexer on every run.
+"""
+import re
+from datetime import datetime
+
+from loguru import logger
+from sqlalchemy import Column, DateTime, Index, Integer, String, Unicode
+
+from flexget import db_schema
+from flexget.event import event
+from flexget.manager import Session
+from flexget.utils import metrics, serialization
+from flexget.utils.tools import get_config_hash, parse_timedelta
+
+logger = logger.bind(name='search_cache')
+Base = db_schema.versioned_base('search_cache', 0)
+
+DEFAULT_TTL = '1 hour'
+DEFAULT_NEGATIVE_TTL = '15 minutes'
+
+SEARCH_CACHE_SCHEMA = {
+    'oneOf': [
+        {'type': 'boolean'},
+        {
+            'type': 'object',
+            'properties': {
+                'ttl': {'type': 'string', 'format': 'interval'},
+                'negative_ttl': {'type': 'string', 'format': 'interval'},
+                'plugins': {
+                    'type': 'object',
+                    'additionalProperties': {
+                        'type': 'object',
+                        'properties': {
+                            'ttl': {'type': 'string', 'format': 'interval'},
+                            'negative_ttl': {'type': 'string', 'format': 'interval'},
+                        },
+                        'additionalProperties': False,
+                    },
+                },
+            },
+            'additionalProperties': False,
+        },
+    ]
+}
+
+
+class SearchResults(Base):
+    __tablename__ = 'search_cache'
+
+    id = Column(Integer, primary_key=True)
+    plugin = Column(Unicode)
+    query = Column(Unicode)
+    config_hash = Column(String)
+    added = Column(DateTime, default=datetime.now)
+    expires = Column(DateTime, index=True)
+    _json = Column('json', Unicode)
+
+    @property
+    def entries(self):
+        return serialization.loads(self._json)
+
+    @entries.setter
+    def entries(self, entries):
+        self._json = serialization.dumps(list(entries))
+
+    def __str__(self):
+        return '<SearchResults(plugin=%s,query=%s,expires=%s)>' % (
+            self.plugin,
+            self.query,
+            self.expires,
+        )
+
+
+Index(
+    'ix_search_cache_plugin_query',
+    SearchResults.plugin,
+    SearchResults.query,
+    SearchResults.config_hash,
+)
+
+
+@event('manager.db_cleanup')
+def db_cleanup(manager, session):
+    result = session.query(SearchResults).filter(SearchResults.expires < datetime.now()).delete()
+    if result:
+        logger.verbose('Removed {} expired search results.', result)
+
+
+def normalize_query(entry):
+    """Returns the text identifying the search made for `entry`, ignoring case and whitespace."""
+    search_strings = entry.get('search_strings') or [entry['title']]
+    normalized = (re.sub(r'\s+', ' ', s).strip().lower() for s in search_strings)
+    return '|'.join(sorted(set(normalized)))
+
+
+class SearchCache:
+    """
+    Runs searches through the cache, according to a `SEARCH_CACHE_SCHEMA` config.
+
+    TTLs can be set separately for the search plugins in `plugins`, falling back to `ttl` and
+    `negative_ttl`.
+    """
+
+    def __init__(self, config):
+        if not isinstance(config, dict):
+            config = {}
+        self.ttl = parse_timedelta(config.get('ttl', DEFAULT_TTL))
+        self.negative_ttl = parse_timedelta(config.get('negative_ttl', DEFAULT_NEGATIVE_TTL))
+        self.plugins = {
+            name: (
+                parse_timedelta(plugin_config.get('ttl', self.ttl)),
+                parse_timedelta(plugin_config.get('negative_ttl', self.negative_ttl)),
+            )
+            for name, plugin_config in config.get('plugins', {}).items()
+        }
+
+    def ttls(self, plugin_name):
+        """:return: Tuple of TTL for results and for empty results of `plugin_name`"""
+        return self.plugins.get(plugin_name, (self.ttl, self.negative_ttl))
+
+    def search(self, plugin_name, task, entry, fetch, config=None):
+        """
+        Returns the search results for `entry`, from the cache if possible.
+
+        :param plugin_name: Name of the search plugin, results are cached separately for each
+        :param entry: Entry searched for
+        :param fetch: Callable running the search when the results are not cached, returning the
+          result entries
+        :param config: Config affecting the results, usually the config of the search plugin
+        :return: List of result entries
+        """
+        query = normalize_query(entry)
+        config_hash = get_config_hash(config)
+        if not task.options.nocache:
+            cached = self.load(plugin_name, query, config_hash)
+            metrics.record_cache_lookup('search', cached is not None)
+            if cached is not None:
+                logger.verbose(
+                    'Restored {} results for `{}` from {} search cache',
+                    len(cached),
+                    entry['title'],
+                    plugin_name,
+                )
+                return cached
+        results = list(fetch() or [])
+        self.store(plugin_name, query, config_hash, results)
+        return results
+
+    def load(self, plugin_name, query, config_hash):
+        with Session() as session:
+            cached = (
+                session.query(SearchResults)
+                .filter(SearchResults.plugin == plugin_name)
+                .filter(SearchResults.query == query)
+                .filter(SearchResults.config_hash == config_hash)
+                .filter(SearchResults.expires > datetime.now())
+                .first()
+            )
+            return cached.entries if cached else None
+
+    def store(self, plugin_name, query, config_hash, results):
+        ttl, negative_ttl = self.ttls(plugin_name)
+        ttl = ttl if results else negative_ttl
+        if not ttl:
+            return
+        with Session() as session:
+            cached = (
+                session.query(SearchResults)
+                .filter(SearchResults.plugin == plugin_name)
+                .filter(SearchResults.query == query)
+                .filter(SearchResults.config_hash == config_hash)
+                .first()
+            )
+            if not cached:
+                cached = SearchResults(plugin=plugin_name, query=query, config_hash=config_hash)
+                session.add(cached)
+            cached.entries = results
+            cached.added = datetime.now()
+            cached.expires = cached.added + ttl
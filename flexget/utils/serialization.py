@@ -67,6 +67,8 @@ class Serializer(ABC):
     methods. This is important for data that is stored in `Entry` fields so that it can be stored to the database.
     """
 
+    __slots__ = ()
+
     @classmethod
     def serializer_name(cls) -> str:
         """
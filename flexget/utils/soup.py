@@ -10,5 +10,19 @@ from html5lib.constants import DataLossWarning
 warnings.simplefilter('ignore', DataLossWarning)
 
 
+try:
+    import lxml  # noqa: F401
+except ImportError:
+    lxml = None
+
+# Parsers get_soup accepts, html5lib is the most lenient but also by far the slowest
+PARSERS = ['lxml', 'html.parser', 'html5lib']
+
+
+def fast_parser() -> str:
+    """Returns the fastest of the available parsers, falling back to the most lenient one."""
+    return 'lxml' if lxml else 'html5lib'
+
+
 def get_soup(obj: Union[str, IO, bytes], parser: str = 'html5lib') -> BeautifulSoup:
     return BeautifulSoup(obj, parser)
@@ -137,12 +137,12 @@ def merge_dict_from_to(d1: dict, d2: dict) -> None:
     """Merges dictionary d1 into dictionary d2. d1 will remain in original form."""
     for k, v in d1.items():
         if k in d2:
-            if isinstance(v, type(d2[k])):
-                if isinstance(v, dict):
-                    merge_dict_from_to(d1[k], d2[k])
-                elif isinstance(v, list):
-                    d2[k].extend(copy.deepcopy(v))
-                elif isinstance(v, (str, bool, int, float, type(None))):
+            if isinstance(v, dict) and isinstance(d2[k], dict):
+                merge_dict_from_to(d1[k], d2[k])
+            elif isinstance(v, list) and isinstance(d2[k], list):
+                d2[k].extend(copy.deepcopy(v))
+            elif isinstance(v, type(d2[k])):
+                if isinstance(v, (str, bool, int, float, type(None))):
                     pass
                 else:
                     raise Exception(f'Unknown type: {type(v)} value: {repr(v)} in dictionary')
@@ -508,6 +508,16 @@ def group_entries(entries: Iterable['Entry'], identifier: str) -> Dict[str, List
     return grouped_entries
 
 
+def unique_entries(entries: Iterable['Entry']) -> List['Entry']:
+    """
+    Returns `entries` without the duplicates, the first of the equal entries is kept in place.
+
+    Entries are hashed by their cached identity, so this is linear where checking
+    `entry not in entries` on a list for each one would be quadratic.
+    """
+    return list(dict.fromkeys(entries))
+
+
 def aggregate_inputs(task: 'Task', inputs: List[dict]) -> List['Entry']:
     from flexget import plugin
 